@@ -9,3 +9,6 @@ class UserAdmin(BaseUserAdmin):
     )
     list_display = ('username', 'email', 'first_name', 'last_name', 'role', 'is_staff')
     list_filter = ('role', 'is_staff', 'is_superuser', 'is_active')
+    search_fields = ('^username',)
+    ordering = ('-date_joined',)
+    show_full_result_count = False
@@ -16,5 +16,12 @@ class User(AbstractUser):
     # NEW FIELD ↓↓↓
     has_pet = models.BooleanField(default=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Superadmin user list (newest first, optionally by role)
+            models.Index(fields=["-date_joined", "-id"], name="user_joined_idx"),
+            models.Index(fields=["role", "-date_joined", "-id"], name="user_role_joined_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
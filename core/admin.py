@@ -8,31 +8,289 @@ from .models import (
     ServiceCategory,
     Service,
     ServiceAppointment,
+    ShelterProfile,
+    ChatRoom,
+    ChatMessage,
+    ChatParticipant,
+    ChatArchive,
+    ChatArchiveChunk,
+    AdoptableListing,
+    DailyMetric,
+    RollupWatermark,
+    PlatformCounters,
+    PendingRendition,
 )
 
-admin.site.register(Pet)
-admin.site.register(OwnedPet)
-admin.site.register(Appointment)
-admin.site.register(News)
-admin.site.register(AdoptionRequest)
+# Every changelist runs a constant number of queries per page:
+# list_select_related covers each FK shown (including the ones __str__
+# walks), FK widgets are raw ids instead of a <select> of every row,
+# searches are exact (=) or prefix (^) matches on indexed columns, and
+# show_full_result_count=False skips the unfiltered COUNT(*).
+# core.tests.AdminChangelistQueryTests keeps it that way.
+
+
+@admin.register(Pet)
+class PetAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "category", "is_available", "added_by")
+    list_select_related = ("added_by",)
+    list_filter = ("is_available",)
+    search_fields = ("=id", "^name")
+    raw_id_fields = ("added_by",)
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(OwnedPet)
+class OwnedPetAdmin(admin.ModelAdmin):
+    list_display = ("id", "pet", "owner", "is_listed_for_adoption", "acquired_at")
+    list_select_related = ("pet", "owner")
+    list_filter = ("is_listed_for_adoption",)
+    search_fields = ("=id", "^pet__name", "^owner__username")
+    raw_id_fields = ("owner", "pet")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(Appointment)
+class AppointmentAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "email", "service", "date")
+    search_fields = ("=id",)
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(News)
+class NewsAdmin(admin.ModelAdmin):
+    list_display = ("id", "title", "created_at")
+    search_fields = ("=id",)
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(AdoptionRequest)
+class AdoptionRequestAdmin(admin.ModelAdmin):
+    list_display = ("id", "adopter", "target_pet_name", "adoption_type", "status", "created_at")
+    list_select_related = ("adopter", "pet", "owned_pet__pet")
+    list_filter = ("status",)
+    search_fields = ("=id", "^adopter__username")
+    raw_id_fields = ("adopter", "pet", "owned_pet")
+    ordering = ("-created_at",)
+    show_full_result_count = False
+
 
 # ✅ SERVICE SYSTEM
-admin.site.register(ServiceCategory)
-admin.site.register(Service)
-admin.site.register(ServiceAppointment)
+@admin.register(ServiceCategory)
+class ServiceCategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "is_active")
+    list_filter = ("is_active",)
+    search_fields = ("^name",)
+    ordering = ("name",)
+    show_full_result_count = False
+
+
+@admin.register(Service)
+class ServiceAdmin(admin.ModelAdmin):
+    list_display = ("name", "category", "price", "duration_minutes", "is_active")
+    list_select_related = ("category",)
+    list_filter = ("is_active",)
+    search_fields = ("=id", "^category__name")
+    autocomplete_fields = ("category",)
+    ordering = ("name",)
+    show_full_result_count = False
+
+
+@admin.register(ServiceAppointment)
+class ServiceAppointmentAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "service",
+        "owned_pet",
+        "user",
+        "appointment_date",
+        "appointment_time",
+        "status",
+    )
+    list_select_related = (
+        "service__category",
+        "owned_pet__pet",
+        "owned_pet__owner",
+        "user",
+    )
+    list_filter = ("status",)
+    search_fields = ("=id", "^user__username")
+    raw_id_fields = ("user", "owned_pet", "service")
+    ordering = ("-appointment_date", "-appointment_time")
+    show_full_result_count = False
+
+
+@admin.register(ShelterProfile)
+class ShelterProfileAdmin(admin.ModelAdmin):
+    list_display = ("user", "is_verified", "created_at")
+    list_select_related = ("user",)
+    list_filter = ("is_verified",)
+    search_fields = ("^user__username",)
+    raw_id_fields = ("user",)
+    show_full_result_count = False
+
+
+# ✅ CHAT
+@admin.register(ChatRoom)
+class ChatRoomAdmin(admin.ModelAdmin):
+    list_display = ("id", "adoption_request", "created_at")
+    list_select_related = (
+        "adoption_request__adopter",
+        "adoption_request__pet",
+        "adoption_request__owned_pet__pet",
+    )
+    search_fields = ("=id", "=adoption_request__id")
+    raw_id_fields = ("adoption_request",)
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(ChatMessage)
+class ChatMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "room", "sender", "message", "created_at")
+    list_select_related = ("room", "sender")
+    search_fields = ("=room__id", "^sender__username")
+    raw_id_fields = ("room", "sender")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(ChatParticipant)
+class ChatParticipantAdmin(admin.ModelAdmin):
+    # Added with the room (core.chat.add_participants)
+    list_display = ("room", "user", "last_read_id")
+    list_select_related = ("room", "user")
+    search_fields = ("=room__id", "^user__username")
+    raw_id_fields = ("room", "user")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(ChatArchive)
+class ChatArchiveAdmin(admin.ModelAdmin):
+    # Written by manage.py archive_chats; the messages live in its chunks
+    list_display = ("room", "message_count", "last_message_at", "archived_at")
+    list_select_related = ("room",)
+    search_fields = ("=room__id",)
+    readonly_fields = ("room", "message_count", "last_message", "last_sender", "last_message_at")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ChatArchiveChunk)
+class ChatArchiveChunkAdmin(admin.ModelAdmin):
+    # Compressed message rows; only archive_chats writes them
+    list_display = ("archive", "first_at", "first_id", "message_count")
+    list_select_related = ("archive",)
+    list_filter = ("first_at",)
+    search_fields = ("=archive__room__id",)
+    readonly_fields = ("archive", "first_at", "first_id", "message_count")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+
+# ✅ READ MODELS (rebuilt by signals / management commands)
+@admin.register(AdoptableListing)
+class AdoptableListingAdmin(admin.ModelAdmin):
+    list_display = ("name", "source", "category", "listed_by", "listed_at")
+    list_select_related = ("listed_by",)
+    list_filter = ("source",)
+    search_fields = ("^category",)
+    raw_id_fields = ("pet", "listed_by")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(DailyMetric)
+class DailyMetricAdmin(admin.ModelAdmin):
+    list_display = ("day", "metric", "dimension", "status", "count", "amount")
+    list_filter = ("metric",)
+    ordering = ("-day",)
+    show_full_result_count = False
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("metric", "day", "updated_at")
+
+
+@admin.register(PlatformCounters)
+class PlatformCountersAdmin(admin.ModelAdmin):
+    # Maintained by signals; corrected with manage.py reconcile_counters
+    list_display = ("id", "total_users", "total_pets", "total_orders", "total_revenue", "reconciled_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# ✅ IMAGE RENDITIONS (drained by manage.py generate_image_renditions --queued)
+@admin.register(PendingRendition)
+class PendingRenditionAdmin(admin.ModelAdmin):
+    list_display = ("name", "queued_at")
+    list_filter = ("queued_at",)
+    search_fields = ("^name",)
+    ordering = ("id",)
+    show_full_result_count = False
 
 from django.contrib import admin
-from .models import Payment
+from .models import Payment, ViewQueryStats, RepeatedQuery
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = (
         "id",
         "user",
+        "payment_for",
         "amount",
         "status",
         "created_at",
     )
-    list_filter = ("status",)
-    search_fields = ("user__username",)
+    list_select_related = ("user",)
+    list_filter = ("status", "payment_for")
+    search_fields = ("=id", "^user__username", "=razorpay_order_id")
+    raw_id_fields = ("user", "receiver", "appointment", "adoption_request", "order")
     ordering = ("-created_at",)
+    show_full_result_count = False
+
+
+# ✅ QUERY INSPECTOR (sampled by core.middleware.QueryInspectorMiddleware)
+@admin.register(ViewQueryStats)
+class ViewQueryStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "view_name",
+        "requests",
+        "avg_queries",
+        "max_queries",
+        "query_ms",
+        "last_seen",
+    )
+    search_fields = ("^view_name",)
+    ordering = ("-max_queries",)
+    show_full_result_count = False
+
+
+@admin.register(RepeatedQuery)
+class RepeatedQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        "view_name",
+        "origin",
+        "max_repeats",
+        "occurrences",
+        "last_seen",
+    )
+    search_fields = ("^view_name",)
+    ordering = ("-max_repeats",)
+    readonly_fields = ("view_name", "shape_hash", "sql", "origin")
+    show_full_result_count = False
@@ -0,0 +1,166 @@
+# core/adoptions.py
+
+"""
+Approving / declining adoption requests, one or many at a time.
+
+Approval is serialized on the adopted animal: the Pet / OwnedPet rows
+are locked (SELECT ... FOR UPDATE, in id order) before their pending
+requests are re-read, so two admins approving different requests for
+the same pet at the same moment can't both win; the second one waits,
+then finds its request already declined.
+
+Per pet, the earliest selected pending request is approved and every
+other pending request for that pet is declined, all with one UPDATE per
+status, in the same transaction. Bulk UPDATEs skip the model signals, so
+the platform counters (core/counters.py) are adjusted here as well, and
+the adopters' long polls (core/updates.py) woken after commit.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .counters import apply_deltas
+from .models import AdoptableListing, AdoptionRequest, OwnedPet, Pet
+from .page_cache import invalidate_tags
+from .updates import notify_decisions
+
+
+def _target(adoption):
+    # ("pet", id) for shelter requests, ("owned", id) for owner requests
+    if adoption.pet_id:
+        return "pet", adoption.pet_id
+    return "owned", adoption.owned_pet_id
+
+
+def approve_adoptions(request_ids, scope=Q()):
+    """
+    Approves the given pending requests (limited to ``scope``, e.g.
+    Q(pet__added_by=user)) and declines their competitors.
+
+    Returns ``(approved, declined)`` counts.
+    """
+    with transaction.atomic():
+        selected = list(
+            AdoptionRequest.objects.filter(
+                scope, id__in=request_ids, status="pending"
+            ).only("id", "pet", "owned_pet")
+        )
+        chosen = {adoption.id for adoption in selected}
+        targets = {_target(adoption) for adoption in selected}
+        pet_ids = sorted(pk for kind, pk in targets if kind == "pet")
+        owned_ids = sorted(pk for kind, pk in targets if kind == "owned")
+
+        if not pet_ids and not owned_ids:
+            return 0, 0
+
+        # Serialization point: one lock per adopted animal
+        pets = list(
+            Pet.objects.select_for_update()
+            .filter(id__in=pet_ids).order_by("id")
+        )
+        owned_pets = list(
+            OwnedPet.objects.select_for_update()
+            .filter(id__in=owned_ids).order_by("id")
+        )
+
+        competing = Q(pet_id__in=pet_ids) | Q(owned_pet_id__in=owned_ids)
+
+        # Re-read under the locks; a concurrent approval may have finished
+        pending = list(
+            AdoptionRequest.objects.select_for_update()
+            .filter(competing, status="pending")
+            .order_by("id")
+            .only("id", "pet", "owned_pet")
+        )
+
+        winners = {}
+        for adoption in pending:
+            if adoption.id in chosen:
+                winners.setdefault(_target(adoption), adoption.id)
+
+        now = timezone.now()
+
+        approved = AdoptionRequest.objects.filter(
+            id__in=winners.values()
+        ).update(status="approved", decided_at=now)
+
+        won_pets = [pk for kind, pk in winners if kind == "pet"]
+        won_owned = [pk for kind, pk in winners if kind == "owned"]
+
+        declined = AdoptionRequest.objects.filter(
+            Q(pet_id__in=won_pets) | Q(owned_pet_id__in=won_owned),
+            status="pending",
+        ).update(status="declined", decided_at=now)
+
+        apply_deltas({
+            "pending_adoptions": -(approved + declined),
+            "approved_adoptions": approved,
+        })
+
+        if approved:
+            decided = AdoptionRequest.objects.filter(
+                Q(id__in=winners.values())
+                | Q(pet_id__in=won_pets)
+                | Q(owned_pet_id__in=won_owned),
+                decided_at=now,
+            )
+            transaction.on_commit(lambda: notify_decisions(decided), robust=True)
+
+        _take_off_adoption(
+            [pet for pet in pets if pet.id in won_pets],
+            [owned for owned in owned_pets if owned.id in won_owned],
+        )
+
+    return approved, declined
+
+
+def _take_off_adoption(pets, owned_pets):
+    """
+    Adopted animals leave the listings. Bulk UPDATEs skip the post_save
+    receivers, so the read model, counters and page cache are synced here.
+    """
+    now = timezone.now()
+
+    # ``pets`` were read under lock, so is_available is current
+    apply_deltas({
+        "available_pets": -sum(pet.is_available for pet in pets),
+    })
+
+    Pet.objects.filter(
+        id__in=[pet.id for pet in pets]
+    ).update(is_available=False, updated_at=now)
+
+    OwnedPet.objects.filter(
+        id__in=[owned.id for owned in owned_pets]
+    ).update(is_listed_for_adoption=False, updated_at=now)
+
+    AdoptableListing.objects.filter(
+        Q(source="shelter", object_id__in=[pet.id for pet in pets])
+        | Q(source="owner", object_id__in=[owned.id for owned in owned_pets])
+    ).delete()
+
+    tags = ["pets"]
+    tags += [f"pet:{pet.id}" for pet in pets]
+    tags += [f"pet:{owned.pet_id}" for owned in owned_pets]
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def decline_adoptions(request_ids, scope=Q()):
+    """
+    Declines the given pending requests with one UPDATE; returns the count.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        declined = AdoptionRequest.objects.filter(
+            scope, id__in=request_ids, status="pending"
+        ).update(status="declined", decided_at=now)
+        apply_deltas({"pending_adoptions": -declined})
+
+        if declined:
+            decided = AdoptionRequest.objects.filter(
+                id__in=request_ids, status="declined", decided_at=now
+            )
+            transaction.on_commit(lambda: notify_decisions(decided), robust=True)
+
+    return declined
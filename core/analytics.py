@@ -0,0 +1,205 @@
+# core/analytics.py
+
+"""
+Adoption funnel by weekly cohort, for the superadmin analytics page.
+
+Requests are grouped by the week they were created in (Monday start,
+local time) and followed through
+
+    requested -> decided -> approved -> paid (adoption Payment)
+
+plus percentiles of the time from request to approval.
+
+Instead of walking model instances, two narrow queries pull columns
+(id, cohort week, created/decided timestamps, status; the ids of
+requests with a paid adoption payment) and everything after that is
+NumPy: bincount per cohort for the stage counts, one lexsort for the
+per-cohort percentiles. The result is cached for FUNNEL_CACHE_TIMEOUT
+seconds.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from django.core.cache import cache
+from django.db.models import DateField
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import AdoptionRequest, Payment
+from .rollups import day_start
+
+
+FUNNEL_WEEKS = 12
+FUNNEL_CACHE_TIMEOUT = 600
+FUNNEL_PERCENTILES = (50, 90)
+
+STATUS_CODES = {"pending": 0, "approved": 1, "declined": 2}
+
+
+def _extract(since):
+    """
+    Columnar arrays for the requests created since ``since``.
+    """
+    rows = (
+        AdoptionRequest.objects
+        .filter(created_at__gte=since)
+        .annotate(week=TruncWeek("created_at", output_field=DateField()))
+        .values_list("id", "week", "created_at", "decided_at", "status")
+    )
+    ids, weeks, created, decided, statuses = zip(*rows) if rows else ((),) * 5
+    count = len(ids)
+
+    columns = {
+        "id": np.fromiter(ids, dtype=np.int64, count=count),
+        "week": np.array(weeks, dtype="datetime64[D]"),
+        "created": np.fromiter(
+            (value.timestamp() for value in created),
+            dtype=np.float64, count=count,
+        ),
+        "decided": np.fromiter(
+            (value.timestamp() if value else np.nan for value in decided),
+            dtype=np.float64, count=count,
+        ),
+        "status": np.fromiter(
+            (STATUS_CODES.get(value, -1) for value in statuses),
+            dtype=np.int8, count=count,
+        ),
+    }
+
+    paid_ids = np.fromiter(
+        Payment.objects.filter(
+            payment_for="adoption",
+            status="paid",
+            adoption_request__created_at__gte=since,
+        ).values_list("adoption_request_id", flat=True),
+        dtype=np.int64,
+    )
+    columns["paid"] = np.isin(columns["id"], paid_ids)
+    return columns
+
+
+def _grouped_percentiles(groups, values, group_count, percentiles):
+    """
+    Linear-interpolated percentiles of ``values`` within each group
+    (0..group_count-1); NaN for empty groups. NaN values are ignored.
+    """
+    keep = ~np.isnan(values)
+    groups, values = groups[keep], values[keep]
+
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+
+    starts = np.searchsorted(groups, np.arange(group_count), side="left")
+    sizes = np.bincount(groups, minlength=group_count)
+
+    result = np.full((len(percentiles), group_count), np.nan)
+    has_values = sizes > 0
+    for row, percentile in enumerate(percentiles):
+        position = starts + (sizes - 1) * (percentile / 100)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        low_value = values[low[has_values]]
+        high_value = values[high[has_values]]
+        result[row, has_values] = low_value + (high_value - low_value) * (
+            position[has_values] - low[has_values]
+        )
+    return result
+
+
+def _rate(part, whole):
+    return round(100 * float(part) / whole, 1) if whole else None
+
+
+def _hours(seconds):
+    return None if np.isnan(seconds) else round(float(seconds) / 3600, 1)
+
+
+def _stage_row(requested, decided, approved, paid, percentiles):
+    return {
+        "requested": int(requested),
+        "decided": int(decided),
+        "approved": int(approved),
+        "paid": int(paid),
+        "approval_rate": _rate(approved, decided),
+        "paid_rate": _rate(paid, approved),
+        "approval_hours": [_hours(value) for value in percentiles],
+    }
+
+
+def compute_adoption_funnel(weeks=FUNNEL_WEEKS):
+    today = timezone.localdate()
+    first_week = today - timedelta(days=today.weekday() + 7 * (weeks - 1))
+    columns = _extract(day_start(first_week))
+
+    calendar = np.arange(
+        np.datetime64(first_week, "D"),
+        np.datetime64(first_week, "D") + 7 * weeks,
+        7,
+    )
+    cohort = ((columns["week"] - calendar[0]).astype(np.int64) // 7)
+
+    approved = columns["status"] == STATUS_CODES["approved"]
+    decided = approved | (columns["status"] == STATUS_CODES["declined"])
+    paid = columns["paid"]
+
+    def per_cohort(mask):
+        return np.bincount(cohort[mask], minlength=weeks)
+
+    # Time to approval; requests decided before decided_at existed have none
+    approval_seconds = np.where(
+        approved, columns["decided"] - columns["created"], np.nan
+    )
+
+    cohort_percentiles = _grouped_percentiles(
+        cohort, approval_seconds, weeks, FUNNEL_PERCENTILES
+    )
+    overall_percentiles = _grouped_percentiles(
+        np.zeros(len(cohort), dtype=np.int64), approval_seconds, 1,
+        FUNNEL_PERCENTILES,
+    )[:, 0]
+
+    requested_counts = np.bincount(cohort, minlength=weeks)
+    decided_counts = per_cohort(decided)
+    approved_counts = per_cohort(approved)
+    paid_counts = per_cohort(approved & paid)
+
+    cohorts = [
+        {
+            "week": calendar[index].item(),
+            **_stage_row(
+                requested_counts[index],
+                decided_counts[index],
+                approved_counts[index],
+                paid_counts[index],
+                cohort_percentiles[:, index],
+            ),
+        }
+        for index in range(weeks - 1, -1, -1)
+    ]
+
+    return {
+        "funnel_percentiles": FUNNEL_PERCENTILES,
+        "funnel_cohorts": cohorts,
+        "funnel_totals": _stage_row(
+            requested_counts.sum(),
+            decided_counts.sum(),
+            approved_counts.sum(),
+            paid_counts.sum(),
+            overall_percentiles,
+        ),
+        "funnel_generated_at": timezone.now(),
+    }
+
+
+def adoption_funnel(weeks=FUNNEL_WEEKS):
+    """
+    Cached compute_adoption_funnel(); at most FUNNEL_CACHE_TIMEOUT seconds old.
+    """
+    key = f"superadmin:adoption_funnel:{weeks}"
+    funnel = cache.get(key)
+    if funnel is None:
+        funnel = compute_adoption_funnel(weeks)
+        cache.set(key, funnel, FUNNEL_CACHE_TIMEOUT)
+    return funnel
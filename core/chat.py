@@ -0,0 +1,341 @@
+# core/chat.py
+
+"""
+Chat helpers shared by the HTTP views (core/views.py) and the WebSocket
+endpoint (core/realtime.py).
+"""
+
+import json
+import zlib
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    AdoptionRequest,
+    ChatArchive,
+    ChatArchiveChunk,
+    ChatMessage,
+    ChatParticipant,
+    ChatRoom,
+)
+from .pagination import decode_cursor, encode_cursor, sorted_keyset_page
+
+
+CHAT_HISTORY_PAGE_SIZE = 50
+
+# Messages per ChatArchiveChunk: a history page spans at most two
+ARCHIVE_CHUNK_SIZE = 200
+
+
+def participant_ids(adoption_request):
+    """
+    The adopter and whoever the pet is adopted from.
+    """
+    if adoption_request.pet_id:
+        owner_id = adoption_request.pet.added_by_id
+    else:
+        owner_id = adoption_request.owned_pet.owner_id
+    return {adoption_request.adopter_id, owner_id} - {None}
+
+
+def add_participants(room):
+    ChatParticipant.objects.bulk_create(
+        [
+            ChatParticipant(room=room, user_id=user_id)
+            for user_id in participant_ids(room.adoption_request)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def chat_room_for(user, req_id):
+    """
+    The chat room of adoption request ``req_id`` if ``user`` takes part
+    in it, None otherwise.
+
+    Once the room exists this is one lookup on ChatParticipant's
+    (room, user) key. The first visit checks the adoption request
+    (Http404 if unknown) and creates the room and its participants.
+    """
+    participant = (
+        ChatParticipant.objects.select_related("room__archive")
+        .filter(user=user, room__adoption_request_id=req_id)
+        .first()
+    )
+    if participant is not None:
+        return participant.room
+
+    adoption_request = get_object_or_404(
+        AdoptionRequest.objects.select_related("pet", "owned_pet"),
+        id=req_id
+    )
+    if user.id not in participant_ids(adoption_request):
+        return None
+
+    room, created = ChatRoom.objects.get_or_create(
+        adoption_request=adoption_request
+    )
+    if not created:
+        # The pet changed hands after the room was opened
+        ChatParticipant.objects.get_or_create(room=room, user=user)
+    return room
+
+
+def message_json(msg):
+    return {
+        "id": msg.id,
+        "sender": msg.sender.username,
+        "message": msg.message,
+        "created_at": msg.created_at.isoformat(),
+    }
+
+
+def chat_group(room_id):
+    """
+    Channel layer group of a room's WebSocket connections.
+    """
+    return f"chat.room.{room_id}"
+
+
+def history_page(room, before=None, page_size=CHAT_HISTORY_PAGE_SIZE):
+    """
+    The ``page_size`` messages preceding cursor ``before`` (the latest
+    ones without it), oldest first, and the cursor of the page before
+    that (None at the start of the room).
+
+    Keyset on (created_at, id) within the room, served by the
+    chatmessage_room_created_idx index however long the room gets.
+    Archived messages all precede the live ones, so the archive is only
+    opened once a page runs past the live rows, and then only the
+    chunks that page shows are decompressed.
+    """
+    messages, older = sorted_keyset_page(
+        ChatMessage.objects.filter(room_id=room.id).select_related("sender"),
+        ["created_at"],
+        descending=True,
+        cursor=before,
+        page_size=page_size,
+    )
+
+    archive = getattr(room, "archive", None)
+    if older is None and archive is not None:
+        missing = page_size - len(messages)
+        # One more than needed tells whether an older page exists
+        archived = archived_before(
+            archive,
+            decode_cursor(before, ChatMessage, ["created_at"]),
+            missing + 1,
+        )
+
+        if missing:
+            messages += reversed(archived[-missing:])
+        if len(archived) > missing:
+            last = messages[-1]
+            older = encode_cursor([last.created_at, last.id])
+
+    messages.reverse()
+    return messages, older
+
+
+# =========================
+# ARCHIVE (ChatArchive, manage.py archive_chats)
+# =========================
+def _pack(rows):
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode(), 9)
+
+
+def _unpack(data):
+    return json.loads(zlib.decompress(data)) if data else []
+
+
+def _row_key(row):
+    return [parse_datetime(row[3]), row[0]]
+
+
+def archived_before(archive, bound, limit):
+    """
+    Up to ``limit`` archived messages before ``bound`` ([created_at, id],
+    None for the end of the archive) as unsaved ChatMessage instances,
+    oldest first, senders loaded (one query). Only the chunks holding
+    them are read. Messages of deleted users are dropped, as the
+    CASCADE would have done.
+    """
+    chunks = archive.chunks.order_by("-first_at", "-first_id")
+    if bound is not None:
+        chunks = chunks.filter(
+            Q(first_at__lt=bound[0]) | Q(first_at=bound[0], first_id__lt=bound[1])
+        )
+
+    # Every chunk but the newest is full
+    rows = []
+    for chunk in chunks[:limit // ARCHIVE_CHUNK_SIZE + 2]:
+        rows[:0] = [
+            row for row in _unpack(chunk.data)
+            if bound is None or _row_key(row) < bound
+        ]
+        if len(rows) >= limit:
+            break
+    rows = rows[-limit:]
+
+    senders = get_user_model().objects.in_bulk({row[1] for row in rows})
+
+    return [
+        ChatMessage(
+            id=msg_id,
+            room_id=archive.room_id,
+            sender=senders[sender_id],
+            message=message,
+            created_at=parse_datetime(created_at),
+        )
+        for msg_id, sender_id, message, created_at in rows
+        if sender_id in senders
+    ]
+
+
+def archive_room(room_id):
+    """
+    Moves the room's live messages into its ChatArchive (appending to
+    an existing one); returns how many were moved. Messages posted while
+    this runs stay live until the next run.
+    """
+    with transaction.atomic():
+        # One archiver per room at a time
+        room = ChatRoom.objects.select_for_update().filter(id=room_id).first()
+        if room is None:
+            return 0
+
+        live = list(
+            ChatMessage.objects.filter(room_id=room_id)
+            .select_related("sender")
+            .order_by("created_at", "id")
+        )
+        if not live:
+            return 0
+
+        archive = (
+            ChatArchive.objects.filter(room_id=room_id).first()
+            or ChatArchive(room_id=room_id)
+        )
+        last = live[-1]
+        archive.message_count += len(live)
+        archive.last_message = last.message
+        archive.last_sender = last.sender.username
+        archive.last_message_at = last.created_at
+        archive.save()
+
+        rows = [
+            [msg.id, msg.sender_id, msg.message, msg.created_at.isoformat()]
+            for msg in live
+        ]
+
+        # Top up the newest chunk first, so only it is ever partial
+        newest = archive.chunks.order_by("-first_at", "-first_id").first()
+        if newest is not None and newest.message_count < ARCHIVE_CHUNK_SIZE:
+            space = ARCHIVE_CHUNK_SIZE - newest.message_count
+            merged = _unpack(newest.data) + rows[:space]
+            newest.data = _pack(merged)
+            newest.message_count = len(merged)
+            newest.save(update_fields=["data", "message_count"])
+            rows = rows[space:]
+
+        ChatArchiveChunk.objects.bulk_create([
+            ChatArchiveChunk(
+                archive=archive,
+                first_at=parse_datetime(rows[start][3]),
+                first_id=rows[start][0],
+                message_count=len(rows[start:start + ARCHIVE_CHUNK_SIZE]),
+                data=_pack(rows[start:start + ARCHIVE_CHUNK_SIZE]),
+            )
+            for start in range(0, len(rows), ARCHIVE_CHUNK_SIZE)
+        ])
+
+        ChatMessage.objects.filter(id__in=[msg.id for msg in live]).delete()
+
+    return len(live)
+
+
+# =========================
+# READ MARKERS / INBOX (ChatParticipant.last_read_id)
+# =========================
+def mark_read(room_id, user, message_id):
+    """
+    Moves ``user``'s read marker in the room up to ``message_id``
+    (never back); one UPDATE.
+    """
+    if message_id:
+        ChatParticipant.objects.filter(
+            room_id=room_id,
+            user=user,
+            last_read_id__lt=message_id
+        ).update(last_read_id=message_id)
+
+
+def post_message(room_id, user, message):
+    """
+    Adds a message; the sender has read everything up to it.
+    """
+    msg = ChatMessage.objects.create(room_id=room_id, sender=user, message=message)
+    mark_read(room_id, user, msg.id)
+    return msg
+
+
+def inbox_rooms(user):
+    """
+    The user's chat rooms, most recent activity first, each annotated
+    with ``last_message``, ``last_sender``, ``last_activity`` and
+    ``unread`` (messages from others after the user's read marker), all
+    as correlated subqueries of one SELECT. Archived rooms fall back to
+    the last message copied into their ChatArchive.
+    """
+    latest = ChatMessage.objects.filter(
+        room=OuterRef("pk")
+    ).order_by("-created_at", "-id")
+
+    read_up_to = ChatParticipant.objects.filter(
+        room=OuterRef(OuterRef("pk")),
+        user=user
+    ).values("last_read_id")[:1]
+
+    unread = (
+        ChatMessage.objects.filter(
+            room=OuterRef("pk"),
+            id__gt=Coalesce(Subquery(read_up_to), Value(0)),
+        )
+        .exclude(sender=user)
+        .order_by()
+        .values("room")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+
+    return (
+        ChatRoom.objects.filter(participants__user=user)
+        .select_related(
+            "adoption_request__pet",
+            "adoption_request__owned_pet__pet",
+        )
+        .annotate(
+            last_message=Coalesce(
+                Subquery(latest.values("message")[:1]),
+                F("archive__last_message"),
+            ),
+            last_sender=Coalesce(
+                Subquery(latest.values("sender__username")[:1]),
+                F("archive__last_sender"),
+            ),
+            last_activity=Coalesce(
+                Subquery(latest.values("created_at")[:1]),
+                F("archive__last_message_at"),
+                "created_at",
+            ),
+            unread=Coalesce(
+                Subquery(unread, output_field=IntegerField()), Value(0)
+            ),
+        )
+        .order_by("-last_activity", "-id")
+    )
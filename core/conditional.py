@@ -0,0 +1,57 @@
+# core/conditional.py
+
+"""
+Conditional GET (ETag) for detail pages.
+
+The ETag comes from the object's ``updated_at`` plus who is looking
+(the page shows role-specific buttons), so a 304 is answered after one
+primary-key lookup instead of rendering the template.
+
+No Last-Modified: a date cannot carry the viewer, so an
+If-Modified-Since-only client would get a 304 for the page it saw
+before logging in or out or changing role.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def _viewer(request):
+    user = request.user
+    if not user.is_authenticated:
+        return "anon"
+    return f"{user.pk}:{user.role}"
+
+
+def conditional_on(lookup):
+    """
+    Decorates a detail view; ``lookup(**view_kwargs)`` returns the
+    object's updated_at, or None when it does not exist (no ETag).
+
+    @conditional_on(lambda pet_id: Pet.objects.filter(id=pet_id)
+                    .values_list("updated_at", flat=True).first())
+    """
+    def etag(request, *args, **kwargs):
+        value = lookup(*args, **kwargs)
+        if value is None:
+            return None
+        raw = f"{value.isoformat()}|{_viewer(request)}"
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag)(view_func)
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Always revalidate; never let shared caches keep user pages
+            if request.user.is_authenticated:
+                patch_cache_control(response, no_cache=True, private=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+            return response
+        return _wrapped
+    return decorator
@@ -0,0 +1,145 @@
+# core/counters.py
+
+"""
+Incremental maintenance of the PlatformCounters row.
+
+Each counted model maps its tracked fields to the counters one row
+contributes to (a paid shop payment adds 1 to total_payments and
+successful_payments and its amount to total_revenue and shop_revenue).
+On save the receivers in core/signals.py diff the row's contribution
+before and after; on delete they subtract it. The difference is applied
+with one UPDATE ... SET x = x + delta on the counters row, inside the
+same transaction as the change.
+
+Bulk .update() calls skip signals; code that uses them calls
+apply_deltas() itself, and ``manage.py reconcile_counters`` corrects any
+remaining drift (core.dashboard.reconcile_counters).
+"""
+
+from decimal import Decimal
+
+from django.db.models import F
+
+from .models import PlatformCounters
+
+
+COUNTERS_PK = 1
+
+
+def _user(role):
+    return {
+        "total_users": 1,
+        "shelters": role == "shelter",
+        "owners": role == "owner",
+        "adopters": role == "adopter",
+    }
+
+
+def _pet(is_available):
+    return {"total_pets": 1, "available_pets": is_available}
+
+
+def _adoption(status):
+    return {
+        "total_adoption_requests": 1,
+        "pending_adoptions": status == "pending",
+        "approved_adoptions": status == "approved",
+    }
+
+
+def _appointment(status):
+    return {
+        "total_appointments": 1,
+        "pending_appointments": status == "pending",
+        "confirmed_appointments": status == "confirmed",
+        "completed_appointments": status == "completed",
+    }
+
+
+def _product(is_active):
+    return {"total_products": 1, "active_products": is_active}
+
+
+def _order(status):
+    return {"total_orders": 1, "paid_orders": status == "paid"}
+
+
+def _payment(status, payment_for, amount):
+    paid = status == "paid"
+    revenue = Decimal(amount or 0) if paid else Decimal(0)
+    return {
+        "total_payments": 1,
+        "successful_payments": paid,
+        "failed_payments": status == "failed",
+        "total_revenue": revenue,
+        "appointment_revenue": revenue if payment_for == "appointment" else 0,
+        "shop_revenue": revenue if payment_for == "shop" else 0,
+    }
+
+
+# model label -> (tracked fields, contribution(**tracked values))
+COUNTER_SOURCES = {
+    "accounts.User": (("role",), _user),
+    "core.Pet": (("is_available",), _pet),
+    "core.AdoptionRequest": (("status",), _adoption),
+    "core.ServiceAppointment": (("status",), _appointment),
+    "shop.Product": (("is_active",), _product),
+    "shop.Order": (("status",), _order),
+    "core.Payment": (("status", "payment_for", "amount"), _payment),
+}
+
+
+def contribution(instance):
+    fields, counts = COUNTER_SOURCES[instance._meta.label]
+    return counts(**{field: getattr(instance, field) for field in fields})
+
+
+def stored_contribution(instance):
+    """
+    Contribution of the row as currently stored (before a save), or {}
+    when it isn't stored yet.
+    """
+    if instance._state.adding or instance.pk is None:
+        return {}
+
+    fields, counts = COUNTER_SOURCES[instance._meta.label]
+    values = (
+        type(instance)._default_manager
+        .filter(pk=instance.pk)
+        .values(*fields)
+        .first()
+    )
+    return counts(**values) if values else {}
+
+
+def tracks_any(instance, update_fields):
+    """
+    False when a save(update_fields=...) can't change any counter
+    (e.g. the last_login update on every login).
+    """
+    if update_fields is None:
+        return True
+    fields, _ = COUNTER_SOURCES[instance._meta.label]
+    return bool(set(fields) & set(update_fields))
+
+
+def diff(before, after):
+    return {
+        key: after.get(key, 0) - before.get(key, 0)
+        for key in set(before) | set(after)
+    }
+
+
+def apply_deltas(deltas):
+    """
+    One UPDATE adding ``deltas`` ({counter: +/-n}) to the counters row.
+    Until the row exists (built by the first read or a reconcile) this is
+    a no-op; the reconcile counts from the source tables anyway.
+    """
+    changes = {
+        key: F(key) + delta
+        for key, delta in deltas.items()
+        if delta
+    }
+    if changes:
+        PlatformCounters.objects.filter(pk=COUNTERS_PK).update(**changes)
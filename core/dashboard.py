@@ -0,0 +1,135 @@
+# core/dashboard.py
+
+"""
+Super admin dashboard numbers.
+
+The page reads the PlatformCounters row: one primary key lookup, kept
+current by the signal receivers in core/signals.py (see core/counters.py).
+
+compute_dashboard() is the exact recount the counters are reconciled
+against. Every table is read ONCE with conditional aggregation, e.g.
+
+    SELECT COUNT(*),
+           COUNT(*) FILTER (WHERE status = 'paid'),
+           SUM(amount) FILTER (WHERE status = 'paid' AND payment_for = 'shop')
+    FROM core_payment
+
+(backends without FILTER get the equivalent CASE WHEN).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from shop.models import Order, Product
+from .counters import COUNTERS_PK
+from .models import (
+    AdoptionRequest,
+    Payment,
+    PlatformCounters,
+    Pet,
+    ServiceAppointment,
+)
+
+
+def compute_dashboard():
+    User = get_user_model()
+
+    stats = {}
+
+    # Users
+    stats.update(User.objects.aggregate(
+        total_users=Count("id"),
+        shelters=Count("id", filter=Q(role="shelter")),
+        owners=Count("id", filter=Q(role="owner")),
+        adopters=Count("id", filter=Q(role="adopter")),
+    ))
+
+    # Pets & adoptions
+    stats.update(Pet.objects.aggregate(
+        total_pets=Count("id"),
+        available_pets=Count("id", filter=Q(is_available=True)),
+    ))
+    stats.update(AdoptionRequest.objects.aggregate(
+        total_adoption_requests=Count("id"),
+        pending_adoptions=Count("id", filter=Q(status="pending")),
+        approved_adoptions=Count("id", filter=Q(status="approved")),
+    ))
+
+    # Appointments
+    stats.update(ServiceAppointment.objects.aggregate(
+        total_appointments=Count("id"),
+        pending_appointments=Count("id", filter=Q(status="pending")),
+        confirmed_appointments=Count("id", filter=Q(status="confirmed")),
+        completed_appointments=Count("id", filter=Q(status="completed")),
+    ))
+
+    # Shop
+    stats.update(Product.objects.aggregate(
+        total_products=Count("id"),
+        active_products=Count("id", filter=Q(is_active=True)),
+    ))
+    stats.update(Order.objects.aggregate(
+        total_orders=Count("id"),
+        paid_orders=Count("id", filter=Q(status="paid")),
+    ))
+
+    # Payments
+    paid = Q(status="paid")
+    stats.update(Payment.objects.aggregate(
+        total_payments=Count("id"),
+        successful_payments=Count("id", filter=paid),
+        failed_payments=Count("id", filter=Q(status="failed")),
+        total_revenue=Sum("amount", filter=paid),
+        appointment_revenue=Sum(
+            "amount", filter=paid & Q(payment_for="appointment")
+        ),
+        shop_revenue=Sum("amount", filter=paid & Q(payment_for="shop")),
+    ))
+
+    # SUM over no rows is NULL
+    return {key: value or 0 for key, value in stats.items()}
+
+
+def reconcile_counters():
+    """
+    Overwrites the counters row with an exact recount.
+
+    The row is locked first, so increments from concurrent writes wait
+    and land on top of the recount instead of being overwritten by it.
+    Returns ``{counter: (stored, actual)}`` for every counter that had
+    drifted.
+    """
+    with transaction.atomic():
+        PlatformCounters.objects.get_or_create(pk=COUNTERS_PK)
+        counters = (
+            PlatformCounters.objects.select_for_update().get(pk=COUNTERS_PK)
+        )
+
+        actual = compute_dashboard()
+        drift = {
+            key: (getattr(counters, key), value)
+            for key, value in actual.items()
+            if getattr(counters, key) != value
+        }
+
+        for key, value in actual.items():
+            setattr(counters, key, value)
+        counters.reconciled_at = timezone.now()
+        counters.save()
+
+    return drift
+
+
+def dashboard_snapshot():
+    """
+    The dashboard context: the counters row, built on first use.
+    """
+    counters = PlatformCounters.objects.filter(pk=COUNTERS_PK).first()
+    if counters is None:
+        reconcile_counters()
+        counters = PlatformCounters.objects.get(pk=COUNTERS_PK)
+
+    return model_to_dict(counters, exclude=["id"])
@@ -0,0 +1,191 @@
+# core/exports.py
+
+"""
+Streaming CSV / JSONL exports for the superadmin (payments, orders,
+adoptions).
+
+Rows are read in keyset batches (core.pagination.keyset_batches): each
+batch is one short indexed query. On MySQL ``.iterator()`` would still
+buffer the whole result client side, so batching is what keeps memory
+bounded on any backend. Every batch is written out as one chunk of the
+StreamingHttpResponse, so the download starts immediately and memory
+stays at one batch no matter how many rows are exported.
+
+Under ASGI Django would turn a plain generator into a list before
+sending anything, so ASGI requests get an async iterator that produces
+one chunk at a time on the request's worker thread.
+"""
+
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .pagination import keyset_batches
+
+
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+# Spreadsheet apps run cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """
+    File-like object for csv.writer that hands back each written line.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _json_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_chunks(header, batches):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+
+    for rows in batches:
+        yield "".join(
+            writer.writerow([_csv_value(value) for value in row])
+            for row in rows
+        )
+
+
+def _jsonl_chunks(header, batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(header, row)), default=_json_value) + "\n"
+            for row in rows
+        )
+
+
+async def _async_chunks(chunks):
+    # Chunks are never None; next() returns it once ``chunks`` is done
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await next_chunk(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def export_response(request, name, header, queryset, to_rows,
+                    batch_size=EXPORT_BATCH_SIZE):
+    """
+    StreamingHttpResponse with every row of ``queryset`` (newest first).
+
+    ``to_rows(objects)`` turns one batch of model instances into rows
+    matching ``header``; ``?format=jsonl`` switches from CSV to JSON lines.
+    """
+    fmt = request.GET.get("format")
+    if fmt not in EXPORT_FORMATS:
+        fmt = "csv"
+
+    batches = (
+        to_rows(objects)
+        for objects in keyset_batches(queryset, batch_size)
+    )
+    chunks = _csv_chunks if fmt == "csv" else _jsonl_chunks
+    chunks = chunks(header, batches)
+    if isinstance(request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[fmt])
+    filename = f"{name}-{timezone.localdate():%Y%m%d}.{fmt}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ======================================================
+# ROW LAYOUTS
+# ======================================================
+PAYMENT_EXPORT_HEADER = (
+    "id", "created_at", "user", "receiver", "payment_for", "amount",
+    "status", "razorpay_order_id", "razorpay_payment_id",
+    "appointment_id", "order_id", "adoption_request_id",
+)
+
+
+def payment_rows(payments):
+    for payment in payments:
+        yield (
+            payment.id,
+            payment.created_at,
+            payment.user.username,
+            payment.receiver.username if payment.receiver else "",
+            payment.payment_for,
+            payment.amount,
+            payment.status,
+            payment.razorpay_order_id or "",
+            payment.razorpay_payment_id or "",
+            payment.appointment_id or "",
+            payment.order_id or "",
+            payment.adoption_request_id or "",
+        )
+
+
+# One row per order item; orders without items get one row of blanks
+ORDER_EXPORT_HEADER = (
+    "order_id", "created_at", "user", "status", "total_amount",
+    "product_name", "price", "quantity",
+)
+
+
+def order_rows(orders):
+    for order in orders:
+        items = list(order.items.all()) or [None]
+        for item in items:
+            yield (
+                order.id,
+                order.created_at,
+                order.user.username if order.user else "",
+                order.status,
+                order.total_amount,
+                item.product_name if item else "",
+                item.price if item else "",
+                item.quantity if item else "",
+            )
+
+
+ADOPTION_EXPORT_HEADER = (
+    "id", "created_at", "adopter", "type", "pet", "status", "message",
+)
+
+
+def adoption_rows(adoptions):
+    for adoption in adoptions:
+        if adoption.pet_id:
+            kind, pet = "shelter", adoption.pet
+        else:
+            kind, pet = "owner", adoption.owned_pet.pet if adoption.owned_pet else None
+
+        yield (
+            adoption.id,
+            adoption.created_at,
+            adoption.adopter.username,
+            kind,
+            pet.name if pet else "",
+            adoption.status,
+            adoption.message,
+        )
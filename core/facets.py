@@ -0,0 +1,135 @@
+# core/facets.py
+
+"""
+Faceted browsing over AdoptableListing (category / source / shelter).
+
+Facet counts come from two grouped queries, each read off its own
+covering index in index order (no temporary B-tree):
+
+    SELECT source, category, COUNT(*) ... GROUP BY source, category
+    SELECT listed_by_id, COUNT(*) ... WHERE source = 'shelter'
+                                      GROUP BY listed_by_id
+
+so the number of groups is bounded by sources x categories and by the
+number of shelters, not by every owner who ever listed a pet. Each facet
+is counted with every *other* active filter applied, so the numbers show
+what a click on that value would return.
+"""
+
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils.http import urlencode
+
+from .models import AdoptableListing
+
+
+FACET_PARAMS = ("source", "category", "shelter")
+
+SOURCE_LABELS = dict(AdoptableListing.SOURCE_CHOICES)
+
+
+def parse_listing_filters(params):
+    """
+    Reads ?source=&category=&shelter= into a clean filter dict.
+    """
+    filters = {}
+
+    source = params.get("source")
+    if source in SOURCE_LABELS:
+        filters["source"] = source
+
+    category = (params.get("category") or "").strip()
+    if category:
+        filters["category"] = category
+
+    try:
+        filters["shelter"] = int(params.get("shelter"))
+    except (TypeError, ValueError):
+        pass
+
+    return filters
+
+
+def filter_listings(listings, filters):
+    if "source" in filters:
+        listings = listings.filter(source=filters["source"])
+
+    if "category" in filters:
+        listings = listings.filter(category=filters["category"])
+
+    if "shelter" in filters:
+        listings = listings.filter(
+            source="shelter",
+            listed_by_id=filters["shelter"]
+        )
+
+    return listings
+
+
+def _facet_url(filters, facet, value):
+    params = dict(filters)
+    if params.get(facet) == value:
+        params.pop(facet)
+    else:
+        params[facet] = value
+    return "?" + urlencode(params) if params else "?"
+
+
+def listing_facets(filters):
+    """
+    Returns {facet: [{value, label, count, active, url}, ...]}.
+    """
+    counts = {facet: Counter() for facet in FACET_PARAMS}
+
+    # Source and category: (source, category) groups, shelter filter applied
+    shelter_filter = {"shelter": filters["shelter"]} if "shelter" in filters else {}
+    rows = filter_listings(AdoptableListing.objects.all(), shelter_filter).values(
+        "source", "category"
+    ).annotate(total=Count("id")).order_by()
+
+    for row in rows:
+        if filters.get("category", row["category"]) == row["category"]:
+            counts["source"][row["source"]] += row["total"]
+        if filters.get("source", row["source"]) == row["source"]:
+            counts["category"][row["category"]] += row["total"]
+
+    # Shelter: only shelter listings have one
+    if filters.get("source", "shelter") == "shelter":
+        category_filter = {"category": filters["category"]} if "category" in filters else {}
+        rows = filter_listings(
+            AdoptableListing.objects.filter(source="shelter"), category_filter
+        ).values("listed_by_id").annotate(total=Count("id")).order_by()
+
+        for row in rows:
+            counts["shelter"][row["listed_by_id"]] = row["total"]
+
+    shelter_names = dict(
+        get_user_model().objects.filter(
+            id__in=counts["shelter"]
+        ).values_list("id", "username")
+    )
+
+    labels = {
+        "source": lambda value: SOURCE_LABELS[value],
+        "category": lambda value: value,
+        "shelter": lambda value: shelter_names.get(value, f"Shelter #{value}"),
+    }
+
+    return {
+        facet: sorted(
+            (
+                {
+                    "value": value,
+                    "label": labels[facet](value),
+                    "count": count,
+                    "active": filters.get(facet) == value,
+                    "url": _facet_url(filters, facet, value),
+                }
+                for value, count in counts[facet].items()
+            ),
+            key=lambda item: (-item["count"], str(item["label"])),
+        )
+        for facet in FACET_PARAMS
+    }
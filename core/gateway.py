@@ -0,0 +1,151 @@
+# core/gateway.py
+
+"""
+Payment gateway (Razorpay) for the checkout views: shop.views.payment_page,
+core.views.appointment_payment_gateway and appointment_payment_success.
+
+get_gateway() returns one instance per process of the class named by
+settings.PAYMENT_GATEWAY. The Razorpay one keeps a pool of keep-alive
+HTTPS connections, so a checkout reuses an open connection instead of
+paying for a new session, TCP connect and TLS handshake each time
+(manage.py bench_payment_gateway measures the difference). Calls give
+up after RAZORPAY_CONNECT_TIMEOUT / RAZORPAY_READ_TIMEOUT seconds
+instead of holding the worker, and any network failure is raised as
+GatewayUnavailable, which the views answer with a retryable 503 page.
+
+FakeGateway talks to nobody: tests and offline development.
+"""
+
+import hashlib
+import hmac
+import itertools
+import threading
+from functools import lru_cache
+
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.test.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class GatewayUnavailable(Exception):
+    """
+    The gateway could not be reached or did not answer in time; nothing
+    was created, the checkout can be retried.
+    """
+
+
+class GatewaySession(requests.Session):
+    """
+    requests.Session with default timeouts and ``pool_size`` pooled
+    connections per host (one per worker thread is enough).
+    """
+
+    def __init__(self, timeout, pool_size):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def payment_signature(order_id, payment_id):
+    """
+    The signature Razorpay sends back with a successful payment:
+    HMAC-SHA256 of "<order id>|<payment id>" under the key secret.
+    """
+    return hmac.new(
+        settings.RAZORPAY_KEY_SECRET.encode(),
+        f"{order_id}|{payment_id}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+class RazorpayGateway:
+    def __init__(self, base_url=None):
+        session = GatewaySession(
+            timeout=(settings.RAZORPAY_CONNECT_TIMEOUT, settings.RAZORPAY_READ_TIMEOUT),
+            pool_size=settings.RAZORPAY_POOL_SIZE,
+        )
+        options = {"base_url": base_url} if base_url else {}
+        self.client = razorpay.Client(
+            session=session,
+            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+            **options
+        )
+
+    def create_order(self, amount, currency="INR"):
+        """
+        Creates an auto-captured order of ``amount`` paise; returns its id.
+        """
+        try:
+            order = self.client.order.create({
+                "amount": amount,
+                "currency": currency,
+                "payment_capture": 1,
+            })
+        except requests.RequestException as exc:
+            raise GatewayUnavailable(str(exc)) from exc
+        return order["id"]
+
+    def verify_payment(self, order_id, payment_id, signature):
+        try:
+            self.client.utility.verify_payment_signature({
+                "razorpay_order_id": order_id,
+                "razorpay_payment_id": payment_id,
+                "razorpay_signature": signature,
+            })
+        except razorpay.errors.SignatureVerificationError:
+            return False
+        return True
+
+
+class FakeGateway:
+    """
+    Hands out order ids locally and keeps the orders in ``orders``;
+    accepts payments signed with payment_signature(). While
+    ``unavailable`` is set, create_order() fails like an unreachable
+    gateway.
+    """
+
+    def __init__(self):
+        self.orders = []
+        self.unavailable = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_order(self, amount, currency="INR"):
+        if self.unavailable:
+            raise GatewayUnavailable("FakeGateway.unavailable is set")
+        with self._lock:
+            order_id = f"order_fake{next(self._ids)}"
+            self.orders.append({"id": order_id, "amount": amount, "currency": currency})
+        return order_id
+
+    def verify_payment(self, order_id, payment_id, signature):
+        return hmac.compare_digest(
+            signature or "",
+            payment_signature(order_id, payment_id or "")
+        )
+
+
+@lru_cache(maxsize=None)
+def get_gateway():
+    return import_string(settings.PAYMENT_GATEWAY)()
+
+
+@receiver(setting_changed)
+def reset_gateway(setting, **kwargs):
+    # override_settings(PAYMENT_GATEWAY=...) in tests
+    if setting == "PAYMENT_GATEWAY" or setting.startswith("RAZORPAY_"):
+        get_gateway.cache_clear()
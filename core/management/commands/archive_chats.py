@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from core.chat import archive_room
+from core.models import ChatMessage, ChatRoom
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the messages of chats whose adoption request was approved "
+        "or declined more than --days days ago (and that have been quiet "
+        "since) into compressed per-room ChatArchive rows, keeping the "
+        "ChatMessage table small. Meant to run from cron (e.g. nightly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        # decided_at is empty for requests decided before it existed
+        room_ids = list(
+            ChatRoom.objects.filter(
+                Q(adoption_request__decided_at__lt=cutoff)
+                | Q(adoption_request__decided_at__isnull=True),
+                adoption_request__status__in=["approved", "declined"],
+            )
+            .filter(Exists(ChatMessage.objects.filter(room=OuterRef("pk"))))
+            .exclude(Exists(ChatMessage.objects.filter(
+                room=OuterRef("pk"),
+                created_at__gte=cutoff
+            )))
+            .values_list("id", flat=True)
+        )
+
+        moved = sum(archive_room(room_id) for room_id in room_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {moved} messages from {len(room_ids)} chats."
+        ))
@@ -0,0 +1,125 @@
+import json
+import ssl
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import razorpay
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.gateway import RazorpayGateway
+
+
+class StubRazorpay(BaseHTTPRequestHandler):
+    """
+    Answers POST /v1/orders like the Razorpay API, over keep-alive
+    connections; counts the connections it accepted.
+    """
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as two writes; without this the second
+    # one waits for the client's delayed ACK (~40 ms) on reused sockets
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubRazorpay.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        order = json.loads(self.rfile.read(length) or b"{}")
+        body = json.dumps({
+            "id": f"order_stub{time.monotonic_ns()}",
+            "entity": "order",
+            "amount": order.get("amount"),
+            "currency": order.get("currency"),
+            "status": "created",
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Times order creation per checkout against a local stub of the "
+        "Razorpay API: a new razorpay.Client per request (the old views) "
+        "vs the pooled core.gateway client. Pass --certfile / --keyfile "
+        "to serve the stub over TLS, which is where the handshakes saved "
+        "by the pool show up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checkouts", type=int, default=200)
+        parser.add_argument("--certfile")
+        parser.add_argument("--keyfile")
+
+    def _timed(self, create_order, checkouts):
+        StubRazorpay.connections = 0
+        timings = []
+        for _ in range(checkouts):
+            start = time.perf_counter()
+            create_order()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, StubRazorpay.connections
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubRazorpay)
+        scheme = "http"
+        if options["certfile"]:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(options["certfile"], options["keyfile"])
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+            scheme = "https"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        base_url = f"{scheme}://127.0.0.1:{server.server_port}"
+        order = {"amount": 49900, "currency": "INR", "payment_capture": 1}
+
+        def per_request():
+            client = razorpay.Client(
+                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                base_url=base_url,
+            )
+            if options["certfile"]:
+                client.cert_path = options["certfile"]
+            client.order.create(order)
+
+        gateway = RazorpayGateway(base_url=base_url)
+        if options["certfile"]:
+            gateway.client.cert_path = options["certfile"]
+
+        try:
+            results = [
+                ("client per request", *self._timed(per_request, options["checkouts"])),
+                ("pooled gateway", *self._timed(
+                    lambda: gateway.create_order(order["amount"]), options["checkouts"]
+                )),
+            ]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(
+            f"{'':<20}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'connections':>13}"
+        )
+        for name, timings, connections in results:
+            self.stdout.write(
+                f"{name:<20}{statistics.mean(timings):>10.2f}"
+                f"{statistics.median(timings):>10.2f}"
+                f"{statistics.quantiles(timings, n=20)[-1]:>10.2f}"
+                f"{connections:>13}"
+            )
+
+        saved = statistics.mean(results[0][1]) - statistics.mean(results[1][1])
+        self.stdout.write(self.style.SUCCESS(
+            f"Pooled client saves {saved:.2f} ms per checkout ({scheme})."
+        ))
@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.models import PendingRendition
+from core.renditions import RENDITION_FIELDS, generate_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills thumbnail/WebP renditions for already uploaded images. "
+        "Safe to re-run (existing renditions are skipped) and to run in "
+        "the background, e.g. nohup python manage.py generate_image_renditions &. "
+        "With --queued, only processes the images queued by uploads; run "
+        "that from cron every minute."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate renditions that already exist.",
+        )
+        parser.add_argument(
+            "--queued",
+            action="store_true",
+            help="Process the upload queue (PendingRendition) instead of every image.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def _all_names(self):
+        for model_label, field_name in RENDITION_FIELDS:
+            model = apps.get_model(model_label)
+            names = model.objects.exclude(
+                **{f"{field_name}__isnull": True}
+            ).exclude(
+                **{field_name: ""}
+            ).values_list(field_name, flat=True)
+
+            for name in names.iterator(chunk_size=500):
+                yield model_label, name
+
+    def _queued_names(self, batch_size):
+        # Oldest first, a batch at a time; an entry leaves the queue once
+        # tried (a failed image is retried by a plain backfill run)
+        while True:
+            batch = list(
+                PendingRendition.objects.order_by("id").values_list("id", "name")[:batch_size]
+            )
+            if not batch:
+                return
+            for pending_id, name in batch:
+                yield "queued", name
+            PendingRendition.objects.filter(id__in=[pending_id for pending_id, _ in batch]).delete()
+
+    def handle(self, *args, **options):
+        created = skipped = failed = 0
+
+        if options["queued"]:
+            names = self._queued_names(options["batch_size"])
+        else:
+            names = self._all_names()
+
+        for label, name in names:
+            try:
+                written = generate_renditions(name, force=options["force"])
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{label} {name}: {exc}")
+                continue
+
+            if written:
+                created += 1
+            else:
+                skipped += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renditions: {created} images processed, "
+            f"{skipped} already done, {failed} failed."
+        ))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Pet, OwnedPet, AdoptableListing
+from core.signals import _listing_fields
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the AdoptableListing table from Pet and OwnedPet."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Listings keep their ids: pets_list pages newest first by id,
+            # and open keyset cursors point at them
+            listing_ids = {
+                (source, object_id): listing_id
+                for listing_id, source, object_id in AdoptableListing.objects.values_list(
+                    "id", "source", "object_id"
+                )
+            }
+
+            rows = [
+                (pet.updated_at, AdoptableListing(
+                    source="shelter",
+                    object_id=pet.id,
+                    **_listing_fields(pet, pet.added_by_id),
+                ))
+                for pet in Pet.objects.filter(is_available=True).iterator()
+            ]
+
+            owned_pets = OwnedPet.objects.filter(
+                is_listed_for_adoption=True
+            ).select_related("pet")
+
+            rows += [
+                (owned_pet.updated_at, AdoptableListing(
+                    source="owner",
+                    object_id=owned_pet.id,
+                    **_listing_fields(owned_pet.pet, owned_pet.owner_id),
+                ))
+                for owned_pet in owned_pets.iterator()
+            ]
+
+            for _, listing in rows:
+                listing.id = listing_ids.get((listing.source, listing.object_id))
+
+            # Pets missing from the table are appended (newest) in the
+            # order they were last changed, i.e. listed
+            rows.sort(key=lambda row: (row[1].id is None, row[1].id or 0, row[0]))
+            listings = [listing for _, listing in rows]
+
+            AdoptableListing.objects.all().delete()
+            AdoptableListing.objects.bulk_create(listings, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(listings)} adoptable listings rebuilt."
+        ))
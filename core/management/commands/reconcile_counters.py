@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.dashboard import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the platform counters from the source tables and "
+        "overwrites the PlatformCounters row, fixing drift from bulk "
+        "updates or raw SQL. Meant to run from cron (e.g. nightly)."
+    )
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters()
+
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"{key}: {stored} -> {actual}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Counters reconciled ({len(drift)} corrected)."
+        ))
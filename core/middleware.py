@@ -0,0 +1,171 @@
+# core/middleware.py
+
+import hashlib
+import logging
+import random
+import sys
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+logger = logging.getLogger("petverse.queries")
+
+# Stats bucket of every request that resolved to no view (404s, probes);
+# one row per raw path would let any client grow the table
+UNRESOLVED_VIEW = "<unresolved>"
+
+
+def _query_origin():
+    """
+    Template line (innermost node being rendered) or, failing that,
+    the first project source line that issued the current query.
+    """
+    base_dir = str(settings.BASE_DIR)
+    code_line = None
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+
+        if code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            token = getattr(node, "token", None)
+            origin = getattr(node, "origin", None)
+            if token is not None and origin is not None:
+                name = origin.template_name or origin.name
+                return f"{name}:{token.lineno}"
+
+        elif (
+            code_line is None
+            and code.co_filename.startswith(base_dir)
+            and "site-packages" not in code.co_filename
+            and code.co_filename != __file__
+        ):
+            filename = code.co_filename[len(base_dir):].lstrip("/\\")
+            code_line = f"{filename}:{frame.f_lineno}"
+
+        frame = frame.f_back
+
+    return code_line or "unknown"
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook grouping queries by SQL shape
+    (the SQL text before parameters are bound).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.total_ms += (time.perf_counter() - start) * 1000
+
+            shape = self.shapes.setdefault(sql, {"count": 0, "origin": None})
+            shape["count"] += 1
+            if shape["count"] == 2:
+                # Only repeated shapes are worth a stack walk
+                shape["origin"] = _query_origin()
+
+
+class QueryInspectorMiddleware:
+    """
+    Samples QUERY_INSPECTOR_SAMPLE_RATE of requests and records query
+    count / time per view. A query shape repeated at least
+    QUERY_INSPECTOR_REPEAT_THRESHOLD times in one request is logged
+    and stored as a RepeatedQuery (visible in the Django admin).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "QUERY_INSPECTOR_SAMPLE_RATE", 0)
+        self.repeat_threshold = getattr(settings, "QUERY_INSPECTOR_REPEAT_THRESHOLD", 5)
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        try:
+            self.report(request, recorder)
+        except DatabaseError:
+            logger.exception("Could not store query inspection")
+
+        return response
+
+    def report(self, request, recorder):
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else UNRESOLVED_VIEW
+
+        logger.info(
+            "%s: %d queries in %.1f ms",
+            view_name if match else request.path, recorder.count, recorder.total_ms
+        )
+
+        from .models import ViewQueryStats, RepeatedQuery
+
+        updated = ViewQueryStats.objects.filter(view_name=view_name).update(
+            requests=F("requests") + 1,
+            queries=F("queries") + recorder.count,
+            query_ms=F("query_ms") + recorder.total_ms,
+            max_queries=Greatest(F("max_queries"), recorder.count),
+            last_seen=timezone.now(),
+        )
+        if not updated:
+            try:
+                ViewQueryStats.objects.create(
+                    view_name=view_name,
+                    requests=1,
+                    queries=recorder.count,
+                    query_ms=recorder.total_ms,
+                    max_queries=recorder.count,
+                )
+            except IntegrityError:
+                pass  # another sampled request created it first
+
+        for sql, shape in recorder.shapes.items():
+            if shape["count"] < self.repeat_threshold:
+                continue
+
+            logger.warning(
+                "Repeated query x%d in %s at %s: %s",
+                shape["count"], view_name, shape["origin"], sql
+            )
+
+            shape_hash = hashlib.md5(sql.encode()).hexdigest()
+            updated = RepeatedQuery.objects.filter(
+                view_name=view_name,
+                shape_hash=shape_hash,
+            ).update(
+                occurrences=F("occurrences") + 1,
+                max_repeats=Greatest(F("max_repeats"), shape["count"]),
+                origin=shape["origin"][:300],
+                last_seen=timezone.now(),
+            )
+            if not updated:
+                try:
+                    RepeatedQuery.objects.create(
+                        view_name=view_name,
+                        shape_hash=shape_hash,
+                        sql=sql,
+                        origin=shape["origin"][:300],
+                        occurrences=1,
+                        max_repeats=shape["count"],
+                    )
+                except IntegrityError:
+                    pass
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_listings(apps, schema_editor):
+    Pet = apps.get_model("core", "Pet")
+    OwnedPet = apps.get_model("core", "OwnedPet")
+    AdoptableListing = apps.get_model("core", "AdoptableListing")
+
+    listings = [
+        AdoptableListing(
+            source="shelter",
+            object_id=pet.id,
+            pet=pet,
+            name=pet.name,
+            category=pet.category,
+            image=pet.image.name or "",
+        )
+        for pet in Pet.objects.filter(is_available=True).iterator()
+    ]
+    listings += [
+        AdoptableListing(
+            source="owner",
+            object_id=owned.id,
+            pet=owned.pet,
+            name=owned.pet.name,
+            category=owned.pet.category,
+            image=owned.pet.image.name or "",
+        )
+        for owned in OwnedPet.objects.filter(
+            is_listed_for_adoption=True
+        ).select_related("pet").iterator()
+    ]
+    AdoptableListing.objects.bulk_create(listings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_shelterprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdoptableListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('shelter', 'Shelter'), ('owner', 'Owner')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('name', models.CharField(max_length=100)),
+                ('category', models.CharField(max_length=100)),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('listed_at', models.DateTimeField(auto_now_add=True)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoptable_listings', to='core.pet')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', '-id'], name='listing_category_idx'), models.Index(fields=['source', '-id'], name='listing_source_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source', 'object_id'), name='unique_adoptable_listing')],
+            },
+        ),
+        migrations.RunPython(backfill_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_listed_by_and_categories(apps, schema_editor):
+    AdoptableListing = apps.get_model("core", "AdoptableListing")
+    OwnedPet = apps.get_model("core", "OwnedPet")
+
+    listings = AdoptableListing.objects.select_related("pet")
+    for listing in listings.iterator():
+        if listing.source == "owner":
+            listing.listed_by_id = OwnedPet.objects.values_list(
+                "owner_id", flat=True
+            ).get(id=listing.object_id)
+        else:
+            listing.listed_by_id = listing.pet.added_by_id
+
+        listing.category = " ".join(listing.category.split()).title()
+        listing.save(update_fields=["listed_by", "category"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_adoptablelisting'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adoptablelisting',
+            name='listed_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='adoptable_listings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(fill_listed_by_and_categories, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='adoptablelisting',
+            name='listed_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoptable_listings', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_news_updated_at_pet_updated_at'),
+        ('shop', '0006_hot_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='adoption_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(fields=['-created_at', '-id'], name='adoption_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ownedpet',
+            index=models.Index(fields=['is_listed_for_adoption'], name='ownedpet_listed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'payment_for', '-created_at', '-id'], name='payment_status_for_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_for', '-created_at', '-id'], name='payment_for_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-created_at', '-id'], name='payment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-amount', '-id'], name='payment_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='payment_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['receiver', 'status', '-created_at'], name='payment_receiver_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['is_available', '-id'], name='pet_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceappointment',
+            index=models.Index(fields=['status', '-appointment_date', '-appointment_time', '-id'], name='appointment_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceappointment',
+            index=models.Index(fields=['-appointment_date', '-appointment_time', '-id'], name='appointment_date_idx'),
+        ),
+    ]
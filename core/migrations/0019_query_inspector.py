@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewQueryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200, unique=True)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('queries', models.PositiveBigIntegerField(default=0)),
+                ('query_ms', models.FloatField(default=0)),
+                ('max_queries', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'View query stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='RepeatedQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200)),
+                ('shape_hash', models.CharField(max_length=32)),
+                ('sql', models.TextField()),
+                ('origin', models.CharField(max_length=300)),
+                ('occurrences', models.PositiveIntegerField(default=0)),
+                ('max_repeats', models.PositiveIntegerField(default=0)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Repeated queries',
+                'constraints': [models.UniqueConstraint(fields=('view_name', 'shape_hash'), name='unique_repeated_query')],
+            },
+        ),
+    ]
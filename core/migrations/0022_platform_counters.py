@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_pet_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.BigIntegerField(default=0)),
+                ('shelters', models.BigIntegerField(default=0)),
+                ('owners', models.BigIntegerField(default=0)),
+                ('adopters', models.BigIntegerField(default=0)),
+                ('total_pets', models.BigIntegerField(default=0)),
+                ('available_pets', models.BigIntegerField(default=0)),
+                ('total_adoption_requests', models.BigIntegerField(default=0)),
+                ('pending_adoptions', models.BigIntegerField(default=0)),
+                ('approved_adoptions', models.BigIntegerField(default=0)),
+                ('total_appointments', models.BigIntegerField(default=0)),
+                ('pending_appointments', models.BigIntegerField(default=0)),
+                ('confirmed_appointments', models.BigIntegerField(default=0)),
+                ('completed_appointments', models.BigIntegerField(default=0)),
+                ('total_products', models.BigIntegerField(default=0)),
+                ('active_products', models.BigIntegerField(default=0)),
+                ('total_orders', models.BigIntegerField(default=0)),
+                ('paid_orders', models.BigIntegerField(default=0)),
+                ('total_payments', models.BigIntegerField(default=0)),
+                ('successful_payments', models.BigIntegerField(default=0)),
+                ('failed_payments', models.BigIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('appointment_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('shop_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Platform counters',
+            },
+        ),
+    ]
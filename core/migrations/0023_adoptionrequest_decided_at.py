@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_platform_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adoptionrequest',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
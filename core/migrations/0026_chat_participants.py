@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def add_participants(apps, schema_editor):
+    """
+    Adopter + shelter / owner of every existing room (the read markers
+    already present are kept).
+    """
+    ChatRoom = apps.get_model("core", "ChatRoom")
+    ChatParticipant = apps.get_model("core", "ChatParticipant")
+
+    rooms = ChatRoom.objects.values_list(
+        "id",
+        "adoption_request__adopter_id",
+        "adoption_request__pet__added_by_id",
+        "adoption_request__owned_pet__owner_id",
+    ).order_by("id")
+
+    batch = []
+    for room_id, *user_ids in rooms.iterator(chunk_size=2000):
+        batch += [
+            ChatParticipant(room_id=room_id, user_id=user_id)
+            for user_id in set(user_ids) - {None}
+        ]
+        if len(batch) >= 2000:
+            ChatParticipant.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ChatParticipant.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_chat_read_markers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='chatreadmarker',
+            name='unique_chat_read_marker',
+        ),
+        migrations.RenameModel(
+            old_name='ChatReadMarker',
+            new_name='ChatParticipant',
+        ),
+        migrations.AlterField(
+            model_name='chatparticipant',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='core.chatroom'),
+        ),
+        migrations.AlterField(
+            model_name='chatparticipant',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='chatparticipant',
+            constraint=models.UniqueConstraint(fields=('room', 'user'), name='unique_chat_participant'),
+        ),
+        migrations.AddIndex(
+            model_name='chatparticipant',
+            index=models.Index(fields=['user', 'room'], name='chatparticipant_user_idx'),
+        ),
+        migrations.RunPython(add_participants, migrations.RunPython.noop),
+    ]
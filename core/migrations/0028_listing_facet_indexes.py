@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_chat_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adoptablelisting',
+            index=models.Index(fields=['source', 'category'], name='listing_source_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptablelisting',
+            index=models.Index(fields=['source', 'listed_by', 'category'], name='listing_source_lister_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_pending_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ownedpet',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -19,6 +19,15 @@ class Pet(models.Model):
         related_name="shelter_pets"
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_available", "-id"], name="pet_available_idx"),
+            # Prefix search in the Django admin
+            models.Index(fields=["name"], name="pet_name_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -53,6 +62,7 @@ class News(models.Model):
     content = models.TextField()
     image = models.ImageField(upload_to='news/')
     created_at = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "News"
@@ -96,10 +106,79 @@ class OwnedPet(models.Model):
 
     is_listed_for_adoption = models.BooleanField(default=False)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_listed_for_adoption"], name="ownedpet_listed_idx"),
+        ]
+
     def __str__(self):
         return f"{self.pet.name} owned by {self.owner.username}"
 
 
+# =========================
+# ADOPTABLE LISTING (Read model for pets_list)
+# =========================
+class AdoptableListing(models.Model):
+    """
+    One denormalized row per pet currently up for adoption:
+    an available shelter Pet or a listed OwnedPet.
+    Kept in sync by the signals in core/signals.py.
+    """
+
+    SOURCE_CHOICES = [
+        ('shelter', 'Shelter'),
+        ('owner', 'Owner'),
+    ]
+
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+
+    # Pet.id for shelter listings, OwnedPet.id for owner listings
+    object_id = models.PositiveBigIntegerField()
+
+    pet = models.ForeignKey(
+        Pet,
+        on_delete=models.CASCADE,
+        related_name="adoptable_listings"
+    )
+
+    # Shelter (Pet.added_by) or owner (OwnedPet.owner) offering the pet
+    listed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="adoptable_listings"
+    )
+
+    name = models.CharField(max_length=100)
+    category = models.CharField(max_length=100)
+    image = models.CharField(max_length=100, blank=True)
+
+    listed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "object_id"],
+                name="unique_adoptable_listing"
+            ),
+        ]
+        indexes = [
+            # Newest-first keyset pages, optionally filtered
+            models.Index(fields=["category", "-id"], name="listing_category_idx"),
+            models.Index(fields=["source", "-id"], name="listing_source_idx"),
+            # Facet counts (core/facets.py), grouped in index order
+            models.Index(fields=["source", "category"], name="listing_source_category_idx"),
+            models.Index(
+                fields=["source", "listed_by", "category"],
+                name="listing_source_lister_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.source})"
+
+
 # =========================
 # ADOPTION REQUEST
 # =========================
@@ -142,6 +221,16 @@ class AdoptionRequest(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the request leaves "pending" (core/adoptions.py)
+    decided_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at", "-id"], name="adoption_status_idx"),
+            models.Index(fields=["-created_at", "-id"], name="adoption_created_idx"),
+            # Late decisions re-rolled by core/rollups.py
+            models.Index(fields=["decided_at"], name="adoption_decided_idx"),
+        ]
 
     def clean(self):
         if not self.pet and not self.owned_pet:
@@ -237,6 +326,22 @@ class ServiceAppointment(models.Model):
 
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "-appointment_date", "-appointment_time", "-id"],
+                name="appointment_status_idx"
+            ),
+            models.Index(
+                fields=["-appointment_date", "-appointment_time", "-id"],
+                name="appointment_date_idx"
+            ),
+            # Incremental daily rollups (core/rollups.py)
+            models.Index(fields=["created_at"], name="appointment_created_idx"),
+            models.Index(fields=["updated_at"], name="appointment_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.service.name} | {self.owned_pet.pet.name} | {self.appointment_date}"
@@ -253,7 +358,7 @@ class ChatRoom(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Chat for Request #{self.adoption_request.id}"
+        return f"Chat for Request #{self.adoption_request_id}"
 
 
 class ChatMessage(models.Model):
@@ -269,9 +374,103 @@ class ChatMessage(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # History pages: WHERE room = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=["room", "created_at", "id"], name="chatmessage_room_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.sender.username}: {self.message[:20]}"
 
+
+class ChatParticipant(models.Model):
+    """
+    Membership of ``user`` in ``room`` (the adopter and the pet's
+    shelter / owner), added when the room is created. Access checks and
+    the inbox read this table instead of joining through the adoption
+    request. ``last_read_id``: messages with a higher id are unread; it
+    only moves forward (core.chat.mark_read).
+    """
+    room = models.ForeignKey(
+        ChatRoom,
+        on_delete=models.CASCADE,
+        related_name="participants"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="chat_memberships"
+    )
+    last_read_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "user"],
+                name="unique_chat_participant"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "room"], name="chatparticipant_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in room {self.room_id}"
+
+
+class ChatArchive(models.Model):
+    """
+    Messages of a closed chat, moved out of ChatMessage by
+    ``manage.py archive_chats`` into ChatArchiveChunk rows
+    (core.chat.archive_room / archived_before). The last message is
+    copied out for the inbox.
+    """
+    room = models.OneToOneField(
+        ChatRoom,
+        on_delete=models.CASCADE,
+        related_name="archive"
+    )
+    message_count = models.PositiveIntegerField(default=0)
+    last_message = models.TextField(blank=True)
+    last_sender = models.CharField(max_length=150, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Archive of room {self.room_id} ({self.message_count} messages)"
+
+
+class ChatArchiveChunk(models.Model):
+    """
+    Up to core.chat.ARCHIVE_CHUNK_SIZE consecutive archived messages:
+    ``data`` is zlib-compressed JSON, one ``[id, sender_id, message,
+    created_at]`` row per message, oldest first. Keyed by its first
+    message's (created_at, id), so a history page only decompresses
+    the chunks it shows.
+    """
+    archive = models.ForeignKey(
+        ChatArchive,
+        on_delete=models.CASCADE,
+        related_name="chunks"
+    )
+    first_at = models.DateTimeField()
+    first_id = models.PositiveBigIntegerField()
+    message_count = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["archive", "first_at", "first_id"],
+                name="unique_chat_archive_chunk"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.message_count} messages of archive {self.archive_id} from #{self.first_id}"
+
+
 class Payment(models.Model):
     PAYMENT_FOR_CHOICES = (
         ("appointment", "Appointment"),
@@ -321,7 +520,8 @@ class Payment(models.Model):
     razorpay_order_id = models.CharField(
         max_length=100,
         blank=True,
-        null=True
+        null=True,
+        db_index=True
     )
 
     razorpay_payment_id = models.CharField(
@@ -360,6 +560,189 @@ class Payment(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "payment_for", "-created_at", "-id"],
+                name="payment_status_for_idx"
+            ),
+            models.Index(fields=["payment_for", "-created_at", "-id"], name="payment_for_idx"),
+            models.Index(fields=["-created_at", "-id"], name="payment_created_idx"),
+            # Superadmin payment list sorted by amount
+            models.Index(fields=["-amount", "-id"], name="payment_amount_idx"),
+            models.Index(fields=["user", "status", "-created_at"], name="payment_user_idx"),
+            models.Index(fields=["receiver", "status", "-created_at"], name="payment_receiver_idx"),
+            # Late status changes re-rolled by core/rollups.py
+            models.Index(fields=["updated_at"], name="payment_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.payment_for} | ₹{self.amount} | {self.status}"
+
+
+# =========================
+# QUERY INSPECTOR (see core/middleware.py)
+# =========================
+class ViewQueryStats(models.Model):
+    """
+    Query count / time per view, accumulated over sampled requests.
+    """
+    view_name = models.CharField(max_length=200, unique=True)
+    requests = models.PositiveIntegerField(default=0)
+    queries = models.PositiveBigIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    max_queries = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "View query stats"
+
+    @property
+    def avg_queries(self):
+        return round(self.queries / self.requests, 1) if self.requests else 0
+
+    def __str__(self):
+        return self.view_name
+
+
+class RepeatedQuery(models.Model):
+    """
+    The same query shape run many times in one request (likely N+1),
+    with the template line or code line that triggered it.
+    """
+    view_name = models.CharField(max_length=200)
+    shape_hash = models.CharField(max_length=32)
+    sql = models.TextField()
+    origin = models.CharField(max_length=300)
+    occurrences = models.PositiveIntegerField(default=0)
+    max_repeats = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Repeated queries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["view_name", "shape_hash"],
+                name="unique_repeated_query"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.view_name} x{self.max_repeats} @ {self.origin}"
+
+
+# =========================
+# DAILY ROLLUPS (see core/rollups.py)
+# =========================
+class DailyMetric(models.Model):
+    """
+    Rows of one source table grouped by creation day, dimension
+    (payment_for for payments) and status.
+    """
+    METRIC_CHOICES = (
+        ("payment", "Payments"),
+        ("adoption", "Adoption requests"),
+        ("appointment", "Appointments"),
+        ("order", "Orders"),
+    )
+
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    day = models.DateField()
+    dimension = models.CharField(max_length=20, blank=True)
+    status = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric", "day", "dimension", "status"],
+                name="unique_daily_metric"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.day} {self.dimension} {self.status}: {self.count}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Days before ``day`` are rolled up for ``metric``; the next run only
+    reads source rows created from there on, plus the days of rows
+    changed since ``updated_at`` (the last run).
+    """
+    metric = models.CharField(max_length=20, unique=True)
+    day = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.metric} until {self.day}"
+
+
+# =========================
+# PLATFORM COUNTERS (see core/counters.py)
+# =========================
+class PlatformCounters(models.Model):
+    """
+    Single row (pk=1) of headline numbers, kept current by signals with
+    F() increments and corrected by ``manage.py reconcile_counters``.
+    Field names are the superadmin dashboard's context keys.
+    """
+    # Users
+    total_users = models.BigIntegerField(default=0)
+    shelters = models.BigIntegerField(default=0)
+    owners = models.BigIntegerField(default=0)
+    adopters = models.BigIntegerField(default=0)
+
+    # Pets & adoptions
+    total_pets = models.BigIntegerField(default=0)
+    available_pets = models.BigIntegerField(default=0)
+    total_adoption_requests = models.BigIntegerField(default=0)
+    pending_adoptions = models.BigIntegerField(default=0)
+    approved_adoptions = models.BigIntegerField(default=0)
+
+    # Appointments
+    total_appointments = models.BigIntegerField(default=0)
+    pending_appointments = models.BigIntegerField(default=0)
+    confirmed_appointments = models.BigIntegerField(default=0)
+    completed_appointments = models.BigIntegerField(default=0)
+
+    # Shop
+    total_products = models.BigIntegerField(default=0)
+    active_products = models.BigIntegerField(default=0)
+    total_orders = models.BigIntegerField(default=0)
+    paid_orders = models.BigIntegerField(default=0)
+
+    # Payments
+    total_payments = models.BigIntegerField(default=0)
+    successful_payments = models.BigIntegerField(default=0)
+    failed_payments = models.BigIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    appointment_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    shop_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Platform counters"
+
+    def __str__(self):
+        return f"Platform counters (reconciled {self.reconciled_at})"
+
+
+# =========================
+# IMAGE RENDITION QUEUE
+# =========================
+class PendingRendition(models.Model):
+    """
+    An uploaded image waiting for its renditions (core/renditions.py):
+    queued by the upload's post_save, generated outside the request by
+    ``manage.py generate_image_renditions --queued`` (cron, every minute).
+    """
+    name = models.CharField(max_length=255, unique=True)
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
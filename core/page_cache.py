@@ -0,0 +1,136 @@
+# core/page_cache.py
+
+"""
+Tag-invalidated response cache for public (anonymous) catalog pages.
+
+Each cached page is stored under a key built from the view, the URL with
+its sorted query params, and the current *version* of every tag the page
+depends on (e.g. "pets", "pet:42"). Invalidating a tag just bumps its
+version, so every page built from it stops being found and expires on
+its own. Bumping is done by the post_save/post_delete receivers in
+core/signals.py.
+
+Only anonymous GETs are cached. The CSRF token embedded in a cached page
+is swapped for a fresh one per visitor, so forms keep working.
+"""
+
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+
+CATALOG_CACHE_TIMEOUT = 60 * 15
+
+# Validators / caching headers set by core.conditional, replayed on hits
+CACHED_HEADERS = ("ETag", "Cache-Control")
+
+CSRF_INPUT_RE = re.compile(rb'name="csrfmiddlewaretoken" value="[^"]*"')
+CSRF_PLACEHOLDER = b'name="csrfmiddlewaretoken" value="__PAGE_CACHE_CSRF__"'
+
+
+def _tag_key(tag):
+    return f"pagecache:tag:{tag}"
+
+
+def _tag_versions(tags):
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # A fresh (time based) version never matches an evicted one
+            versions[key] = time.time_ns()
+            cache.add(key, versions[key], None)
+
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate_tags(*tags):
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def _page_key(request, view_name, tags):
+    query = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+    )
+    raw = "|".join([request.path, repr(query)] + _tag_versions(tags))
+    return f"pagecache:page:{view_name}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def _is_anonymous(request):
+    # No session cookie means anonymous without touching the session table
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return True
+    return not request.user.is_authenticated
+
+
+def cache_public_page(*tags, timeout=CATALOG_CACHE_TIMEOUT):
+    """
+    Caches a view's 200 responses for anonymous GETs.
+
+    Tags may use the view kwargs: @cache_public_page("pet:{pet_id}")
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method != "GET" or not _is_anonymous(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(
+                request,
+                view_func.__name__,
+                [tag.format(**kwargs) for tag in tags],
+            )
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+
+                response = get_conditional_response(request, etag=headers.get("ETag"))
+                if response is not None:
+                    for name, value in headers.items():
+                        response[name] = value
+                    patch_vary_headers(response, ("Cookie",))
+                    return response
+
+                if CSRF_PLACEHOLDER in content:
+                    token = get_token(request).encode()
+                    content = content.replace(
+                        CSRF_PLACEHOLDER,
+                        b'name="csrfmiddlewaretoken" value="' + token + b'"'
+                    )
+                response = HttpResponse(content, content_type=content_type)
+                for name, value in headers.items():
+                    response[name] = value
+                patch_vary_headers(response, ("Cookie",))
+                return response
+
+            response = view_func(request, *args, **kwargs)
+
+            if response.status_code == 200 and not response.streaming:
+                content = CSRF_INPUT_RE.sub(CSRF_PLACEHOLDER, response.content)
+                headers = {
+                    name: response[name]
+                    for name in CACHED_HEADERS
+                    if response.has_header(name)
+                }
+                cache.set(key, (content, response["Content-Type"], headers), timeout)
+                patch_vary_headers(response, ("Cookie",))
+
+            return response
+        return _wrapped
+    return decorator
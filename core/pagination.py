@@ -0,0 +1,205 @@
+# core/pagination.py
+
+"""
+Keyset (cursor) pagination helpers.
+
+Instead of OFFSET, every page is fetched with
+``WHERE id < <cursor> ORDER BY id DESC LIMIT <n>``, so the cost of a page
+stays the same no matter how deep into the table the visitor scrolls.
+"""
+
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.http import urlencode
+
+
+def parse_cursor(value):
+    """
+    Turns a ``?cursor=`` query value into a positive int (or None).
+    """
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+
+    return cursor if cursor > 0 else None
+
+
+def keyset_page(queryset, cursor=None, page_size=20):
+    """
+    Returns ``(items, next_cursor)`` for the newest-first page after cursor.
+
+    One extra row is fetched to know whether another page exists;
+    ``next_cursor`` is None on the last page.
+    """
+    if cursor:
+        queryset = queryset.filter(id__lt=cursor)
+
+    items = list(queryset.order_by("-id")[:page_size + 1])
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = items[-1].id
+
+    return items, next_cursor
+
+
+def keyset_batches(queryset, batch_size=1000):
+    """
+    Yields the whole queryset newest first as lists of ``batch_size``
+    rows, one short indexed query per batch (exports, batch jobs).
+    """
+    cursor = None
+    while True:
+        items, cursor = keyset_page(queryset, cursor, batch_size)
+        if items:
+            yield items
+        if cursor is None:
+            return
+
+
+# ======================================================
+# SORTABLE KEYSET PAGES (superadmin lists)
+# ======================================================
+# A sort column may span several fields (appointment date + time); the
+# primary key is always the final tie-breaker. The cursor carries the
+# last row's values:
+#
+#   WHERE date <= :date
+#     AND (date < :date OR (date = :date AND time < :time)
+#          OR (date = :date AND time = :time AND id < :id))
+#
+# The leading ``<=`` keeps it an index range scan.
+
+ADMIN_PAGE_SIZE = 50
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, model, fields):
+    """
+    Cursor token -> python values for ``fields`` + pk (None if invalid).
+    """
+    if not token:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields) + 1:
+            return None
+        model_fields = [model._meta.get_field(field) for field in fields]
+        model_fields.append(model._meta.pk)
+        return [
+            field.to_python(value)
+            for field, value in zip(model_fields, values)
+        ]
+    except (ValueError, TypeError, FieldDoesNotExist, ValidationError):
+        return None
+
+
+def _after(fields, values, descending):
+    """
+    Q for rows strictly after ``values`` in (fields..., pk) order.
+    """
+    lt = "lt" if descending else "gt"
+    lte = "lte" if descending else "gte"
+
+    branches = []
+    for index, field in enumerate(fields):
+        equal = dict(zip(fields[:index], values[:index]))
+        branches.append(Q(**equal, **{f"{field}__{lt}": values[index]}))
+
+    query = reduce(or_, branches)
+    if len(fields) > 1:
+        # Index range bound on the leading column
+        query &= Q(**{f"{fields[0]}__{lte}": values[0]})
+    return query
+
+
+def sorted_keyset_page(queryset, fields=(), descending=True, cursor=None,
+                       page_size=ADMIN_PAGE_SIZE):
+    """
+    Returns ``(items, next_cursor)`` ordered by ``fields`` then pk.
+    ``cursor`` is a token from a previous call.
+    """
+    fields = list(fields) + ["pk"]
+    prefix = "-" if descending else ""
+
+    values = decode_cursor(cursor, queryset.model, fields[:-1])
+    if values is not None:
+        queryset = queryset.filter(_after(fields, values, descending))
+
+    queryset = queryset.order_by(*[prefix + field for field in fields])
+    items = list(queryset[:page_size + 1])
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            [getattr(last, field) for field in fields[:-1]] + [last.pk]
+        )
+
+    return items, next_cursor
+
+
+def paginate_list(request, queryset, columns, default_sort,
+                  page_size=ADMIN_PAGE_SIZE):
+    """
+    ``?sort=<column>`` / ``?sort=-<column>`` + ``?cursor=`` for an admin
+    list. ``columns`` maps a column name to the fields it sorts by.
+
+    Returns the template context: ``items``, ``next_url``, ``first_url``,
+    ``sort`` (the active ``?sort=`` value) and ``sort_urls`` (column ->
+    link that sorts by it, toggling direction when already active).
+    """
+    sort = request.GET.get("sort") or default_sort
+    if sort.lstrip("-") not in columns:
+        sort = default_sort
+    column = sort.lstrip("-")
+    descending = sort.startswith("-")
+
+    items, next_cursor = sorted_keyset_page(
+        queryset,
+        columns[column],
+        descending=descending,
+        cursor=request.GET.get("cursor"),
+        page_size=page_size,
+    )
+
+    # Filters (status / for / ...) survive sorting and paging
+    params = [
+        (key, value)
+        for key, values in request.GET.lists()
+        if key not in ("sort", "cursor")
+        for value in values
+    ]
+
+    def url(**extra):
+        return "?" + urlencode(params + list(extra.items()))
+
+    sort_urls = {}
+    for name in columns:
+        if name == column:
+            toggled = name if descending else f"-{name}"
+            sort_urls[name] = url(sort=toggled)
+        else:
+            sort_urls[name] = url(sort=f"-{name}")
+
+    return {
+        "items": items,
+        "next_url": url(sort=sort, cursor=next_cursor) if next_cursor else None,
+        "first_url": url(sort=sort) if request.GET.get("cursor") else None,
+        "sort": sort,
+        "sort_urls": sort_urls,
+    }
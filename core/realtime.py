@@ -0,0 +1,312 @@
+# core/realtime.py
+
+"""
+WebSocket chat: ws://<host>/ws/chat/<request id>/?after=<last message id>
+
+petverse_project/asgi.py hands websocket connections to chat_websocket();
+plain HTTP still goes to Django. Run the project under an ASGI server
+(uvicorn / daphne petverse_project.asgi:application) for these to work;
+without one the chat page keeps polling core.views.chat_messages.
+
+A connection is authenticated from the session cookie, checked against
+the chat's participants, sent all the messages after ``?after`` in
+batches (so nothing is lost between page render and connect), then
+pushed every new message of the room. Clients send ``{"message": "..."}`` to post.
+
+Fan-out goes through the channel layer named by settings.CHAT_LAYER.
+ChatMessage post_save (core/signals.py) publishes each message after
+commit to the room's group; every subscribed connection gets it. The
+default InMemoryChatLayer only reaches connections of the same process:
+enough for tests and single-node dev. Multi-process deployments need a
+layer backed by a shared broker (e.g. Redis pub/sub) with the same
+subscribe / unsubscribe / publish methods.
+"""
+
+import asyncio
+import json
+import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from importlib import import_module
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest
+from django.http.cookie import parse_cookie
+from django.http.request import validate_host
+from django.utils.module_loading import import_string
+
+from .chat import chat_group, chat_room_for, mark_read, message_json, post_message
+from .models import ChatMessage
+
+
+CHAT_SOCKET_PATH = re.compile(r"^/ws/chat/(?P<req_id>\d+)/$")
+CHAT_BACKLOG_LIMIT = 100
+
+# Per connection; a client that falls this far behind is disconnected
+# with CLOSE_RESYNC and reconnects with ?after=
+CHAT_QUEUE_SIZE = 100
+
+CLOSE_FORBIDDEN = 4403
+CLOSE_RESYNC = 4000
+
+
+# =========================
+# CHANNEL LAYER
+# =========================
+class SubscriptionOverflow(Exception):
+    pass
+
+
+class Subscription:
+    """
+    One connection's inbox. Created on the connection's event loop;
+    deliver() may be called from any thread.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(CHAT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop already closed; the connection is gone
+            pass
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        event = await self.queue.get()
+        if self.overflowed:
+            raise SubscriptionOverflow
+        return event
+
+    def drain(self):
+        """
+        The events already queued, without waiting.
+        """
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        if self.overflowed:
+            raise SubscriptionOverflow
+        return events
+
+
+class InMemoryChatLayer:
+    """
+    Process-local groups of subscriptions.
+    """
+
+    def __init__(self):
+        self._groups = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, group):
+        subscription = Subscription(group)
+        with self._lock:
+            self._groups[group].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            members = self._groups.get(subscription.group)
+            if members is not None:
+                members.discard(subscription)
+                if not members:
+                    del self._groups[subscription.group]
+
+    def publish(self, group, event):
+        with self._lock:
+            members = list(self._groups.get(group, ()))
+        for subscription in members:
+            subscription.deliver(event)
+
+
+@lru_cache(maxsize=None)
+def get_chat_layer():
+    return import_string(settings.CHAT_LAYER)()
+
+
+def publish_message(msg):
+    get_chat_layer().publish(chat_group(msg.room_id), message_json(msg))
+
+
+# =========================
+# WEBSOCKET ENDPOINT
+# =========================
+def database_sync_to_async(func):
+    """
+    sync_to_async for ORM calls from a long-lived connection, dropping
+    stale DB connections the way request_started / finished do for HTTP.
+
+    Calls go to the event loop's thread pool (thread_sensitive=False):
+    each call is self-contained, connection cleanup included, so it
+    needn't share a thread with other calls, and a slow query only holds
+    one pool thread instead of queueing every socket and long poll
+    behind it. Idle connections hold no thread either way.
+    """
+    def call(*args):
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False)
+
+
+def session_user(session_key):
+    """
+    The user logged in with session ``session_key``, or None.
+    """
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+
+    user = get_user(request)
+    return user if user.is_authenticated else None
+
+
+def _authorize(session_key, req_id):
+    user = session_user(session_key)
+    if user is None:
+        return None
+
+    try:
+        room = chat_room_for(user, req_id)
+    except Http404:
+        return None
+    if room is None:
+        return None
+
+    return user, room
+
+
+def _backlog(room_id, after):
+    return [
+        message_json(msg)
+        for msg in ChatMessage.objects.filter(
+            room_id=room_id,
+            id__gt=after
+        ).select_related("sender").order_by("id")[:CHAT_BACKLOG_LIMIT]
+    ]
+
+
+def _origin_allowed(headers):
+    """
+    Browsers always send Origin on WebSocket handshakes; without this
+    check any site could open a chat with the visitor's cookies.
+    """
+    origin = headers.get(b"origin")
+    if origin is None:
+        return True
+
+    origin = origin.decode("latin-1")
+    if origin in settings.CSRF_TRUSTED_ORIGINS:
+        return True
+
+    return host_allowed(urlsplit(origin).hostname or "")
+
+
+def host_allowed(host):
+    """
+    ALLOWED_HOSTS check for requests that bypass Django's HTTP handler.
+    """
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = [".localhost", "127.0.0.1", "[::1]"]
+    return validate_host(host, allowed_hosts)
+
+
+async def _close(send, code):
+    await send({"type": "websocket.close", "code": code})
+
+
+async def chat_websocket(scope, receive, send):
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+
+    headers = dict(scope["headers"])
+    match = CHAT_SOCKET_PATH.match(scope["path"])
+    if match is None or not _origin_allowed(headers):
+        return await _close(send, CLOSE_FORBIDDEN)
+
+    cookies = parse_cookie(headers.get(b"cookie", b"").decode("latin-1"))
+    access = await database_sync_to_async(_authorize)(
+        cookies.get(settings.SESSION_COOKIE_NAME),
+        int(match["req_id"]),
+    )
+    if access is None:
+        return await _close(send, CLOSE_FORBIDDEN)
+    user, room = access
+
+    # Subscribe before reading the backlog so no message falls between
+    layer = get_chat_layer()
+    subscription = layer.subscribe(chat_group(room.id))
+
+    async def push():
+        try:
+            while True:
+                message = await subscription.get()
+                await send({"type": "websocket.send", "text": json.dumps(message)})
+                # Delivered to an open chat = read (own messages already are)
+                if message["sender"] != user.username:
+                    await database_sync_to_async(mark_read)(room.id, user, message["id"])
+        except SubscriptionOverflow:
+            await _close(send, CLOSE_RESYNC)
+
+    pusher = None
+    try:
+        await send({"type": "websocket.accept"})
+
+        # The whole backlog, CHAT_BACKLOG_LIMIT at a time: the client only
+        # accepts ids above its last one, so a gap would never be filled
+        after = parse_qs(scope.get("query_string", b"").decode()).get("after", [""])[0]
+        if after.isdigit():
+            after = int(after)
+            while True:
+                backlog = await database_sync_to_async(_backlog)(room.id, after)
+                for message in backlog:
+                    await send({"type": "websocket.send", "text": json.dumps(message)})
+                if backlog:
+                    after = backlog[-1]["id"]
+                    await database_sync_to_async(mark_read)(room.id, user, after)
+                if len(backlog) < CHAT_BACKLOG_LIMIT:
+                    break
+
+        pusher = asyncio.ensure_future(push())
+
+        while True:
+            event = await receive()
+            if event["type"] == "websocket.disconnect":
+                break
+            if event["type"] != "websocket.receive":
+                continue
+
+            try:
+                data = json.loads(event.get("text") or "")
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+
+            message = str(data.get("message", "")).strip()
+            if message:
+                await database_sync_to_async(post_message)(room.id, user, message)
+    finally:
+        if pusher is not None:
+            pusher.cancel()
+        layer.unsubscribe(subscription)
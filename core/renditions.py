@@ -0,0 +1,154 @@
+# core/renditions.py
+
+"""
+Fixed-size image renditions for uploaded photos.
+
+For every uploaded image (e.g. ``pets/rex.jpg``) we store, per width in
+RENDITION_WIDTHS, a WebP file and a JPEG/PNG fallback next to each other:
+
+    renditions/pets/rex_320w.webp   renditions/pets/rex_320w.jpg
+    renditions/pets/rex_640w.webp   renditions/pets/rex_640w.jpg
+
+Paths are derived from the original name, so templates need no extra
+database columns; see core/templatetags/renditions.py.
+
+Uploads only queue the image (PendingRendition, core/signals.py); the
+resizing runs outside the request in
+``manage.py generate_image_renditions --queued``.
+"""
+
+import hashlib
+import os
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .models import PendingRendition
+
+
+RENDITION_WIDTHS = (320, 640)
+
+RENDITION_ROOT = "renditions"
+
+# Models / image fields that get renditions (see core.signals)
+RENDITION_FIELDS = (
+    ("core.Pet", "image"),
+    ("core.News", "image"),
+    ("shop.Product", "image"),
+    ("accounts.User", "profile_image"),
+)
+
+# has_renditions() answers from the cache: renditions found for a day
+# (they are never deleted while in use), missing ones for a minute, so
+# an image waiting in the queue costs one storage lookup per minute
+RENDITION_CACHE_TIMEOUT = 60 * 60 * 24
+RENDITION_MISS_TIMEOUT = 60
+
+
+def _fallback_ext(name):
+    # Keep PNG for (possibly transparent) PNG uploads, JPEG for the rest
+    return "png" if name.lower().endswith(".png") else "jpg"
+
+
+def rendition_name(name, width, fmt):
+    base, _ = os.path.splitext(name)
+    ext = _fallback_ext(name) if fmt == "fallback" else "webp"
+    return f"{RENDITION_ROOT}/{base}_{width}w.{ext}"
+
+
+def _cache_key(name):
+    return f"renditions:{hashlib.md5(name.encode()).hexdigest()}"
+
+
+def has_renditions(name):
+    """
+    True once the largest WebP rendition of name exists.
+    """
+    if not name:
+        return False
+
+    key = _cache_key(name)
+    found = cache.get(key)
+    if found is None:
+        found = default_storage.exists(
+            rendition_name(name, RENDITION_WIDTHS[-1], "webp")
+        )
+        cache.set(
+            key, found,
+            RENDITION_CACHE_TIMEOUT if found else RENDITION_MISS_TIMEOUT
+        )
+    return found
+
+
+def queue_renditions(name):
+    """
+    Queues the stored image name for ``generate_image_renditions
+    --queued``; part of the caller's transaction.
+    """
+    PendingRendition.objects.bulk_create(
+        [PendingRendition(name=name)], ignore_conflicts=True
+    )
+
+
+def rendition_url(name, width=RENDITION_WIDTHS[0], fmt="webp"):
+    """
+    URL of a rendition, or of the original until renditions exist.
+    """
+    if not name:
+        return ""
+    if has_renditions(name):
+        return default_storage.url(rendition_name(name, width, fmt))
+    return default_storage.url(name)
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=80, method=4)
+    elif fmt == "png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(
+            buffer, "JPEG", quality=82, optimize=True, progressive=True
+        )
+
+    return ContentFile(buffer.getvalue())
+
+
+def generate_renditions(name, force=False):
+    """
+    Writes all renditions for the stored image name.
+    Returns the number of files written (0 if they already existed).
+    """
+    if not name or (not force and has_renditions(name)):
+        return 0
+
+    with default_storage.open(name, "rb") as original:
+        image = Image.open(original)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    written = 0
+    fallback = _fallback_ext(name)
+
+    # Largest last: has_renditions() only reports True once all are stored
+    for width in RENDITION_WIDTHS:
+        resized = image.copy()
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+
+        for fmt, ext in (("fallback", fallback), ("webp", "webp")):
+            path = rendition_name(name, width, fmt)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            default_storage.save(path, _encode(resized, ext))
+            written += 1
+
+    cache.set(_cache_key(name), True, RENDITION_CACHE_TIMEOUT)
+    return written
@@ -0,0 +1,217 @@
+# core/rollups.py
+
+"""
+Daily metric rollups.
+
+Payments, adoption requests, appointments and orders are grouped by
+creation day (+ payment_for for payments) and status into DailyMetric:
+
+    SELECT DATE(created_at), payment_for, status, COUNT(id), SUM(amount)
+    FROM core_payment WHERE created_at >= <watermark>
+    GROUP BY 1, 2, 3
+
+Each run only reads source rows created since the metric's watermark.
+Statuses keep changing after a row is created (pending -> paid, an
+adoption approved weeks later), so each run also re-aggregates the
+creation days of rows changed since the previous run, found through
+each source's change timestamp (updated_at, decided_at).
+
+Analytics then read a few hundred DailyMetric rows instead of the
+source tables.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from shop.models import Order
+from .models import (
+    AdoptionRequest,
+    DailyMetric,
+    Payment,
+    RollupWatermark,
+    ServiceAppointment,
+)
+
+
+# Changes are read from a little before the previous run, so a write
+# still in flight while it read is not missed
+CHANGE_OVERLAP = timedelta(minutes=10)
+
+# metric -> (source model, dimension field, amount field, change timestamp)
+ROLLUP_SOURCES = {
+    "payment": (Payment, "payment_for", "amount", "updated_at"),
+    "adoption": (AdoptionRequest, None, None, "decided_at"),
+    "appointment": (ServiceAppointment, None, None, "updated_at"),
+    "order": (Order, None, "total_amount", "updated_at"),
+}
+
+
+def day_start(day):
+    """
+    Aware datetime of local midnight starting ``day``.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def changed_days(model, changed_field, since, before):
+    """
+    Creation days (before ``before``) of the rows changed since ``since``.
+    """
+    return set(
+        model.objects
+        .filter(**{f"{changed_field}__gte": since}, created_at__lt=day_start(before))
+        .annotate(day=TruncDate("created_at"))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+
+
+def watermark_day(metric):
+    return (
+        RollupWatermark.objects
+        .filter(metric=metric)
+        .values_list("day", flat=True)
+        .first()
+    )
+
+
+def roll_up(metric, rebuild=False):
+    """
+    Re-aggregates ``metric`` from its watermark up to now, plus the days
+    of rows changed since the last run, and moves the watermark to
+    today. Returns rows written.
+    """
+    model, dimension, amount, changed_field = ROLLUP_SOURCES[metric]
+
+    with transaction.atomic():
+        watermark = None
+        if not rebuild:
+            watermark = RollupWatermark.objects.filter(metric=metric).first()
+
+        rows = model.objects.all()
+        stale = DailyMetric.objects.filter(metric=metric)
+        if watermark is not None:
+            start = watermark.day
+            reopened = changed_days(
+                model, changed_field, watermark.updated_at - CHANGE_OVERLAP, start
+            )
+
+            days = Q(created_at__gte=day_start(start))
+            for day in reopened:
+                days |= Q(
+                    created_at__gte=day_start(day),
+                    created_at__lt=day_start(day + timedelta(days=1)),
+                )
+            rows = rows.filter(days)
+            stale = stale.filter(Q(day__gte=start) | Q(day__in=reopened))
+
+        group_by = ["day", "status"] + ([dimension] if dimension else [])
+        aggregates = {"count": Count("id")}
+        if amount:
+            aggregates["total"] = Sum(amount)
+
+        rows = (
+            rows.annotate(day=TruncDate("created_at"))
+            .values(*group_by)
+            .annotate(**aggregates)
+            .order_by()
+        )
+
+        metrics = [
+            DailyMetric(
+                metric=metric,
+                day=row["day"],
+                dimension=row[dimension] if dimension else "",
+                status=row["status"],
+                count=row["count"],
+                amount=row.get("total") or 0,
+            )
+            for row in rows
+        ]
+
+        stale.delete()
+        DailyMetric.objects.bulk_create(metrics, batch_size=500)
+
+        # Today is still open; the next run picks it up again
+        RollupWatermark.objects.update_or_create(
+            metric=metric,
+            defaults={"day": timezone.localdate()},
+        )
+
+    return len(metrics)
+
+
+# ======================================================
+# READING
+# ======================================================
+def _bars(days, values):
+    """
+    [{"day", "value", "pct"}] for a CSS bar chart, zero-filled.
+    """
+    peak = max(values.values(), default=0) or 1
+    return [
+        {
+            "day": day,
+            "value": values.get(day, 0),
+            "pct": round(values.get(day, 0) * 100 / peak),
+        }
+        for day in days
+    ]
+
+
+def analytics_summary(days=30):
+    """
+    Series and totals for the superadmin analytics page, built from the
+    DailyMetric rows of the last ``days`` days (one query).
+    """
+    today = timezone.localdate()
+    first = today - timedelta(days=days - 1)
+    calendar = [first + timedelta(days=offset) for offset in range(days)]
+
+    adoption_requests = defaultdict(int)
+    adoptions_approved = defaultdict(int)
+    revenue = defaultdict(Decimal)
+    revenue_by_purpose = defaultdict(Decimal)
+    status_totals = defaultdict(lambda: defaultdict(int))
+
+    rows = DailyMetric.objects.filter(day__gte=first).values_list(
+        "metric", "day", "dimension", "status", "count", "amount"
+    )
+
+    for metric, day, dimension, status, count, amount in rows:
+        status_totals[metric][status] += count
+
+        if metric == "adoption":
+            adoption_requests[day] += count
+            if status == "approved":
+                adoptions_approved[day] += count
+
+        elif metric == "payment" and status == "paid":
+            revenue[day] += amount
+            revenue_by_purpose[dimension] += amount
+
+    purposes = dict(Payment.PAYMENT_FOR_CHOICES)
+
+    return {
+        "days": days,
+        "first_day": first,
+        "watermark": watermark_day("payment"),
+        "adoption_bars": _bars(calendar, adoption_requests),
+        "approved_bars": _bars(calendar, adoptions_approved),
+        "revenue_bars": _bars(calendar, revenue),
+        "total_revenue": sum(revenue.values(), Decimal(0)),
+        "revenue_by_purpose": [
+            (label, revenue_by_purpose.get(key, Decimal(0)))
+            for key, label in purposes.items()
+        ],
+        "status_breakdown": [
+            (label, sorted(status_totals[metric].items()))
+            for metric, label in DailyMetric.METRIC_CHOICES
+        ],
+    }
@@ -0,0 +1,220 @@
+# core/signals.py
+
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Pet, OwnedPet, AdoptableListing, ChatMessage, ChatRoom
+from .renditions import RENDITION_FIELDS, has_renditions, queue_renditions
+from .page_cache import invalidate_tags
+from .realtime import publish_message
+from .updates import notify_message
+from .chat import add_participants
+from .counters import (
+    COUNTER_SOURCES,
+    apply_deltas,
+    contribution,
+    diff,
+    stored_contribution,
+    tracks_any,
+)
+
+
+# =========================
+# ADOPTABLE LISTING SYNC
+# =========================
+def normalize_category(category):
+    # Pet.category is free text; "dog", " Dog " and "DOG" are one facet
+    return " ".join((category or "").split()).title()
+
+
+def _listing_fields(pet, listed_by_id):
+    return {
+        "pet": pet,
+        "listed_by_id": listed_by_id,
+        "name": pet.name,
+        "category": normalize_category(pet.category),
+        "image": pet.image.name or "",
+    }
+
+
+def sync_shelter_listing(pet):
+    if pet.is_available:
+        AdoptableListing.objects.update_or_create(
+            source="shelter",
+            object_id=pet.id,
+            defaults=_listing_fields(pet, pet.added_by_id),
+        )
+    else:
+        AdoptableListing.objects.filter(
+            source="shelter",
+            object_id=pet.id
+        ).delete()
+
+
+def sync_owner_listing(owned_pet):
+    if owned_pet.is_listed_for_adoption:
+        AdoptableListing.objects.update_or_create(
+            source="owner",
+            object_id=owned_pet.id,
+            defaults=_listing_fields(owned_pet.pet, owned_pet.owner_id),
+        )
+    else:
+        AdoptableListing.objects.filter(
+            source="owner",
+            object_id=owned_pet.id
+        ).delete()
+
+
+@receiver(post_save, sender=Pet)
+def pet_saved(sender, instance, **kwargs):
+    sync_shelter_listing(instance)
+
+    # Owner listings copy the pet's name/category/image too
+    AdoptableListing.objects.filter(
+        source="owner",
+        pet=instance
+    ).update(
+        name=instance.name,
+        category=normalize_category(instance.category),
+        image=instance.image.name or "",
+    )
+
+
+@receiver(post_save, sender=OwnedPet)
+def owned_pet_saved(sender, instance, **kwargs):
+    sync_owner_listing(instance)
+
+
+@receiver(post_delete, sender=Pet)
+def pet_deleted(sender, instance, **kwargs):
+    AdoptableListing.objects.filter(
+        source="shelter",
+        object_id=instance.id
+    ).delete()
+
+
+@receiver(post_delete, sender=OwnedPet)
+def owned_pet_deleted(sender, instance, **kwargs):
+    AdoptableListing.objects.filter(
+        source="owner",
+        object_id=instance.id
+    ).delete()
+
+
+# =========================
+# IMAGE RENDITIONS
+# =========================
+def _renditions_receiver(field_name):
+    def make_renditions(sender, instance, **kwargs):
+        name = getattr(instance, field_name).name
+        if name and not has_renditions(name):
+            # Resized by the queue's cron job, not in this request
+            queue_renditions(name)
+    return make_renditions
+
+
+for model_label, field_name in RENDITION_FIELDS:
+    post_save.connect(
+        _renditions_receiver(field_name),
+        sender=model_label,
+        weak=False,
+        dispatch_uid=f"renditions:{model_label}",
+    )
+
+
+# =========================
+# PUBLIC PAGE CACHE INVALIDATION
+# =========================
+@receiver([post_save, post_delete], sender=Pet)
+def pet_changed_invalidate(sender, instance, **kwargs):
+    invalidate_tags("pets", f"pet:{instance.id}")
+
+
+@receiver([post_save, post_delete], sender=OwnedPet)
+def owned_pet_changed_invalidate(sender, instance, **kwargs):
+    invalidate_tags("pets", f"pet:{instance.pet_id}")
+
+
+@receiver([post_save, post_delete], sender="core.Service")
+def service_changed_invalidate(sender, instance, **kwargs):
+    invalidate_tags("services")
+
+
+@receiver([post_save, post_delete], sender="shop.Product")
+def product_changed_invalidate(sender, instance, **kwargs):
+    invalidate_tags("products", f"product:{instance.id}")
+
+
+@receiver([post_save, post_delete], sender="shop.ProductCategory")
+def product_category_changed_invalidate(sender, instance, **kwargs):
+    invalidate_tags("products", "categories")
+
+
+# =========================
+# PLATFORM COUNTERS
+# =========================
+def counters_before_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not tracks_any(instance, update_fields):
+        return
+    instance._counted_before = stored_contribution(instance)
+
+
+def counters_after_save(sender, instance, raw=False, **kwargs):
+    before = instance.__dict__.pop("_counted_before", None)
+    if raw or before is None:
+        return
+    apply_deltas(diff(before, contribution(instance)))
+
+
+def counters_after_delete(sender, instance, **kwargs):
+    apply_deltas(diff(contribution(instance), {}))
+
+
+def _counter_receivers(model_label):
+    return [
+        (pre_save, counters_before_save, f"counters:before_save:{model_label}"),
+        (post_save, counters_after_save, f"counters:after_save:{model_label}"),
+        (post_delete, counters_after_delete, f"counters:after_delete:{model_label}"),
+    ]
+
+
+for model_label in COUNTER_SOURCES:
+    for signal, handler, uid in _counter_receivers(model_label):
+        signal.connect(handler, sender=model_label, dispatch_uid=uid)
+
+
+@contextmanager
+def counters_suspended(*model_labels):
+    """
+    Disconnects the counter receivers of ``model_labels`` for a bulk
+    job (deleting N rows otherwise runs N counter UPDATEs). The caller
+    runs core.dashboard.reconcile_counters() afterwards.
+    """
+    for model_label in model_labels:
+        for signal, handler, uid in _counter_receivers(model_label):
+            signal.disconnect(sender=model_label, dispatch_uid=uid)
+    try:
+        yield
+    finally:
+        for model_label in model_labels:
+            for signal, handler, uid in _counter_receivers(model_label):
+                signal.connect(handler, sender=model_label, dispatch_uid=uid)
+
+
+# =========================
+# CHAT MEMBERSHIP + FAN-OUT (core/chat.py, core/realtime.py)
+# =========================
+@receiver(post_save, sender=ChatRoom)
+def chat_room_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        add_participants(instance)
+
+
+@receiver(post_save, sender=ChatMessage)
+def chat_message_created(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: publish_message(instance), robust=True)
+        transaction.on_commit(lambda: notify_message(instance), robust=True)
@@ -0,0 +1,49 @@
+from django import template
+from django.utils.html import format_html
+from django.utils.http import urlencode
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def sort_header(context, column, label):
+    """
+    Column title linking to ``?sort=`` (see core.pagination.paginate_list),
+    with an arrow on the active column.
+
+    <th>{% sort_header "amount" "Amount" %}</th>
+    """
+    sort = context.get("sort", "")
+    arrow = ""
+    if sort == column:
+        arrow = " ▲"
+    elif sort == f"-{column}":
+        arrow = " ▼"
+
+    return format_html(
+        '<a href="{}" class="sort-link">{}{}</a>',
+        context["sort_urls"][column], label, arrow,
+    )
+
+
+@register.inclusion_tag("core/admin/_pager.html", takes_context=True)
+def pager(context):
+    return {
+        "first_url": context.get("first_url"),
+        "next_url": context.get("next_url"),
+    }
+
+
+@register.simple_tag(takes_context=True)
+def export_query(context, **extra):
+    """
+    The list's current filters (without sort / cursor) as a query string,
+    so an export returns exactly the rows being browsed.
+    """
+    params = [
+        (key, value)
+        for key, values in context["request"].GET.lists()
+        if key not in ("sort", "cursor", "format")
+        for value in values
+    ]
+    return urlencode(params + list(extra.items()))
@@ -0,0 +1,50 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from core.renditions import RENDITION_WIDTHS, has_renditions, rendition_name
+
+register = template.Library()
+
+
+DEFAULT_SIZES = "(max-width: 767px) 100vw, (max-width: 991px) 50vw, 33vw"
+
+
+def _srcset(name, fmt):
+    return ", ".join(
+        f"{default_storage.url(rendition_name(name, width, fmt))} {width}w"
+        for width in RENDITION_WIDTHS
+    )
+
+
+@register.simple_tag
+def responsive_img(image, alt="", sizes=DEFAULT_SIZES, **attrs):
+    """
+    <picture> with WebP + fallback srcsets for an ImageField file or a
+    stored image name. Falls back to the original until renditions exist.
+
+    {% responsive_img pet.image alt=pet.name class="img-responsive" %}
+    """
+    name = getattr(image, "name", image) or ""
+    if not name:
+        return ""
+
+    extra = format_html_join(
+        "", ' {}="{}"', ((key, value) for key, value in attrs.items())
+    )
+
+    if not has_renditions(name):
+        return format_html(
+            '<img src="{}" alt="{}" loading="lazy"{}>',
+            default_storage.url(name), alt, extra,
+        )
+
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy"{}>'
+        '</picture>',
+        _srcset(name, "webp"), sizes,
+        default_storage.url(rendition_name(name, RENDITION_WIDTHS[0], "fallback")),
+        _srcset(name, "fallback"), sizes, alt, extra,
+    )
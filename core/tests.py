@@ -1,3 +1,1115 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+import json
+from unittest import mock
+import warnings
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from shop.models import Order, OrderItem, Product, ProductCategory
+from shop.models import Payment as ShopPayment
+from . import chat, rollups
+from .chat import ARCHIVE_CHUNK_SIZE, history_page
+from .gateway import (
+    FakeGateway,
+    GatewayUnavailable,
+    RazorpayGateway,
+    get_gateway,
+    payment_signature,
+)
+from .middleware import UNRESOLVED_VIEW
+from .pagination import encode_cursor
+from .models import (
+    Pet,
+    OwnedPet,
+    Appointment,
+    News,
+    AdoptionRequest,
+    ServiceCategory,
+    Service,
+    ServiceAppointment,
+    ShelterProfile,
+    ChatRoom,
+    ChatMessage,
+    ChatArchive,
+    ChatArchiveChunk,
+    AdoptableListing,
+    Payment,
+    DailyMetric,
+    RollupWatermark,
+    ViewQueryStats,
+    RepeatedQuery,
+    PendingRendition,
+)
+
+
+# ======================================================
+# QUERY PLAN REGRESSION HARNESS
+# ======================================================
+def explain(sql, params):
+    """
+    Returns the plan rows for one SELECT on the test database.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        else:
+            cursor.execute("EXPLAIN " + sql, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Whole-table reads that are expected, by exact plan step. Unfiltered
+# first pages walk the table or a sort index in order and stop at LIMIT
+# (only allowed when the SELECT has no WHERE and a LIMIT); the listing
+# facet counts group every listing off a covering index.
+ALLOWED_SCANS = {
+    "sqlite": {
+        "SCAN core_adoptablelisting",
+        "SCAN core_adoptablelisting USING COVERING INDEX listing_source_category_idx",
+        "SCAN core_adoptionrequest USING INDEX adoption_created_idx",
+        "SCAN core_payment USING INDEX payment_created_idx",
+        "SCAN core_serviceappointment USING INDEX appointment_date_idx",
+        "SCAN shop_order USING INDEX order_created_idx",
+        "SCAN accounts_user USING INDEX user_joined_idx",
+    },
+    "mysql": {
+        ("core_adoptablelisting", "PRIMARY"),
+        ("core_adoptablelisting", "listing_source_category_idx"),
+        ("core_adoptionrequest", "adoption_created_idx"),
+        ("core_payment", "payment_created_idx"),
+        ("core_serviceappointment", "appointment_date_idx"),
+        ("shop_order", "order_created_idx"),
+        ("accounts_user", "user_joined_idx"),
+    },
+}
+
+
+def _bounded_page(sql):
+    return " WHERE " not in sql and " LIMIT " in sql
+
+
+def full_scans(sql, params, expected=()):
+    """
+    Plan steps that read a whole table or index, or sort or group into
+    a temporary structure, unless listed in ALLOWED_SCANS (or in
+    ``expected``, accepted for this query as they are).
+    """
+    problems = []
+    allowed = ALLOWED_SCANS.get(connection.vendor, set())
+
+    for step in explain(sql, params):
+        if connection.vendor == "sqlite":
+            detail = step["detail"]
+            if detail in expected:
+                continue
+            if detail.startswith("SCAN "):
+                if detail not in allowed:
+                    problems.append(detail)
+                elif " USING COVERING INDEX " not in detail and not _bounded_page(sql):
+                    problems.append(detail)
+            elif "USE TEMP B-TREE" in detail:
+                problems.append(detail)
+        elif connection.vendor == "mysql":
+            table, key = step.get("table"), step.get("key")
+            extra = step.get("Extra") or ""
+            if (table, key) in expected:
+                continue
+            if step.get("type") == "ALL":
+                problems.append(f"{table}: full table scan")
+            elif step.get("type") == "index":
+                if (table, key) not in allowed:
+                    problems.append(f"{table}: full scan of index {key}")
+                elif "Using index" not in extra and not _bounded_page(sql):
+                    problems.append(f"{table}: full scan of index {key}")
+            if "Using temporary" in extra or "Using filesort" in extra:
+                problems.append(f"{table}: {extra}")
+
+    return problems
+
+
+class QueryPlanMixin:
+    """
+    Runs a request, EXPLAINs every SELECT it issued against the
+    watched tables and fails on a full scan.
+    """
+
+    def capture_selects(self, url, tables):
+        captured = []
+
+        def collect(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith("SELECT") and any(
+                f'"{table}"' in sql or f"`{table}`" in sql
+                for table in tables
+            ):
+                captured.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(collect):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200, url)
+        return captured
+
+    def assertNoFullScans(self, url, tables, expected=()):
+        captured = self.capture_selects(url, tables)
+        self.assertTrue(captured, f"{url} ran no queries on {tables}")
+
+        for sql, params in captured:
+            problems = full_scans(sql, params, expected)
+            self.assertFalse(
+                problems,
+                f"{url} regressed to a full scan:\n{sql}\n{problems}"
+            )
+
+
+class HotFilterQueryPlanTests(QueryPlanMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "root", "root@example.com", "pass", role="admin"
+        )
+        cls.shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        cls.owner = User.objects.create_user("owner", password="pass", role="owner")
+        cls.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+
+        pets = [
+            Pet.objects.create(
+                name=f"Pet {i}",
+                category="Dog",
+                description="",
+                image="",
+                added_by=cls.shelter,
+                is_available=i % 2 == 0,
+            )
+            for i in range(6)
+        ]
+        owned = OwnedPet.objects.create(
+            owner=cls.owner, pet=pets[1], is_listed_for_adoption=True
+        )
+
+        for pet in pets[:3]:
+            AdoptionRequest.objects.create(adopter=cls.adopter, pet=pet)
+        AdoptionRequest.objects.create(adopter=cls.adopter, owned_pet=owned)
+
+        cls.chat = ChatRoom.objects.create(
+            adoption_request=AdoptionRequest.objects.first()
+        )
+        for i in range(5):
+            ChatMessage.objects.create(
+                room=cls.chat, sender=cls.adopter, message=f"Message {i}"
+            )
+
+        service = Service.objects.create(
+            category=ServiceCategory.objects.create(name="Grooming"),
+            name="Bath",
+            price=Decimal("100.00"),
+            duration_minutes=30,
+        )
+        appointment = ServiceAppointment.objects.create(
+            user=cls.owner,
+            owned_pet=owned,
+            service=service,
+            appointment_date=date(2026, 1, 1),
+            appointment_time=time(10, 0),
+        )
+
+        order = Order.objects.create(
+            user=cls.adopter, total_amount=Decimal("10.00"), status="paid"
+        )
+        Product.objects.create(
+            category=ProductCategory.objects.create(name="Food"),
+            name="Kibble",
+            price=Decimal("10.00"),
+        )
+
+        for payment_for, extra in (
+            ("appointment", {"appointment": appointment}),
+            ("shop", {"order": order}),
+            ("adoption", {"receiver": cls.shelter}),
+        ):
+            Payment.objects.create(
+                user=cls.adopter,
+                payment_for=payment_for,
+                amount=Decimal("10.00"),
+                status="paid",
+                razorpay_order_id=f"order_{payment_for}",
+                **extra,
+            )
+
+    def test_superadmin_adoptions_by_status(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans("/superadmin/adoptions/?status=pending", ["core_adoptionrequest"])
+
+    def test_superadmin_payments_by_status_and_type(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans("/superadmin/payments/?status=paid&for=shop", ["core_payment"])
+
+    def test_superadmin_payments_by_type(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans("/superadmin/payments/?for=adoption", ["core_payment"])
+
+    def test_superadmin_appointments_by_status(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans("/superadmin/appointments/?status=pending", ["core_serviceappointment"])
+
+    def test_superadmin_orders_by_status(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans("/superadmin/orders/?status=paid", ["shop_order"])
+
+    def test_superadmin_available_pets(self):
+        # SQLite compiles is_available=True to a bare WHERE "is_available",
+        # which no index serves: it walks core_pet newest first and stops
+        # at the page size (most pets are available). MySQL compares
+        # = true and uses pet_available_idx.
+        self.client.force_login(self.admin)
+        self.assertNoFullScans(
+            "/superadmin/pets/?available=1", ["core_pet"], expected={"SCAN core_pet"}
+        )
+
+    def test_superadmin_unfiltered_lists(self):
+        self.client.force_login(self.admin)
+        for url, table in (
+            ("/superadmin/adoptions/", "core_adoptionrequest"),
+            ("/superadmin/payments/", "core_payment"),
+            ("/superadmin/appointments/", "core_serviceappointment"),
+            ("/superadmin/orders/", "shop_order"),
+            ("/superadmin/users/", "accounts_user"),
+        ):
+            with self.subTest(url=url):
+                self.assertNoFullScans(url, [table])
+
+    def test_superadmin_sorted_pages_past_a_cursor(self):
+        self.client.force_login(self.admin)
+        for url, table, sort, values in (
+            ("/superadmin/payments/", "core_payment", "-amount", ["10.00"]),
+            ("/superadmin/payments/", "core_payment", "-date", [timezone.now()]),
+            ("/superadmin/orders/", "shop_order", "-total", ["10.00"]),
+            ("/superadmin/products/", "shop_product", "-price", ["10.00"]),
+            ("/superadmin/products/", "shop_product", "-stock", ["5"]),
+            ("/superadmin/products/", "shop_product", "-date", [timezone.now()]),
+            ("/superadmin/products/", "shop_product", "name", ["Kibble"]),
+            ("/superadmin/adoptions/", "core_adoptionrequest", "-date", [timezone.now()]),
+            ("/superadmin/users/", "accounts_user", "-joined", [timezone.now()]),
+            ("/superadmin/users/", "accounts_user", "username", ["adopter"]),
+            ("/superadmin/pets/", "core_pet", "name", ["Pet 1"]),
+        ):
+            cursor = encode_cursor(values + [1])
+            with self.subTest(url=url, sort=sort):
+                self.assertNoFullScans(
+                    f"{url}?{urlencode({'sort': sort, 'cursor': cursor})}", [table]
+                )
+
+    def test_payment_history(self):
+        self.client.force_login(self.shelter)
+        self.assertNoFullScans("/payments/history/", ["core_payment"])
+
+    def test_my_orders(self):
+        self.client.force_login(self.adopter)
+        self.assertNoFullScans("/shop/my-orders/", ["shop_order"])
+
+    def test_adopter_pets_list(self):
+        self.client.force_login(self.adopter)
+        self.assertNoFullScans("/pets/", ["core_adoptablelisting"])
+
+    def test_adopter_pets_list_facets(self):
+        self.client.force_login(self.adopter)
+        self.assertNoFullScans(
+            f"/pets/?category=Dog&shelter={self.shelter.id}", ["core_adoptablelisting"]
+        )
+        self.assertNoFullScans("/pets/?source=owner", ["core_adoptablelisting"])
+
+    def test_chat_history_page(self):
+        messages, before = history_page(self.chat, page_size=2)
+        self.client.force_login(self.adopter)
+        self.assertNoFullScans(
+            f"/chat/{self.chat.adoption_request_id}/history/?before={before}",
+            ["core_chatmessage"],
+        )
+
+    def test_razorpay_order_lookup(self):
+        queryset = Payment.objects.filter(razorpay_order_id="order_shop")
+        sql, params = queryset.query.sql_with_params()
+        self.assertFalse(full_scans(sql, params))
+
+    def test_harness_flags_unindexed_grouping_and_sorts(self):
+        for queryset in (
+            AdoptionRequest.objects.values("message").annotate(total=Count("id")).order_by(),
+            AdoptionRequest.objects.filter(status="pending").order_by("decided_at"),
+        ):
+            sql, params = queryset.query.sql_with_params()
+            self.assertTrue(full_scans(sql, params), sql)
+
+
+# ======================================================
+# DJANGO ADMIN CHANGELISTS
+# ======================================================
+# The sampled query inspector would add its own bookkeeping queries
+@override_settings(QUERY_INSPECTOR_SAMPLE_RATE=0)
+class AdminChangelistQueryTests(TestCase):
+    """
+    Every changelist must run the same number of queries whether it
+    lists a few rows or many (no per-row FK loads).
+    """
+
+    APPS = ("accounts", "core", "shop")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "root", "root@example.com", "pass", role="admin"
+        )
+        cls.batches = 0
+
+    def add_batch(self):
+        """
+        One row for every registered model (related rows included).
+        """
+        n = self.batches = self.batches + 1
+
+        shelter = User.objects.create_user(f"shelter{n}", password="pass", role="shelter")
+        owner = User.objects.create_user(f"owner{n}", password="pass", role="owner")
+        adopter = User.objects.create_user(f"adopter{n}", password="pass", role="adopter")
+        ShelterProfile.objects.create(user=shelter)
+
+        pet = Pet.objects.create(
+            name=f"Pet {n}", category="Dog", description="", image="",
+            added_by=shelter, is_available=True,
+        )
+        owned = OwnedPet.objects.create(
+            owner=owner,
+            pet=Pet.objects.create(
+                name=f"Owned {n}", category="Cat", description="", image="",
+                added_by=owner,
+            ),
+            is_listed_for_adoption=True,
+        )
+
+        shelter_request = AdoptionRequest.objects.create(adopter=adopter, pet=pet)
+        owner_request = AdoptionRequest.objects.create(adopter=adopter, owned_pet=owned)
+        for adoption in (shelter_request, owner_request):
+            room = ChatRoom.objects.create(adoption_request=adoption)
+            ChatMessage.objects.create(room=room, sender=adopter, message="Hi")
+            chat.add_participants(room)
+        archive = ChatArchive.objects.create(room=room, message_count=1, last_message="Bye")
+        ChatArchiveChunk.objects.create(
+            archive=archive, first_at=timezone.now(), first_id=n, message_count=1, data=b"",
+        )
+
+        service = Service.objects.create(
+            category=ServiceCategory.objects.create(name=f"Grooming {n}"),
+            name="Bath",
+            price=Decimal("100.00"),
+            duration_minutes=30,
+        )
+        appointment = ServiceAppointment.objects.create(
+            user=owner,
+            owned_pet=owned,
+            service=service,
+            appointment_date=date(2026, 1, n),
+            appointment_time=time(10, 0),
+        )
+        Appointment.objects.create(
+            name="Visitor", email="v@example.com", date=date(2026, 1, n),
+            service="Vet", phone="1",
+        )
+        News.objects.create(title=f"News {n}", content="", image="")
+
+        Product.objects.create(
+            category=ProductCategory.objects.create(name=f"Food {n}"),
+            name="Kibble",
+            price=Decimal("10.00"),
+        )
+        order = Order.objects.create(
+            user=adopter, total_amount=Decimal("10.00"), status="paid"
+        )
+        OrderItem.objects.create(
+            order=order, product_name="Kibble", price=Decimal("10.00"), quantity=1
+        )
+        ShopPayment.objects.create(order=order)
+
+        Payment.objects.create(
+            user=adopter, receiver=shelter, payment_for="adoption",
+            amount=Decimal("10.00"), adoption_request=shelter_request,
+        )
+        Payment.objects.create(
+            user=owner, payment_for="appointment",
+            amount=Decimal("10.00"), appointment=appointment,
+        )
+
+        DailyMetric.objects.create(
+            metric="payment", day=date(2026, 1, n), status="paid", count=1
+        )
+        RollupWatermark.objects.create(metric=f"metric{n}", day=date(2026, 1, n))
+        ViewQueryStats.objects.create(view_name=f"view{n}")
+        PendingRendition.objects.create(name=f"pets/pet{n}.jpg")
+        RepeatedQuery.objects.create(
+            view_name=f"view{n}", shape_hash=str(n), sql="SELECT 1", origin="x"
+        )
+
+    def changelist_queries(self):
+        counts = {}
+        for model in admin.site._registry:
+            opts = model._meta
+            if opts.app_label not in self.APPS:
+                continue
+
+            url = reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[opts.label] = len(queries)
+        return counts
+
+    def test_constant_queries_per_changelist(self):
+        self.client.force_login(self.admin)
+
+        self.add_batch()
+        few = self.changelist_queries()
+
+        for _ in range(4):
+            self.add_batch()
+        many = self.changelist_queries()
+
+        self.assertEqual(few, many)
+
+
+# ======================================================
+# WEBSOCKET CHAT (in-memory channel layer)
+# ======================================================
+@override_settings(QUERY_INSPECTOR_SAMPLE_RATE=0)
+class ChatWebSocketTests(TransactionTestCase):
+    def setUp(self):
+        self.shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        self.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+        self.outsider = User.objects.create_user("outsider", password="pass", role="adopter")
+        pet = Pet.objects.create(
+            name="Rex", category="Dog", description="", image="",
+            added_by=self.shelter, is_available=True,
+        )
+        self.adoption = AdoptionRequest.objects.create(adopter=self.adopter, pet=pet)
+
+    def session_cookie(self, user):
+        self.client.force_login(user)
+        return self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    async def connect(self, user, after=None, origin=b"http://localhost:8000"):
+        from petverse_project.asgi import application
+
+        cookie = await sync_to_async(self.session_cookie)(user)
+        socket = ApplicationCommunicator(application, {
+            "type": "websocket",
+            "path": f"/ws/chat/{self.adoption.id}/",
+            "query_string": b"" if after is None else f"after={after}".encode(),
+            "headers": [
+                (b"cookie", f"{settings.SESSION_COOKIE_NAME}={cookie}".encode()),
+                (b"origin", origin),
+            ],
+        })
+        await socket.send_input({"type": "websocket.connect"})
+        return socket, await socket.receive_output(timeout=5)
+
+    async def receive_json(self, socket):
+        event = await socket.receive_output(timeout=5)
+        self.assertEqual(event["type"], "websocket.send")
+        return json.loads(event["text"])
+
+    async def test_messages_are_pushed_to_every_participant(self):
+        adopter, accepted = await self.connect(self.adopter)
+        self.assertEqual(accepted["type"], "websocket.accept")
+        shelter, accepted = await self.connect(self.shelter)
+        self.assertEqual(accepted["type"], "websocket.accept")
+
+        await adopter.send_input({
+            "type": "websocket.receive",
+            "text": json.dumps({"message": "Is Rex still available?"}),
+        })
+        for socket in (adopter, shelter):
+            message = await self.receive_json(socket)
+            self.assertEqual(message["sender"], "adopter")
+            self.assertEqual(message["message"], "Is Rex still available?")
+
+        # Messages posted over HTTP are pushed too
+        await sync_to_async(self.client.post)(
+            reverse("chat_messages", args=[self.adoption.id]),
+            {"message": "Yes!"},
+        )
+        for socket in (adopter, shelter):
+            self.assertEqual((await self.receive_json(socket))["message"], "Yes!")
+
+        # A late connection catches up from ?after=
+        late, accepted = await self.connect(self.adopter, after=0)
+        backlog = [await self.receive_json(late), await self.receive_json(late)]
+        self.assertEqual([m["message"] for m in backlog], ["Is Rex still available?", "Yes!"])
+
+        for socket in (adopter, shelter, late):
+            await socket.send_input({"type": "websocket.disconnect", "code": 1000})
+            await socket.wait(timeout=5)
+
+    async def test_long_backlog_is_sent_in_full(self):
+        from .realtime import CHAT_BACKLOG_LIMIT
+
+        missed = CHAT_BACKLOG_LIMIT + 50
+
+        def post_missed():
+            room = ChatRoom.objects.create(adoption_request=self.adoption)
+            ChatMessage.objects.bulk_create(
+                ChatMessage(room=room, sender=self.shelter, message=f"missed {n}")
+                for n in range(missed)
+            )
+
+        await sync_to_async(post_missed)()
+
+        socket, accepted = await self.connect(self.adopter, after=0)
+        self.assertEqual(accepted["type"], "websocket.accept")
+        received = [(await self.receive_json(socket))["message"] for _ in range(missed)]
+        self.assertEqual(received, [f"missed {n}" for n in range(missed)])
+
+        await socket.send_input({"type": "websocket.disconnect", "code": 1000})
+        await socket.wait(timeout=5)
+
+    async def test_outsiders_and_foreign_origins_are_refused(self):
+        socket, event = await self.connect(self.outsider)
+        self.assertEqual(event, {"type": "websocket.close", "code": 4403})
+
+        socket, event = await self.connect(self.adopter, origin=b"https://evil.example")
+        self.assertEqual(event, {"type": "websocket.close", "code": 4403})
+
+
+class UpdatesLongPollTests(TransactionTestCase):
+    def setUp(self):
+        self.shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        self.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+        pet = Pet.objects.create(
+            name="Rex", category="Dog", description="", image="",
+            added_by=self.shelter, is_available=True,
+        )
+        self.adoption = AdoptionRequest.objects.create(adopter=self.adopter, pet=pet)
+        self.shelter_client = Client()
+        self.shelter_client.force_login(self.shelter)
+        self.shelter_client.get(reverse("chat_room", args=[self.adoption.id]))
+
+    def session_cookie(self, user):
+        self.client.force_login(user)
+        return self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    async def start(self, user, query=""):
+        from petverse_project.asgi import application
+
+        cookie = await sync_to_async(self.session_cookie)(user)
+        poll = ApplicationCommunicator(application, {
+            "type": "http",
+            "method": "GET",
+            "path": "/updates/",
+            "query_string": query.encode(),
+            "headers": [
+                (b"host", b"localhost"),
+                (b"cookie", f"{settings.SESSION_COOKIE_NAME}={cookie}".encode()),
+            ],
+        })
+        await poll.send_input({"type": "http.request", "body": b""})
+        return poll
+
+    async def response(self, poll, timeout=5):
+        start = await poll.receive_output(timeout=timeout)
+        body = await poll.receive_output(timeout=timeout)
+        return start["status"], json.loads(body["body"])
+
+    async def test_waiting_poll_is_woken_by_a_message(self):
+        poll = await self.start(self.adopter, "after=0&since=2020-01-01T00:00:00%2B00:00")
+        self.assertTrue(await poll.receive_nothing(timeout=0.3))
+
+        await sync_to_async(self.shelter_client.post)(
+            reverse("chat_messages", args=[self.adoption.id]),
+            {"message": "Rex is waiting for you"},
+        )
+        status, data = await self.response(poll)
+        self.assertEqual(status, 200)
+        [event] = data["events"]
+        self.assertEqual(event["type"], "chat_message")
+        self.assertEqual(event["request_id"], self.adoption.id)
+        self.assertEqual(event["message"]["message"], "Rex is waiting for you")
+        self.assertEqual(data["after"], event["message"]["id"])
+
+        # Missed while not waiting: answered from the database at once
+        poll = await self.start(self.adopter, "after=0")
+        status, data = await self.response(poll)
+        self.assertEqual(len(data["events"]), 1)
+
+    async def test_waiting_poll_is_woken_by_a_decision(self):
+        from .adoptions import decline_adoptions
+
+        poll = await self.start(self.adopter)
+        self.assertTrue(await poll.receive_nothing(timeout=0.3))
+
+        await sync_to_async(decline_adoptions)([self.adoption.id])
+        status, data = await self.response(poll)
+        self.assertEqual(data["events"], [{
+            "type": "adoption_status",
+            "request_id": self.adoption.id,
+            "status": "declined",
+            "decided_at": data["since"],
+        }])
+
+        # Nothing new past the returned cursor
+        poll = await self.start(self.adopter, urlencode({
+            "after": data["after"], "since": data["since"], "timeout": 0,
+        }))
+        status, data = await self.response(poll)
+        self.assertEqual(data["events"], [])
+
+    async def test_late_commit_of_an_earlier_decision_is_not_skipped(self):
+        poll = await self.start(self.adopter, "timeout=0")
+        status, data = await self.response(poll)
+        self.assertEqual(data["events"], [])
+
+        # Decided (decided_at) before that poll ran, committed after it
+        decided_at = timezone.now() - timedelta(seconds=5)
+        await sync_to_async(
+            AdoptionRequest.objects.filter(id=self.adoption.id).update
+        )(status="approved", decided_at=decided_at)
+
+        poll = await self.start(self.adopter, urlencode({
+            "after": data["after"], "since": data["since"], "timeout": 0,
+        }))
+        status, data = await self.response(poll)
+        self.assertEqual(
+            [(event["request_id"], event["status"]) for event in data["events"]],
+            [(self.adoption.id, "approved")],
+        )
+
+    async def test_timeout_and_anonymous(self):
+        poll = await self.start(self.shelter, "timeout=0")
+        status, data = await self.response(poll)
+        self.assertEqual((status, data["events"]), (200, []))
+
+        from petverse_project.asgi import application
+
+        poll = ApplicationCommunicator(application, {
+            "type": "http", "method": "GET", "path": "/updates/",
+            "query_string": b"", "headers": [(b"host", b"localhost")],
+        })
+        await poll.send_input({"type": "http.request", "body": b""})
+        status, data = await self.response(poll)
+        self.assertEqual(status, 403)
+
+
+class ChatArchiveTests(TestCase):
+    def setUp(self):
+        self.shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        self.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+        pet = Pet.objects.create(
+            name="Rex", category="Dog", description="", image="",
+            added_by=self.shelter, is_available=True,
+        )
+        self.adoption = AdoptionRequest.objects.create(adopter=self.adopter, pet=pet)
+        self.room = ChatRoom.objects.create(adoption_request=self.adoption)
+
+        long_ago = timezone.now() - timedelta(days=90)
+        for i in range(7):
+            ChatMessage.objects.create(
+                room=self.room,
+                sender=self.adopter if i % 2 else self.shelter,
+                message=f"message {i}",
+            )
+        ChatMessage.objects.update(created_at=long_ago)
+        AdoptionRequest.objects.filter(id=self.adoption.id).update(
+            status="approved", decided_at=long_ago
+        )
+
+    def history(self, page_size):
+        room = ChatRoom.objects.select_related("archive").get(id=self.room.id)
+        pages, before = [], None
+        while True:
+            messages, before = history_page(room, before, page_size=page_size)
+            pages.insert(0, [msg.message for msg in messages])
+            if before is None:
+                return pages
+
+    def test_closed_rooms_are_archived_and_still_readable(self):
+        call_command("archive_chats", days=30, stdout=StringIO())
+
+        self.assertFalse(ChatMessage.objects.exists())
+        archive = ChatArchive.objects.get(room=self.room)
+        self.assertEqual(archive.message_count, 7)
+        self.assertEqual(archive.last_message, "message 6")
+
+        self.assertEqual(self.history(3), [
+            ["message 0"], ["message 1", "message 2", "message 3"],
+            ["message 4", "message 5", "message 6"],
+        ])
+
+        # New messages stay live, in front of the archive
+        ChatMessage.objects.create(room=self.room, sender=self.adopter, message="thanks!")
+        self.assertEqual(self.history(3), [
+            ["message 0", "message 1"], ["message 2", "message 3", "message 4"],
+            ["message 5", "message 6", "thanks!"],
+        ])
+
+        # ... until the next run appends them
+        call_command("archive_chats", days=0, stdout=StringIO())
+        self.assertEqual(ChatArchive.objects.get(room=self.room).message_count, 8)
+        self.assertEqual(self.history(50), [
+            [f"message {i}" for i in range(7)] + ["thanks!"],
+        ])
+
+        from .chat import inbox_rooms
+        [room] = inbox_rooms(self.adopter)
+        self.assertEqual((room.last_message, room.last_sender), ("thanks!", "adopter"))
+
+        self.client.force_login(self.shelter)
+        response = self.client.get(reverse("chat_room", args=[self.adoption.id]))
+        self.assertContains(response, "message 6")
+
+    def test_a_history_page_only_decompresses_the_chunks_it_shows(self):
+        long_ago = timezone.now() - timedelta(days=90)
+        ChatMessage.objects.bulk_create([
+            ChatMessage(room=self.room, sender=self.adopter, message=f"old {i}")
+            for i in range(ARCHIVE_CHUNK_SIZE * 2)
+        ])
+        ChatMessage.objects.update(created_at=long_ago)
+        call_command("archive_chats", days=30, stdout=StringIO())
+        # Appending tops up the partial newest chunk
+        ChatMessage.objects.create(room=self.room, sender=self.shelter, message="late")
+        call_command("archive_chats", days=0, stdout=StringIO())
+
+        archive = ChatArchive.objects.get(room=self.room)
+        self.assertEqual(archive.message_count, ARCHIVE_CHUNK_SIZE * 2 + 8)
+        self.assertEqual(
+            sorted(archive.chunks.values_list("message_count", flat=True)),
+            [8, ARCHIVE_CHUNK_SIZE, ARCHIVE_CHUNK_SIZE],
+        )
+
+        decoded = []
+        chat_unpack = chat._unpack
+
+        def unpack(data):
+            rows = chat_unpack(data)
+            decoded.append(len(rows))
+            return rows
+
+        with mock.patch("core.chat._unpack", unpack):
+            pages = self.history(50)
+        self.assertLessEqual(max(decoded), ARCHIVE_CHUNK_SIZE)
+        self.assertLessEqual(len(decoded), 2 * len(pages))
+
+        self.assertEqual(
+            sum(pages, []),
+            [f"message {i}" for i in range(7)]
+            + [f"old {i}" for i in range(ARCHIVE_CHUNK_SIZE * 2)]
+            + ["late"],
+        )
+
+    def test_open_and_recently_active_rooms_stay_live(self):
+        AdoptionRequest.objects.filter(id=self.adoption.id).update(status="pending")
+        call_command("archive_chats", days=30, stdout=StringIO())
+        self.assertEqual(ChatMessage.objects.count(), 7)
+
+        AdoptionRequest.objects.filter(id=self.adoption.id).update(status="declined")
+        ChatMessage.objects.create(room=self.room, sender=self.adopter, message="one more")
+        call_command("archive_chats", days=30, stdout=StringIO())
+        self.assertEqual(ChatMessage.objects.count(), 8)
+        self.assertFalse(ChatArchive.objects.exists())
+
+
+# ======================================================
+# QUERY INSPECTOR (core/middleware.py)
+# ======================================================
+@override_settings(QUERY_INSPECTOR_SAMPLE_RATE=1)
+class QueryInspectorTests(TestCase):
+    def test_unresolved_paths_share_one_bucket(self):
+        for path in ("/no-such-page/", "/wp-login.php", "/no-such-page/?x=1"):
+            self.assertEqual(self.client.get(path).status_code, 404)
+
+        self.assertEqual(
+            list(ViewQueryStats.objects.values_list("view_name", "requests")),
+            [(UNRESOLVED_VIEW, 3)],
+        )
+
+
+# ======================================================
+# ADOPTABLE LISTINGS (manage.py rebuild_adoptable_listings)
+# ======================================================
+class RebuildAdoptableListingsTests(TestCase):
+    def test_rebuild_keeps_listing_order_and_appends_missing(self):
+        shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        owner = User.objects.create_user("owner", password="pass", role="owner")
+
+        def shelter_pet(name):
+            return Pet.objects.create(
+                name=name, category="Dog", description="", image="",
+                added_by=shelter, is_available=True,
+            )
+
+        first = shelter_pet("First")
+        owned = OwnedPet.objects.create(
+            owner=owner,
+            pet=Pet.objects.create(
+                name="Owned", category="Cat", description="", image="", added_by=owner,
+            ),
+            is_listed_for_adoption=True,
+        )
+        last = shelter_pet("Last")
+        ids = dict(AdoptableListing.objects.values_list("name", "id"))
+
+        # Drift the signals would have prevented
+        AdoptableListing.objects.filter(name="Owned").delete()
+        Pet.objects.filter(id=first.id).update(name="First renamed")
+
+        call_command("rebuild_adoptable_listings", stdout=StringIO())
+
+        listings = list(AdoptableListing.objects.order_by("-id").values_list("name", "object_id", "id"))
+        self.assertEqual(
+            [(name, object_id) for name, object_id, _ in listings],
+            [("Owned", owned.id), ("Last", last.id), ("First renamed", first.id)],
+        )
+        self.assertEqual(listings[1][2], ids["Last"])
+        self.assertEqual(listings[2][2], ids["First"])
+        self.assertGreater(listings[0][2], ids["Last"])
+
+
+# ======================================================
+# DAILY ROLLUPS (core/rollups.py)
+# ======================================================
+class DailyRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        cls.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+        cls.pet = Pet.objects.create(
+            name="Rex", category="Dog", description="", image="", added_by=shelter,
+        )
+        cls.old_day = timezone.localdate() - timedelta(days=30)
+
+    def create_old(self, model, **fields):
+        row = model.objects.create(**fields)
+        model.objects.filter(id=row.id).update(created_at=rollups.day_start(self.old_day))
+        return model.objects.get(id=row.id)
+
+    def metrics(self, metric):
+        return set(
+            DailyMetric.objects.filter(metric=metric, day=self.old_day)
+            .values_list("status", "count")
+        )
+
+    def test_late_status_change_re_rolls_its_creation_day(self):
+        adoption = self.create_old(AdoptionRequest, adopter=self.adopter, pet=self.pet)
+        payment = self.create_old(
+            Payment, user=self.adopter, payment_for="adoption", amount=Decimal("50.00"),
+        )
+        rollups.roll_up("adoption")
+        rollups.roll_up("payment")
+        self.assertEqual(self.metrics("adoption"), {("pending", 1)})
+        self.assertEqual(self.metrics("payment"), {("pending", 1)})
+
+        # Decided a month after the request, long past the watermark day
+        AdoptionRequest.objects.filter(id=adoption.id).update(
+            status="approved", decided_at=timezone.now()
+        )
+        payment.status = "paid"
+        payment.save()
+
+        rollups.roll_up("adoption")
+        rollups.roll_up("payment")
+        self.assertEqual(self.metrics("adoption"), {("approved", 1)})
+        self.assertEqual(self.metrics("payment"), {("paid", 1)})
+
+    def test_unchanged_old_days_are_not_re_read(self):
+        self.create_old(AdoptionRequest, adopter=self.adopter, pet=self.pet)
+        rollups.roll_up("adoption")
+
+        # Only a change (or --rebuild) reopens a day before the watermark
+        DailyMetric.objects.filter(metric="adoption").update(count=5)
+        rollups.roll_up("adoption")
+        self.assertEqual(self.metrics("adoption"), {("pending", 5)})
+
+        rollups.roll_up("adoption", rebuild=True)
+        self.assertEqual(self.metrics("adoption"), {("pending", 1)})
+
+
+# ======================================================
+# CONDITIONAL GET (core/conditional.py)
+# ======================================================
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.news = News.objects.create(title="Open day", content="", image="")
+        cls.url = reverse("news_detail", args=[cls.news.id])
+        cls.adopter = User.objects.create_user("adopter", password="pass", role="adopter")
+
+    def test_etag_revalidates_per_viewer(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Last-Modified"))
+        etag = response["ETag"]
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.force_login(self.adopter)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_alone_never_gets_304(self):
+        # The page differs per viewer, which a date cannot express
+        since = "Fri, 01 Jan 2100 00:00:00 GMT"
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+        self.client.force_login(self.adopter)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+
+# ======================================================
+# PAYMENT GATEWAY (core/gateway.py)
+# ======================================================
+@override_settings(PAYMENT_GATEWAY="core.gateway.FakeGateway")
+class PaymentGatewayTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass", role="owner")
+        shelter = User.objects.create_user("shelter", password="pass", role="shelter")
+        pet = Pet.objects.create(
+            name="Milo", category="Cat", description="", image="",
+            added_by=shelter, is_available=False,
+        )
+        self.appointment = ServiceAppointment.objects.create(
+            user=self.owner,
+            owned_pet=OwnedPet.objects.create(owner=self.owner, pet=pet),
+            service=Service.objects.create(
+                category=ServiceCategory.objects.create(name="Grooming"),
+                name="Bath",
+                price=Decimal("100.00"),
+                duration_minutes=30,
+            ),
+            appointment_date=date(2026, 1, 1),
+            appointment_time=time(10, 0),
+        )
+        self.payment = Payment.objects.create(
+            user=self.owner,
+            payment_for="appointment",
+            appointment=self.appointment,
+            amount=Decimal("100.00"),
+            status="pending",
+        )
+        self.client.force_login(self.owner)
+
+    def pay(self, signature=None):
+        self.payment.refresh_from_db()
+        order_id = self.payment.razorpay_order_id
+        return self.client.post(
+            reverse("appointment_payment_success", args=[self.payment.id]),
+            {
+                "razorpay_order_id": order_id,
+                "razorpay_payment_id": "pay_1",
+                "razorpay_signature": signature or payment_signature(order_id, "pay_1"),
+            },
+        )
+
+    def test_checkouts_share_one_gateway(self):
+        gateway = get_gateway()
+        self.assertIsInstance(gateway, FakeGateway)
+
+        self.client.get(reverse("appointment_payment_gateway", args=[self.appointment.id]))
+        order = Order.objects.create(user=self.owner, total_amount=Decimal("249.50"))
+        response = self.client.get(reverse("shop:payment_page", args=[order.id]))
+
+        self.assertIs(get_gateway(), gateway)
+        self.assertEqual([o["amount"] for o in gateway.orders], [10000, 24950])
+        self.assertContains(response, gateway.orders[-1]["id"])
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.razorpay_order_id, gateway.orders[0]["id"])
+
+    def test_signature_is_verified(self):
+        self.client.get(reverse("appointment_payment_gateway", args=[self.appointment.id]))
+
+        self.pay(signature="forged")
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, "failed")
+
+        self.pay()
+        self.payment.refresh_from_db()
+        self.appointment.refresh_from_db()
+        self.assertEqual((self.payment.status, self.appointment.status), ("paid", "confirmed"))
+
+    def test_unreachable_gateway_gets_a_retryable_page(self):
+        gateway = get_gateway()
+        gateway.unavailable = True
+        order = Order.objects.create(user=self.owner, total_amount=Decimal("249.50"))
+
+        for url in (
+            reverse("appointment_payment_gateway", args=[self.appointment.id]),
+            reverse("shop:payment_page", args=[order.id]),
+        ):
+            response = self.client.get(url)
+            self.assertContains(response, "Try again", status_code=503)
+        self.payment.refresh_from_db()
+        self.assertIsNone(self.payment.razorpay_order_id)
+
+        gateway.unavailable = False
+        response = self.client.get(reverse("shop:payment_page", args=[order.id]))
+        self.assertContains(response, gateway.orders[-1]["id"])
+
+    def test_network_errors_become_gateway_unavailable(self):
+        # Nothing listens on port 9
+        with override_settings(RAZORPAY_CONNECT_TIMEOUT=1):
+            gateway = RazorpayGateway(base_url="http://127.0.0.1:9")
+        with self.assertRaises(GatewayUnavailable):
+            gateway.create_order(100)
+
+
+# ======================================================
+# EXPORTS (core/exports.py)
+# ======================================================
+class ExportStreamingTests(TransactionTestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            "root", "root@example.com", "pass", role="admin"
+        )
+        for n in range(3):
+            Payment.objects.create(
+                user=admin_user, payment_for="shop", amount=Decimal("10.00"),
+                status="paid", razorpay_order_id=f"order_{n}",
+            )
+        self.client.force_login(admin_user)
+        self.cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    async def test_export_streams_under_asgi(self):
+        from petverse_project.asgi import application
+
+        export = ApplicationCommunicator(application, {
+            "type": "http",
+            "method": "GET",
+            "path": reverse("superadmin_export_payments"),
+            "query_string": b"",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"cookie", f"{settings.SESSION_COOKIE_NAME}={self.cookie}".encode()),
+            ],
+        })
+        await export.send_input({"type": "http.request", "body": b""})
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            start = await export.receive_output(timeout=5)
+            chunks = []
+            while True:
+                body = await export.receive_output(timeout=5)
+                chunks.append(body.get("body", b""))
+                if not body.get("more_body"):
+                    break
+
+        self.assertEqual(start["status"], 200)
+        # Header line first, on its own: nothing was buffered up front
+        self.assertTrue(chunks[0].startswith(b"id,created_at,user"))
+        self.assertEqual(len(b"".join(chunks).splitlines()), 4)
+        self.assertFalse([w for w in caught if "synchronous iterators" in str(w.message)])
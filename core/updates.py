@@ -0,0 +1,275 @@
+# core/updates.py
+
+"""
+Long-poll updates: GET /updates/?after=<message id>&since=<ISO time>
+
+Answers as soon as there is something new for the logged-in user:
+
+* ``chat_message``: a message from someone else in one of the user's
+  chats, id > ``after``;
+* ``adoption_status``: a decision on one of the user's adoption
+  requests, decided_at > ``since``;
+
+or with no events after ``?timeout=`` seconds (UPDATES_TIMEOUT by
+default). Each response carries the ``after`` / ``since`` to send next
+time; without them the wait starts from now.
+
+petverse_project/asgi.py routes UPDATES_PATH to updates_longpoll()
+before Django's HTTP handler, which keeps one thread per request (its
+sync request_started receivers and middleware run in a per-request
+executor) for as long as the request is open. Here a waiting request
+is a Subscription on the channel layer (core/realtime.py): a queue on
+the event loop. The database is only read on arrival, through
+database_sync_to_async(), never polled.
+
+Events are published after commit to the user's group by ChatMessage
+post_save (core/signals.py) and by approve_adoptions /
+decline_adoptions (core/adoptions.py). Without an ASGI server the same
+URL is core.views.updates, which answers right away (plain polling).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max
+from django.http.cookie import parse_cookie
+from django.http.request import split_domain_port
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .chat import message_json
+from .models import AdoptionRequest, ChatMessage, ChatParticipant
+from .realtime import (
+    SubscriptionOverflow,
+    database_sync_to_async,
+    get_chat_layer,
+    host_allowed,
+    session_user,
+)
+
+
+UPDATES_PATH = "/updates/"
+UPDATES_TIMEOUT = 25
+UPDATES_MAX_TIMEOUT = 55
+UPDATES_LIMIT = 100
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def user_group(user_id):
+    """
+    Channel layer group of a user's waiting long polls.
+    """
+    return f"user.{user_id}"
+
+
+def message_event(msg, req_id):
+    return {
+        "type": "chat_message",
+        "request_id": req_id,
+        "message": message_json(msg),
+    }
+
+
+def decision_event(adoption):
+    return {
+        "type": "adoption_status",
+        "request_id": adoption.id,
+        "status": adoption.status,
+        "decided_at": adoption.decided_at.isoformat(),
+    }
+
+
+# =========================
+# PUBLISHING (after commit)
+# =========================
+def notify_message(msg):
+    """
+    Wakes the other participants of ``msg``'s room.
+    """
+    layer = get_chat_layer()
+    recipients = (
+        ChatParticipant.objects.filter(room_id=msg.room_id)
+        .exclude(user_id=msg.sender_id)
+        .values_list("user_id", "room__adoption_request_id")
+    )
+    for user_id, req_id in recipients:
+        layer.publish(user_group(user_id), message_event(msg, req_id))
+
+
+def notify_decisions(adoptions):
+    """
+    Wakes the adopter of each decided request in queryset ``adoptions``.
+    """
+    layer = get_chat_layer()
+    for adoption in adoptions.only("id", "adopter", "status", "decided_at"):
+        layer.publish(user_group(adoption.adopter_id), decision_event(adoption))
+
+
+# =========================
+# READING
+# =========================
+def updates_cursor(params):
+    """
+    (after, since) from query parameters; None where missing or invalid.
+    """
+    after = params.get("after", "")
+    since = parse_datetime(params.get("since", ""))
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return (int(after) if after.isdigit() else None), since
+
+
+def pending_updates(user, after, since):
+    """
+    ``(events, after, since)``: what the user has missed since the
+    cursor, and the cursor past it. A missing cursor starts from now.
+
+    ``since`` only ever moves to a decided_at that was actually read:
+    decided_at is taken inside the deciding transaction, so a decision
+    may commit after a later clock reading, and a cursor set from the
+    clock would skip it.
+    """
+    if after is None:
+        after = ChatMessage.objects.aggregate(last=Max("id"))["last"] or 0
+        messages = []
+    else:
+        messages = list(
+            ChatMessage.objects.filter(
+                room__participants__user=user,
+                id__gt=after
+            )
+            .exclude(sender=user)
+            .select_related("sender", "room")
+            .order_by("id")[:UPDATES_LIMIT]
+        )
+
+    if since is None:
+        since = AdoptionRequest.objects.filter(adopter=user).aggregate(
+            last=Max("decided_at")
+        )["last"] or EPOCH
+        decisions = []
+    else:
+        decisions = list(
+            AdoptionRequest.objects.filter(adopter=user, decided_at__gt=since)
+            .only("id", "status", "decided_at")
+            .order_by("decided_at", "id")
+        )
+
+    events = [message_event(msg, msg.room.adoption_request_id) for msg in messages]
+    events += [decision_event(adoption) for adoption in decisions]
+
+    return advance(events, after, since)
+
+
+def advance(events, after, since):
+    """
+    The cursor past ``events``.
+    """
+    for event in events:
+        if event["type"] == "chat_message":
+            after = max(after, event["message"]["id"])
+        else:
+            since = max(since, parse_datetime(event["decided_at"]))
+    return events, after, since
+
+
+def updates_json(events, after, since):
+    return {"events": events, "after": after, "since": since.isoformat()}
+
+
+# =========================
+# ASGI ENDPOINT
+# =========================
+async def _respond(send, status, data):
+    body = json.dumps(data, cls=DjangoJSONEncoder).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cache-control", b"no-store"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _wait(subscription, disconnect, timeout):
+    """
+    The next events published to ``subscription`` (with any queued
+    behind them), [] on timeout, None if the client went away.
+    """
+    getter = asyncio.ensure_future(subscription.get())
+    try:
+        done, _ = await asyncio.wait(
+            {getter, disconnect},
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        getter.cancel()
+
+    if getter in done:
+        return [getter.result()] + subscription.drain()
+    if disconnect in done:
+        return None
+    return []
+
+
+async def updates_longpoll(scope, receive, send):
+    event = await receive()
+    while event["type"] == "http.request" and event.get("more_body"):
+        event = await receive()
+    if event["type"] == "http.disconnect":
+        return
+
+    headers = dict(scope["headers"])
+    host, _ = split_domain_port(headers.get(b"host", b"").decode("latin-1"))
+    if not host_allowed(host):
+        return await _respond(send, 400, {"error": "bad host"})
+    if scope["method"] != "GET":
+        return await _respond(send, 405, {"error": "GET only"})
+
+    cookies = parse_cookie(headers.get(b"cookie", b"").decode("latin-1"))
+    user = await database_sync_to_async(session_user)(
+        cookies.get(settings.SESSION_COOKIE_NAME)
+    )
+    if user is None:
+        return await _respond(send, 403, {"error": "forbidden"})
+
+    params = {
+        key: values[0]
+        for key, values in parse_qs(scope.get("query_string", b"").decode()).items()
+    }
+    after, since = updates_cursor(params)
+    timeout = params.get("timeout", "")
+    timeout = min(int(timeout), UPDATES_MAX_TIMEOUT) if timeout.isdigit() else UPDATES_TIMEOUT
+
+    # Subscribe before reading so nothing committed in between is missed
+    layer = get_chat_layer()
+    subscription = layer.subscribe(user_group(user.id))
+    disconnect = asyncio.ensure_future(receive())
+    try:
+        events, after, since = await database_sync_to_async(pending_updates)(
+            user, after, since
+        )
+        if not events:
+            try:
+                events = await _wait(subscription, disconnect, timeout)
+            except SubscriptionOverflow:
+                events, after, since = await database_sync_to_async(pending_updates)(
+                    user, after, since
+                )
+            if events is None:
+                return
+            events, after, since = advance(events, after, since)
+    finally:
+        disconnect.cancel()
+        layer.unsubscribe(subscription)
+
+    await _respond(send, 200, updates_json(events, after, since))
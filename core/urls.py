@@ -5,6 +5,7 @@ urlpatterns = [
 
     # -------------------- PUBLIC ROUTES --------------------
     path("", views.home, name="home"),
+    path("feed/", views.home_feed, name="home_feed"),
     path("dashboard/", views.dashboard_redirect, name="dashboard"),
     path("appointments/book/", views.appointment_page, name="appointment_page"),
 
@@ -15,6 +16,7 @@ urlpatterns = [
     path("logout/", views.user_logout, name="logout"),
     path("pets/", views.pets_list, name="pets_list"),
     path("pet/<int:pet_id>/", views.pet_detail, name="pet_detail"),
+    path("news/<int:news_id>/", views.news_detail, name="news_detail"),
     
 
     # -------------------- ADOPTER ROUTES --------------------
@@ -62,6 +64,7 @@ urlpatterns = [
     path("shelter/adoptions/", views.shelter_adoptions, name="shelter_adoptions"),
     path("shelter/adoptions/approve/<int:req_id>/", views.approve_request, name="approve_request"),
     path("shelter/adoptions/decline/<int:req_id>/", views.decline_request, name="decline_request"),
+    path("shelter/adoptions/bulk/", views.shelter_bulk_adoptions, name="shelter_bulk_adoptions"),
    
     path("payments/", views.payment, name="payment"),
     path("owner/pets/list/<int:pet_id>/", views.owner_list_pet, name="owner_list_pet"),
@@ -71,6 +74,7 @@ urlpatterns = [
     path("owner/adoptions/approve/<int:req_id>/",views.owner_approve_request,name="owner_approve_request"),
 
     path("owner/adoptions/reject/<int:req_id>/",views.owner_reject_request,name="owner_reject_request"),
+    path("owner/adoptions/bulk/",views.owner_bulk_adoptions,name="owner_bulk_adoptions"),
     path("superadmin/dashboard/",views.superadmin_dashboard,name="superadmin_dashboard"),
     path("superadmin/users/",views.superadmin_users,name="superadmin_users"),
     path("superadmin/orders/",views.superadmin_orders,name="superadmin_orders"),
@@ -80,16 +84,24 @@ urlpatterns = [
     path("superadmin/adoptions/",views.superadmin_adoptions,name="admin_adoptions"),
     path("superadmin/adoptions/<int:pk>/approve/",views.admin_approve_adoption,name="admin_approve_adoption"),
     path("superadmin/adoptions/<int:pk>/reject/",views.admin_reject_adoption,name="admin_reject_adoption"),
+    path("superadmin/adoptions/bulk/",views.admin_bulk_adoptions,name="admin_bulk_adoptions"),
     path("superadmin/appointments/", views.superadmin_appointments, name="superadmin_appointments"),
     path("my-services/",views.my_service_appointments,name="my_service_appointments"),
    
     path("chat/<int:req_id>/", views.chat_room, name="chat_room"),
+    path("chat/<int:req_id>/messages/", views.chat_messages, name="chat_messages"),
+    path("chat/<int:req_id>/history/", views.chat_history, name="chat_history"),
     path("chat/", views.chat_inbox, name="chat_inbox"),
+    # Served by core.updates.updates_longpoll under ASGI
+    path("updates/", views.updates, name="updates"),
     path("payments/<int:payment_id>/review/", views.payment_review, name="payment_review"),
     path("payments/<int:payment_id>/success/",views.payment_success,name="payment_success"),
     path("payments/history/",views.payment_history,name="payment_history"),
     path("superadmin/payments/",views.superadmin_payments,name="superadmin_payments"),
     path("superadmin/products/",views.superadmin_products,name="superadmin_products"),
+    path("superadmin/payments/export/",views.superadmin_export_payments,name="superadmin_export_payments"),
+    path("superadmin/orders/export/",views.superadmin_export_orders,name="superadmin_export_orders"),
+    path("superadmin/adoptions/export/",views.superadmin_export_adoptions,name="superadmin_export_adoptions"),
 
 
     
@@ -12,6 +12,7 @@ from .models import (
     Appointment,
     OwnedPet,
     AdoptionRequest,
+    AdoptableListing,
 )
 
 User = get_user_model()
@@ -24,9 +25,32 @@ from .models import Pet, OwnedPet, News
 from .models import Service
 from itertools import chain
 from .models import OwnedPet, Service
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.text import Truncator
+from .pagination import keyset_page, parse_cursor
+from .renditions import rendition_url
+from .page_cache import cache_public_page
+
+HOME_FEED_PAGE_SIZE = 12
+
+
+def _home_feed_page(request):
+    # Only the columns the pet cards render, newest first, one page at a time
+    pets = Pet.objects.only(
+        "id", "name", "category", "description", "image", "is_available"
+    )
+    return keyset_page(
+        pets,
+        cursor=parse_cursor(request.GET.get("cursor")),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+
+
+@cache_public_page("pets", "services")
 def home(request):
-    # Show ALL pets on homepage
-    pets = Pet.objects.all().order_by("-id")
+    # First page of the pet feed; the rest is loaded via home_feed
+    pets, next_cursor = _home_feed_page(request)
 
     services = Service.objects.filter(is_active=True)
 
@@ -36,10 +60,35 @@ def home(request):
 
     return render(request, "core/home.html", {
         "pets": pets,
+        "next_cursor": next_cursor,
         "owned_pets": owned_pets,
         "services": services,
     })
 
+
+@cache_public_page("pets")
+def home_feed(request):
+    """
+    JSON "next page" of the home pet feed (infinite scroll).
+    """
+    pets, next_cursor = _home_feed_page(request)
+
+    return JsonResponse({
+        "pets": [
+            {
+                "id": pet.id,
+                "name": pet.name,
+                "category": pet.category,
+                "description": Truncator(pet.description).words(15),
+                "image": rendition_url(pet.image.name, 640, "fallback"),
+                "is_available": pet.is_available,
+                "detail_url": reverse("pet_detail", args=[pet.id]),
+            }
+            for pet in pets
+        ],
+        "next_cursor": next_cursor,
+    })
+
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
 from .models import Appointment, ServiceAppointment, Service, OwnedPet
@@ -225,41 +274,39 @@ def adopter_dashboard(request):
         return redirect("home")
     return render(request, "core/dashboard_adopter.html")
 
+from django.utils.http import urlencode
+from .facets import parse_listing_filters, filter_listings, listing_facets
+
+PETS_LIST_PAGE_SIZE = 24
+
+
 @login_required
 def pets_list(request):
     if request.user.role != "adopter":
         return redirect("home")
 
-    shelter_pets = Pet.objects.filter(is_available=True)
+    filters = parse_listing_filters(request.GET)
 
-    owner_pets = OwnedPet.objects.filter(
-        is_listed_for_adoption=True
-    ).select_related("pet")
-
-    combined = []
-
-    for pet in shelter_pets:
-        combined.append({
-            "id": pet.id,
-            "name": pet.name,
-            "category": pet.category,
-            "image": pet.image,
-            "source": "shelter",
-        })
-
-    for owned in owner_pets:
-        combined.append({
-            "id": owned.id,
-            "name": owned.pet.name,
-            "category": owned.pet.category,
-            "image": owned.pet.image,
-            "source": "owner",
-        })
+    # One indexed, paginated query against the denormalized listing table
+    listings, next_cursor = keyset_page(
+        filter_listings(AdoptableListing.objects.all(), filters),
+        cursor=parse_cursor(request.GET.get("cursor")),
+        page_size=PETS_LIST_PAGE_SIZE,
+    )
+
+    next_url = None
+    if next_cursor:
+        next_url = "?" + urlencode({**filters, "cursor": next_cursor})
 
     return render(
         request,
         "core/pets_list.html",
-        {"pets": combined}
+        {
+            "pets": listings,
+            "next_url": next_url,
+            "facets": listing_facets(filters),
+            "filters": filters,
+        }
     )
 
 @login_required
@@ -419,7 +466,6 @@ def shelter_add_pet(request):
 # ADMIN (SUPER ADMIN) – EXTENDED SYSTEM OVERVIEW
 # ======================================================
 
-from django.db.models import Count, Sum
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 
@@ -436,131 +482,75 @@ User = get_user_model()
 # Shop models
 from shop.models import Product, Order
 
+from .dashboard import dashboard_snapshot
+from .pagination import paginate_list
+from .rollups import analytics_summary
+from .analytics import adoption_funnel
+
 
 @login_required
 def superadmin_dashboard(request):
     if not request.user.is_superuser:
         return redirect("home")
 
-    # =========================
-    # USERS
-    # =========================
-    total_users = User.objects.count()
-    shelters = User.objects.filter(role="shelter").count()
-    owners = User.objects.filter(role="owner").count()
-    adopters = User.objects.filter(role="adopter").count()
-
-    # =========================
-    # PETS & ADOPTIONS
-    # =========================
-    total_pets = Pet.objects.count()
-    available_pets = Pet.objects.filter(is_available=True).count()
-
-    total_adoption_requests = AdoptionRequest.objects.count()
-    approved_adoptions = AdoptionRequest.objects.filter(status="approved").count()
-
-    # =========================
-    # APPOINTMENTS
-    # =========================
-    total_appointments = ServiceAppointment.objects.count()
-    pending_appointments = ServiceAppointment.objects.filter(status="pending").count()
-    confirmed_appointments = ServiceAppointment.objects.filter(status="confirmed").count()
-    completed_appointments = ServiceAppointment.objects.filter(status="completed").count()
-
-    # Appointment revenue
-    appointment_revenue = Payment.objects.filter(
-        payment_for="appointment",
-        status="paid"
-    ).aggregate(total=Sum("amount"))["total"] or 0
-
-    # =========================
-    # SHOP
-    # =========================
-    total_products = Product.objects.count()
-    active_products = Product.objects.filter(is_active=True).count()
-
-    total_orders = Order.objects.count()
-    paid_orders = Order.objects.filter(status="paid").count()
-
-    shop_revenue = Payment.objects.filter(
-        payment_for="shop",
-        status="paid"
-    ).aggregate(total=Sum("amount"))["total"] or 0
+    # One read of the incrementally maintained PlatformCounters row
+    context = dashboard_snapshot()
 
-    # =========================
-    # PAYMENTS (GLOBAL)
-    # =========================
-    total_payments = Payment.objects.count()
-    successful_payments = Payment.objects.filter(status="paid").count()
-    failed_payments = Payment.objects.filter(status="failed").count()
+    return render(request, "core/admin/dashboard.html", context)
 
-    total_revenue = Payment.objects.filter(
-        status="paid"
-    ).aggregate(total=Sum("amount"))["total"] or 0
+# Sortable columns of the superadmin lists: ?sort=<name> -> fields
+ADMIN_USER_COLUMNS = {"joined": ("date_joined",), "username": ("username",)}
+ADMIN_PET_COLUMNS = {"id": (), "name": ("name",)}
+ADMIN_APPOINTMENT_COLUMNS = {
+    "date": ("appointment_date", "appointment_time"),
+    "booked": ("created_at",),
+}
+ADMIN_PAYMENT_COLUMNS = {"date": ("created_at",), "amount": ("amount",)}
+ADMIN_ADOPTION_COLUMNS = {"date": ("created_at",)}
+ADMIN_ORDER_COLUMNS = {"date": ("created_at",), "total": ("total_amount",)}
+ADMIN_PRODUCT_COLUMNS = {
+    "date": ("created_at",),
+    "name": ("name",),
+    "price": ("price",),
+    "stock": ("stock",),
+}
 
-    # =========================
-    # CONTEXT
-    # =========================
-    context = {
-        # Users
-        "total_users": total_users,
-        "shelters": shelters,
-        "owners": owners,
-        "adopters": adopters,
-
-        # Pets & Adoptions
-        "total_pets": total_pets,
-        "available_pets": available_pets,
-        "total_adoption_requests": total_adoption_requests,
-        "approved_adoptions": approved_adoptions,
-
-        # Appointments
-        "total_appointments": total_appointments,
-        "pending_appointments": pending_appointments,
-        "confirmed_appointments": confirmed_appointments,
-        "completed_appointments": completed_appointments,
-        "appointment_revenue": appointment_revenue,
-
-        # Shop
-        "total_products": total_products,
-        "active_products": active_products,
-        "total_orders": total_orders,
-        "paid_orders": paid_orders,
-        "shop_revenue": shop_revenue,
-
-        # Payments
-        "total_payments": total_payments,
-        "successful_payments": successful_payments,
-        "failed_payments": failed_payments,
-        "total_revenue": total_revenue,
-    }
-
-    return render(request, "core/admin/dashboard.html", context)
 
 @login_required
 def superadmin_users(request):
     if not request.user.is_superuser:
         return redirect("home")
 
-    users = User.objects.all().order_by("-date_joined")
-    return render(request, "core/admin/users.html", {"users": users})
+    users = User.objects.all()
+
+    # Filter by role (linked from the dashboard)
+    role = request.GET.get("role")
+    if role in ["adopter", "owner", "shelter", "admin"]:
+        users = users.filter(role=role)
+
+    page = paginate_list(request, users, ADMIN_USER_COLUMNS, "-joined")
+    return render(
+        request,
+        "core/admin/users.html",
+        {"users": page.pop("items"), **page}
+    )
 @login_required
 def superadmin_pets(request):
     if not request.user.is_superuser:
         return redirect("home")
 
-    pets = Pet.objects.all()
+    pets = Pet.objects.select_related("added_by")
 
     # Filter: available pets
     if request.GET.get("available") == "1":
         pets = pets.filter(is_available=True)
 
-    pets = pets.order_by("-id")
+    page = paginate_list(request, pets, ADMIN_PET_COLUMNS, "-id")
 
     return render(
         request,
         "core/admin/pets.html",
-        {"pets": pets}
+        {"pets": page.pop("items"), **page}
     )
 
 # ======================================================
@@ -582,15 +572,14 @@ def superadmin_appointments(request):
     if status in ["pending", "confirmed", "completed"]:
         appointments = appointments.filter(status=status)
 
-    appointments = appointments.order_by(
-        "-appointment_date",
-        "-appointment_time"
+    page = paginate_list(
+        request, appointments, ADMIN_APPOINTMENT_COLUMNS, "-date"
     )
 
     return render(
         request,
         "core/admin/appointments.html",
-        {"appointments": appointments}
+        {"appointments": page.pop("items"), **page}
     )
 
 # =========================
@@ -598,6 +587,20 @@ def superadmin_appointments(request):
 # =========================
 from django.contrib.auth.decorators import login_required
 from .models import Payment
+def _filter_admin_payments(payments, params):
+    # Filter by status
+    status = params.get("status")
+    if status in ["paid", "pending", "failed"]:
+        payments = payments.filter(status=status)
+
+    # Filter by payment type
+    payment_for = params.get("for")
+    if payment_for in ["appointment", "shop", "adoption"]:
+        payments = payments.filter(payment_for=payment_for)
+
+    return payments
+
+
 @login_required
 def superadmin_payments(request):
     if not request.user.is_superuser:
@@ -611,24 +614,25 @@ def superadmin_payments(request):
         "adoption_request"
     )
 
-    # Filter by status
-    status = request.GET.get("status")
-    if status in ["paid", "pending", "failed"]:
-        payments = payments.filter(status=status)
-
-    # Filter by payment type
-    payment_for = request.GET.get("for")
-    if payment_for in ["appointment", "shop", "adoption"]:
-        payments = payments.filter(payment_for=payment_for)
+    payments = _filter_admin_payments(payments, request.GET)
 
-    payments = payments.order_by("-created_at")
+    page = paginate_list(request, payments, ADMIN_PAYMENT_COLUMNS, "-date")
 
     return render(
         request,
         "core/admin/payments.html",
-        {"payments": payments}
+        {"payments": page.pop("items"), **page}
     )
 
+def _filter_admin_adoptions(adoptions, params):
+    # Filter by status (approved / pending / declined)
+    status = params.get("status")
+    if status in ["pending", "approved", "declined"]:
+        adoptions = adoptions.filter(status=status)
+
+    return adoptions
+
+
 @login_required
 def superadmin_adoptions(request):
     if not request.user.is_superuser:
@@ -638,35 +642,27 @@ def superadmin_adoptions(request):
         "pet", "owned_pet", "adopter"
     )
 
-    # Filter by status (approved / pending / declined)
-    status = request.GET.get("status")
-    if status in ["pending", "approved", "declined"]:
-        adoptions = adoptions.filter(status=status)
+    adoptions = _filter_admin_adoptions(adoptions, request.GET)
 
-    adoptions = adoptions.order_by("-created_at")
+    page = paginate_list(request, adoptions, ADMIN_ADOPTION_COLUMNS, "-date")
 
     return render(
         request,
         "core/admin/adoptions.html",
-        {"adoptions": adoptions}
+        {"adoptions": page.pop("items"), **page}
     )
 
+from django.db.models import Q
+from .adoptions import approve_adoptions, decline_adoptions
+
+
 @login_required
 def admin_approve_adoption(request, pk):
     if not request.user.is_superuser:
         return redirect("home")
 
-    adoption = get_object_or_404(AdoptionRequest, pk=pk)
-    adoption.status = "approved"
-    adoption.save()
-
-    if adoption.pet:
-        adoption.pet.is_available = False
-        adoption.pet.save()
-
-    if adoption.owned_pet:
-        adoption.owned_pet.is_available = False
-        adoption.owned_pet.save()
+    get_object_or_404(AdoptionRequest, pk=pk)
+    approve_adoptions([pk])
 
     return redirect("admin_adoptions")
 
@@ -676,22 +672,85 @@ def admin_reject_adoption(request, pk):
     if not request.user.is_superuser:
         return redirect("home")
 
-    adoption = get_object_or_404(AdoptionRequest, pk=pk)
-    adoption.status = "declined"
-    adoption.save()
+    get_object_or_404(AdoptionRequest, pk=pk)
+    decline_adoptions([pk])
 
     return redirect("admin_adoptions")
 
+
+def _bulk_adoption_decision(request, scope, next_url):
+    """
+    POST ids=<id>&ids=<id>...&action=approve|decline
+    """
+    if request.method != "POST":
+        return redirect(next_url)
+
+    ids = [int(pk) for pk in request.POST.getlist("ids") if pk.isdigit()]
+    action = request.POST.get("action")
+
+    if action == "approve":
+        approved, declined = approve_adoptions(ids, scope)
+        messages.success(
+            request,
+            f"{approved} request(s) approved, {declined} competing request(s) declined."
+        )
+    elif action == "decline":
+        declined = decline_adoptions(ids, scope)
+        messages.success(request, f"{declined} request(s) declined.")
+
+    return redirect(next_url)
+
+
+@login_required
+def admin_bulk_adoptions(request):
+    if not request.user.is_superuser:
+        return redirect("home")
+
+    return _bulk_adoption_decision(request, Q(), "admin_adoptions")
+
 # ======================================================
 # PATCHED STUB VIEWS (URL COMPATIBILITY)
 # ======================================================
 
 # ---------- PUBLIC ----------
+from django.db.models.functions import Greatest
+from .conditional import conditional_on
+
+
+def _pet_updated_at(pet_id):
+    return Pet.objects.filter(
+        id=pet_id
+    ).values_list("updated_at", flat=True).first()
+
+
+def _owned_pet_updated_at(pet_id):
+    # The page shows both the ownership and the pet
+    return OwnedPet.objects.filter(
+        id=pet_id
+    ).values_list(
+        Greatest("updated_at", "pet__updated_at"), flat=True
+    ).first()
+
+
+def _news_updated_at(news_id):
+    return News.objects.filter(
+        id=news_id
+    ).values_list("updated_at", flat=True).first()
+
+
+@cache_public_page("pet:{pet_id}")
+@conditional_on(_pet_updated_at)
 def pet_detail(request, pet_id):
     pet = get_object_or_404(Pet, id=pet_id)
     return render(request, "core/pet_detail.html", {"pet": pet})
 
 
+@conditional_on(_news_updated_at)
+def news_detail(request, news_id):
+    news = get_object_or_404(News, id=news_id)
+    return render(request, "core/news_detail.html", {"news": news})
+
+
 # ---------- ADOPTER ----------
 @login_required
 def adopter_profile(request):
@@ -772,7 +831,7 @@ def owner_add_pet(request):
 def owner_adoptions(request):
     requests = AdoptionRequest.objects.filter(
         owned_pet__owner=request.user
-    )
+    ).select_related("adopter", "owned_pet__pet")
     return render(
         request,
         "core/owner_adoptions.html",
@@ -811,6 +870,7 @@ def owner_profile(request):
 
 
 @login_required
+@conditional_on(_owned_pet_updated_at)
 def owned_pet_detail(request, pet_id):
     pet = get_object_or_404(OwnedPet, id=pet_id)
     return render(
@@ -822,33 +882,35 @@ def owned_pet_detail(request, pet_id):
 
 @login_required
 def owner_approve_request(request, req_id):
-    req = get_object_or_404(
+    get_object_or_404(
         AdoptionRequest,
         id=req_id,
         owned_pet__owner=request.user
     )
-    req.status = "approved"
-    req.save()
-
-    req.owned_pet.is_available = False
-    req.owned_pet.save()
+    approve_adoptions([req_id], Q(owned_pet__owner=request.user))
 
     return redirect("owner_adoptions")
 
 
 @login_required
 def owner_reject_request(request, req_id):
-    req = get_object_or_404(
+    get_object_or_404(
         AdoptionRequest,
         id=req_id,
         owned_pet__owner=request.user
     )
-    req.status = "declined"
-    req.save()
+    decline_adoptions([req_id], Q(owned_pet__owner=request.user))
 
     return redirect("owner_adoptions")
 
 
+@login_required
+def owner_bulk_adoptions(request):
+    return _bulk_adoption_decision(
+        request, Q(owned_pet__owner=request.user), "owner_adoptions"
+    )
+
+
 # ---------- SHELTER ----------
 from django.contrib.auth import login, get_user_model
 from django.db import transaction
@@ -936,7 +998,7 @@ def shelter_delete_pet(request, pet_id):
 def shelter_adoptions(request):
     requests = AdoptionRequest.objects.filter(
         pet__added_by=request.user
-    )
+    ).select_related("adopter", "pet")
     return render(
         request,
         "core/shelter_adoptions.html",
@@ -946,33 +1008,35 @@ def shelter_adoptions(request):
 
 @login_required
 def approve_request(request, req_id):
-    req = get_object_or_404(
+    get_object_or_404(
         AdoptionRequest,
         id=req_id,
         pet__added_by=request.user
     )
-    req.status = "approved"
-    req.save()
-
-    req.pet.is_available = False
-    req.pet.save()
+    approve_adoptions([req_id], Q(pet__added_by=request.user))
 
     return redirect("shelter_adoptions")
 
 
 @login_required
 def decline_request(request, req_id):
-    req = get_object_or_404(
+    get_object_or_404(
         AdoptionRequest,
         id=req_id,
         pet__added_by=request.user
     )
-    req.status = "declined"
-    req.save()
+    decline_adoptions([req_id], Q(pet__added_by=request.user))
 
     return redirect("shelter_adoptions")
 
 
+@login_required
+def shelter_bulk_adoptions(request):
+    return _bulk_adoption_decision(
+        request, Q(pet__added_by=request.user), "shelter_adoptions"
+    )
+
+
 # ---------- MISC ----------
 @login_required
 def chat(request):
@@ -1043,6 +1107,15 @@ def payment_history(request):
 
 
 # ---------- SUPER ADMIN ----------
+def _filter_admin_orders(orders, params):
+    # Filter by order status
+    status = params.get("status")
+    if status in ["paid", "pending", "cancelled"]:
+        orders = orders.filter(status=status)
+
+    return orders
+
+
 @login_required
 def superadmin_orders(request):
     if not request.user.is_superuser:
@@ -1050,24 +1123,91 @@ def superadmin_orders(request):
 
     orders = Order.objects.select_related("user")
 
-    # Filter by order status
-    status = request.GET.get("status")
-    if status in ["paid", "pending", "cancelled"]:
-        orders = orders.filter(status=status)
+    orders = _filter_admin_orders(orders, request.GET)
 
-    orders = orders.order_by("-created_at")
+    page = paginate_list(request, orders, ADMIN_ORDER_COLUMNS, "-date")
 
     return render(
         request,
         "core/admin/orders.html",
-        {"orders": orders}
+        {"orders": page.pop("items"), **page}
     )
 
 @login_required
 def superadmin_analytics(request):
     if not request.user.is_superuser:
         return redirect("home")
-    return render(request, "core/admin/analytics.html")
+
+    # Reads the DailyMetric rollups (manage.py rollup_daily_metrics)
+    days = request.GET.get("days")
+    days = int(days) if days in ("7", "30", "90") else 30
+
+    context = analytics_summary(days)
+    context.update(adoption_funnel())
+
+    return render(
+        request,
+        "core/admin/analytics.html",
+        context
+    )
+
+
+# =========================
+# SUPER ADMIN – EXPORTS (?format=csv|jsonl, same filters as the lists)
+# =========================
+from .exports import (
+    export_response,
+    payment_rows,
+    order_rows,
+    adoption_rows,
+    PAYMENT_EXPORT_HEADER,
+    ORDER_EXPORT_HEADER,
+    ADOPTION_EXPORT_HEADER,
+)
+
+
+@login_required
+def superadmin_export_payments(request):
+    if not request.user.is_superuser:
+        return redirect("home")
+
+    payments = _filter_admin_payments(
+        Payment.objects.select_related("user", "receiver"),
+        request.GET
+    )
+    return export_response(
+        request, "payments", PAYMENT_EXPORT_HEADER, payments, payment_rows
+    )
+
+
+@login_required
+def superadmin_export_orders(request):
+    if not request.user.is_superuser:
+        return redirect("home")
+
+    orders = _filter_admin_orders(
+        Order.objects.select_related("user").prefetch_related("items"),
+        request.GET
+    )
+    return export_response(
+        request, "orders", ORDER_EXPORT_HEADER, orders, order_rows
+    )
+
+
+@login_required
+def superadmin_export_adoptions(request):
+    if not request.user.is_superuser:
+        return redirect("home")
+
+    adoptions = _filter_admin_adoptions(
+        AdoptionRequest.objects.select_related(
+            "adopter", "pet", "owned_pet__pet"
+        ),
+        request.GET
+    )
+    return export_response(
+        request, "adoptions", ADOPTION_EXPORT_HEADER, adoptions, adoption_rows
+    )
 @login_required
 def adopter_favorites(request):
     if request.user.role != "adopter":
@@ -1227,59 +1367,138 @@ def appointment_page(request):
         }
     )
 
-from .models import ChatRoom, ChatMessage
+from .models import ChatMessage
+from .chat import (
+    chat_room_for,
+    history_page,
+    inbox_rooms,
+    mark_read,
+    message_json,
+    post_message,
+)
+
+
+CHAT_FETCH_LIMIT = 100
 
 
 @login_required
 def chat_room(request,  req_id):
-    adoption_request = get_object_or_404(
-        AdoptionRequest,
-        id= req_id
-    )
-
-    # Permission check
-    if request.user not in [
-        adoption_request.adopter,
-        getattr(adoption_request, "owned_pet", None) and adoption_request.owned_pet.owner,
-        adoption_request.pet and adoption_request.pet.added_by
-    ]:
+    # Permission check (ChatParticipant; creates the room on first visit)
+    room = chat_room_for(request.user, req_id)
+    if room is None:
         return redirect("dashboard")
 
-    room, created = ChatRoom.objects.get_or_create(
-        adoption_request=adoption_request
-    )
-
     if request.method == "POST":
         message = request.POST.get("message")
         if message:
-            ChatMessage.objects.create(
-                room=room,
-                sender=request.user,
-                message=message
-            )
+            post_message(room.id, request.user, message)
+        return redirect("chat_room", req_id=req_id)
 
-    messages = room.messages.select_related("sender").order_by("created_at")
+    # Latest page only; the page script fetches newer messages
+    # (chat_messages / the WebSocket) and older pages (chat_history)
+    messages, older = history_page(room)
+    last_id = max((msg.id for msg in messages), default=0)
+    mark_read(room.id, request.user, last_id)
 
     return render(request, "core/chat_room.html", {
         "room": room,
         "messages": messages,
-        "request_obj": adoption_request
+        "older": older,
+        "last_id": last_id,
     })
-from .models import ChatRoom, AdoptionRequest
-from django.db.models import Q
+
+
+@login_required
+def chat_history(request, req_id):
+    """
+    JSON: the page of messages before ``?before=<cursor>``, oldest first,
+    and the cursor for the page before it.
+    """
+    room = chat_room_for(request.user, req_id)
+    if room is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    messages, older = history_page(room, request.GET.get("before"))
+
+    return JsonResponse({
+        "messages": [message_json(msg) for msg in messages],
+        "older": older,
+    })
+
+
+@login_required
+def chat_messages(request, req_id):
+    """
+    JSON: messages of the room with id > ``after`` (oldest first, at most
+    CHAT_FETCH_LIMIT). A POST adds ``message`` first, so the sender gets
+    it back in the same response.
+    """
+    room = chat_room_for(request.user, req_id)
+    if room is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    if request.method == "POST":
+        message = request.POST.get("message", "").strip()
+        if not message:
+            return JsonResponse({"error": "empty message"}, status=400)
+        post_message(room.id, request.user, message)
+
+    after = request.GET.get("after") or request.POST.get("after") or "0"
+    after = int(after) if after.isdigit() else 0
+
+    # (room_id, id) is covered by the room FK index
+    new_messages = list(
+        ChatMessage.objects.filter(
+            room_id=room.id,
+            id__gt=after
+        ).select_related("sender").order_by("id")[:CHAT_FETCH_LIMIT + 1]
+    )
+    has_more = len(new_messages) > CHAT_FETCH_LIMIT
+    new_messages = new_messages[:CHAT_FETCH_LIMIT]
+
+    # Only polls that returned something move the read marker; posting
+    # already moved it past the user's own message
+    if new_messages and new_messages[-1].sender_id != request.user.id:
+        mark_read(room.id, request.user, new_messages[-1].id)
+
+    return JsonResponse({
+        "messages": [message_json(msg) for msg in new_messages],
+        "last_id": new_messages[-1].id if new_messages else after,
+        "has_more": has_more,
+    })
+
+
+from .models import AdoptionRequest
+from .updates import pending_updates, updates_cursor, updates_json
 
 @login_required
 def chat_inbox(request):
-    rooms = ChatRoom.objects.filter(
-        Q(adoption_request__adopter=request.user) |
-        Q(adoption_request__pet__added_by=request.user) |
-        Q(adoption_request__owned_pet__owner=request.user)
-    ).select_related("adoption_request")
+    # Last message, activity time and unread count in the same SELECT
+    rooms = inbox_rooms(request.user)
+
+    # Where the page script's long poll (core/updates.py) starts
+    _, updates_after, updates_since = pending_updates(request.user, None, None)
 
     return render(request, "core/chat_inbox.html", {
-        "rooms": rooms
+        "rooms": rooms,
+        "updates_after": updates_after,
+        "updates_since": updates_since.isoformat(),
     })
 
+
+@login_required
+def updates(request):
+    """
+    JSON: core/updates.py without the wait, for servers without ASGI;
+    clients get an answer at once and poll again.
+    """
+    after, since = updates_cursor(request.GET)
+    return JsonResponse(
+        updates_json(*pending_updates(request.user, after, since)),
+        headers={"Cache-Control": "no-store"},
+    )
+
+
 from .utils import generate_payment_receipt
 from .models import Payment
 
@@ -1339,7 +1558,7 @@ def appointment_payment_review(request, appointment_id):
         }
     )
 
-import razorpay
+from .gateway import GatewayUnavailable, get_gateway
 from django.conf import settings
 from decimal import Decimal
 
@@ -1363,17 +1582,14 @@ def appointment_payment_gateway(request, appointment_id):
     if request.user.role == "adopter":
         amount = base_price + (base_price * Decimal("0.15"))
 
-    client = razorpay.Client(
-        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-    )
-
-    razorpay_order = client.order.create({
-        "amount": int(amount * 100),  # paise
-        "currency": "INR",
-        "payment_capture": 1,
-    })
+    try:
+        razorpay_order_id = get_gateway().create_order(
+            int(amount * 100)  # paise
+        )
+    except GatewayUnavailable:
+        return render(request, "core/payment_unavailable.html", status=503)
 
-    payment.razorpay_order_id = razorpay_order["id"]
+    payment.razorpay_order_id = razorpay_order_id
     payment.amount = amount
     payment.save()
 
@@ -1381,10 +1597,9 @@ def appointment_payment_gateway(request, appointment_id):
         "appointment": appointment,
         "payment": payment,
         "razorpay_key": settings.RAZORPAY_KEY_ID,
-        "razorpay_order_id": razorpay_order["id"],
+        "razorpay_order_id": razorpay_order_id,
         "amount": int(amount * 100),
     })
-import razorpay
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import get_object_or_404, redirect, render
@@ -1433,19 +1648,12 @@ def appointment_payment_success(request, payment_id):
             {"appointment": appointment}
         )
 
-    # Razorpay client
-    client = razorpay.Client(
-        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-    )
-
-    try:
-        # 🔐 Signature verification
-        client.utility.verify_payment_signature({
-            "razorpay_payment_id": razorpay_payment_id,
-            "razorpay_order_id": razorpay_order_id,
-            "razorpay_signature": razorpay_signature
-        })
-    except razorpay.errors.SignatureVerificationError:
+    # 🔐 Signature verification
+    if not get_gateway().verify_payment(
+        razorpay_order_id,
+        razorpay_payment_id,
+        razorpay_signature
+    ):
         payment.status = "failed"
         payment.save()
 
@@ -1482,12 +1690,12 @@ def superadmin_products(request):
     if not request.user.is_superuser:
         return redirect("home")
 
-    products = Product.objects.select_related(
-        "category"
-    ).order_by("-created_at")
+    products = Product.objects.select_related("category")
+
+    page = paginate_list(request, products, ADMIN_PRODUCT_COLUMNS, "-date")
 
     return render(
         request,
         "core/admin/products.html",
-        {"products": products}
+        {"products": page.pop("items"), **page}
     )
@@ -13,4 +13,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'petverse_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from core.realtime import chat_websocket  # noqa: E402
+from core.updates import UPDATES_PATH, updates_longpoll  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # WebSockets (the chat, see core/realtime.py) and long polls
+    # (core/updates.py) bypass Django's HTTP stack
+    if scope["type"] == "websocket":
+        await chat_websocket(scope, receive, send)
+    elif scope["type"] == "http" and scope["path"] == UPDATES_PATH:
+        await updates_longpoll(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
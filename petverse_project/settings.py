@@ -41,6 +41,7 @@ INSTALLED_APPS = [
 # -------------------------------------------------------------
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryInspectorMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -49,6 +50,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Query inspector (N+1 detection), see core/middleware.py
+QUERY_INSPECTOR_SAMPLE_RATE = 0.01       # fraction of requests inspected
+QUERY_INSPECTOR_REPEAT_THRESHOLD = 5     # same query shape N times = offender
+
+# WebSocket chat fan-out (core/realtime.py). In-memory reaches only the
+# connections of one process: single node / dev / tests.
+CHAT_LAYER = 'core.realtime.InMemoryChatLayer'
+
 ROOT_URLCONF = 'petverse_project.urls'
 
 
@@ -97,6 +106,22 @@ DATABASES = {
 
 
 
+# -------------------------------------------------------------
+# Cache (public catalog pages, see core/page_cache.py)
+# Local memory is per process: use a shared backend (Redis /
+# Memcached) in production so invalidation reaches every worker.
+# -------------------------------------------------------------
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'petverse',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    }
+}
+
+
 # -------------------------------------------------------------
 # Authentication
 # -------------------------------------------------------------
@@ -163,6 +188,12 @@ PETVERSE_ROLES = [
 RAZORPAY_KEY_ID = config("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = config("RAZORPAY_KEY_SECRET")
 
+# One pooled client per process (core/gateway.py); FakeGateway for tests
+PAYMENT_GATEWAY = "core.gateway.RazorpayGateway"
+RAZORPAY_CONNECT_TIMEOUT = 3.05   # seconds
+RAZORPAY_READ_TIMEOUT = 10
+RAZORPAY_POOL_SIZE = 10           # keep-alive connections per process
+
 # =========================
 # EMAIL CONFIG (FROM .env)
 # =========================
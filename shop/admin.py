@@ -1,21 +1,25 @@
 from django.contrib import admin
-from .models import ProductCategory, Product
+from .models import ProductCategory, Product, Payment
 
 
 @admin.register(ProductCategory)
 class ProductCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'is_active')
     list_filter = ('is_active',)
-    search_fields = ('name',)
+    search_fields = ('^name',)
     ordering = ('name',)
+    show_full_result_count = False
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'price', 'stock', 'is_active')
+    list_select_related = ('category',)
     list_filter = ('category', 'is_active')
-    search_fields = ('name', 'category__name')
+    search_fields = ('=id', '^name', '^category__name')
+    autocomplete_fields = ('category',)
     ordering = ('name',)
+    show_full_result_count = False
 from .models import Order, OrderItem
 
 
@@ -29,9 +33,11 @@ class OrderItemInline(admin.TabularInline):
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'total_amount', 'status', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('status', 'created_at')
-    search_fields = ('id', 'user__username')
+    search_fields = ('=id', '^user__username')
     ordering = ('-created_at',)
+    show_full_result_count = False
 
     inlines = [OrderItemInline]
 
@@ -42,3 +48,14 @@ class OrderAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False  # Prevent accidental deletion
+
+
+@admin.register(Payment)
+class PaymentAdmin(admin.ModelAdmin):
+    list_display = ('order', 'gateway', 'payment_id', 'status', 'created_at')
+    list_select_related = ('order',)
+    list_filter = ('status', 'gateway')
+    search_fields = ('=order__id',)
+    raw_id_fields = ('order',)
+    ordering = ('-created_at',)
+    show_full_result_count = False
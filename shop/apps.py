@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ShopConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shop'
+
+    def ready(self):
+        from .search import ensure_sqlite_search_index
+
+        post_migrate.connect(
+            ensure_sqlite_search_index,
+            sender=self,
+            dispatch_uid="shop:ensure_sqlite_search_index",
+        )
@@ -0,0 +1,102 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.dashboard import reconcile_counters
+from core.signals import counters_suspended
+from shop.models import Product, ProductCategory
+from shop.search import search_products, icontains_search
+
+
+WORDS = (
+    "dog cat puppy kitten food treat chew toy leash collar harness bed "
+    "bowl grooming shampoo brush litter scratcher aquarium bird cage seed "
+    "organic grain free chicken salmon lamb beef small large senior "
+    "dental vitamin flea tick comb nail clipper carrier crate blanket"
+).split()
+
+FILLER_WORDS = 5000
+
+QUERIES = ["dog food", "salmon", "kit", "flea tick", "organic chicken treat", "zebra"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks ranked full-text product search against the old "
+        "icontains scan. Creates throwaway products in a dedicated "
+        "category and deletes them afterwards. Do not run on production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _timed(self, queryset, repeat):
+        best = None
+        count = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(list(queryset.values_list("id", flat=True)))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000, count
+
+    def _vocabulary(self, rng):
+        # Catalog-like word frequencies: a few very common words, a long tail
+        filler = {
+            "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9)))
+            for _ in range(FILLER_WORDS)
+        }
+        vocabulary = WORDS + sorted(filler - set(WORDS))
+        weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+        rng.shuffle(vocabulary)
+        return vocabulary, weights
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        vocabulary, weights = self._vocabulary(rng)
+        category = ProductCategory.objects.create(
+            name=f"__bench_search_{int(time.time())}",
+            is_active=False,
+        )
+
+        # The cascade delete at the end would otherwise run one counter
+        # UPDATE per product; recount once instead
+        with counters_suspended("shop.Product"):
+            try:
+                self.stdout.write(f"Creating {options['products']} products…")
+                Product.objects.bulk_create(
+                    (
+                        Product(
+                            category=category,
+                            name=" ".join(rng.choices(vocabulary, weights, k=3)).title(),
+                            description=" ".join(rng.choices(vocabulary, weights, k=25)),
+                            price=rng.randint(50, 5000),
+                        )
+                        for _ in range(options["products"])
+                    ),
+                    batch_size=2000,
+                )
+
+                products = Product.objects.filter(category=category)
+
+                self.stdout.write(
+                    f"{'query':<24}{'icontains ms':>14}{'hits':>8}"
+                    f"{'fulltext ms':>14}{'hits':>8}"
+                )
+                for query in QUERIES:
+                    scan_ms, scan_hits = self._timed(
+                        icontains_search(products, query), options["repeat"]
+                    )
+                    ranked_ms, ranked_hits = self._timed(
+                        search_products(products, query), options["repeat"]
+                    )
+                    self.stdout.write(
+                        f"{query:<24}{scan_ms:>14.2f}{scan_hits:>8}"
+                        f"{ranked_ms:>14.2f}{ranked_hits:>8}"
+                    )
+            finally:
+                category.delete()
+
+        reconcile_counters()
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+
+MYSQL_FORWARD = [
+    "ALTER TABLE shop_product "
+    "ADD FULLTEXT INDEX shop_product_fulltext (name, description)",
+]
+
+MYSQL_BACKWARD = [
+    "ALTER TABLE shop_product DROP INDEX shop_product_fulltext",
+]
+
+# External-content FTS5 table; triggers keep it in step with shop_product
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE shop_product_fts USING fts5("
+    "name, description, content='shop_product', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER shop_product_fts_ai AFTER INSERT ON shop_product BEGIN "
+    "INSERT INTO shop_product_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+
+    "CREATE TRIGGER shop_product_fts_ad AFTER DELETE ON shop_product BEGIN "
+    "INSERT INTO shop_product_fts(shop_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+
+    "CREATE TRIGGER shop_product_fts_au AFTER UPDATE ON shop_product BEGIN "
+    "INSERT INTO shop_product_fts(shop_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO shop_product_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+
+    "INSERT INTO shop_product_fts(shop_product_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS shop_product_fts_ai",
+    "DROP TRIGGER IF EXISTS shop_product_fts_ad",
+    "DROP TRIGGER IF EXISTS shop_product_fts_au",
+    "DROP TABLE IF EXISTS shop_product_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_payment'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"mysql": MYSQL_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"mysql": MYSQL_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
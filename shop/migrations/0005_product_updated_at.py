@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_product_search_index'),
+    ]
+
+    operations = [
+        # SQLite applies this by rebuilding shop_product, which drops the
+        # FTS5 triggers 0004 created; ensure_sqlite_search_index() (post_migrate,
+        # shop/search.py) re-creates them
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
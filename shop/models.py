@@ -34,6 +34,18 @@ class Product(models.Model):
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Superadmin product list default sort
+            models.Index(fields=["-created_at", "-id"], name="product_created_idx"),
+            # ... and its price / stock sorts
+            models.Index(fields=["-price", "-id"], name="product_price_idx"),
+            models.Index(fields=["-stock", "-id"], name="product_stock_idx"),
+            # Prefix search in the Django admin
+            models.Index(fields=["name"], name="product_name_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -68,6 +80,18 @@ class Order(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at", "-id"], name="order_status_idx"),
+            models.Index(fields=["-created_at", "-id"], name="order_created_idx"),
+            # Superadmin order list sorted by total
+            models.Index(fields=["-total_amount", "-id"], name="order_total_idx"),
+            models.Index(fields=["user", "-created_at"], name="order_user_idx"),
+            # Late status changes re-rolled by core/rollups.py
+            models.Index(fields=["updated_at"], name="order_updated_idx"),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.status}"
@@ -119,4 +143,4 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Payment for Order #{self.order.id} - {self.status}"
+        return f"Payment for Order #{self.order_id} - {self.status}"
@@ -0,0 +1,164 @@
+# shop/search.py
+
+"""
+Ranked full-text product search.
+
+MySQL (production) uses a FULLTEXT index on (name, description) in
+boolean mode. SQLite (local / tests) uses an FTS5 shadow table kept in
+sync by triggers. Both are created by migration 0004_product_search_index.
+Any other database falls back to the old icontains scan.
+
+SQLite applies most AddField / AlterField migrations on shop_product by
+rebuilding the table, which silently drops its triggers (0005 did). So
+after every migrate, ensure_sqlite_search_index() (post_migrate, see
+shop/apps.py) re-creates any missing trigger and rebuilds the index.
+
+Every search word is required and prefix-matched ("dog foo" finds
+"Dog Food"). Results are ordered by relevance.
+
+InnoDB leaves stopwords and words shorter than innodb_ft_min_token_size
+out of the index, so a required "+a*" matches nothing and "a dog bed"
+would find no rows. Those words are dropped from the MySQL query; a
+query made only of them falls back to the icontains scan.
+"""
+
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# MySQL defaults: innodb_ft_min_token_size and INNODB_FT_DEFAULT_STOPWORD
+INNODB_FT_MIN_TOKEN_SIZE = 3
+INNODB_FT_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of "
+    "on or that the this to was what when where who will with und www".split()
+)
+
+
+SQLITE_TRIGGERS = {
+    "shop_product_fts_ai": (
+        "CREATE TRIGGER shop_product_fts_ai AFTER INSERT ON shop_product BEGIN "
+        "INSERT INTO shop_product_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    "shop_product_fts_ad": (
+        "CREATE TRIGGER shop_product_fts_ad AFTER DELETE ON shop_product BEGIN "
+        "INSERT INTO shop_product_fts(shop_product_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    "shop_product_fts_au": (
+        "CREATE TRIGGER shop_product_fts_au AFTER UPDATE ON shop_product BEGIN "
+        "INSERT INTO shop_product_fts(shop_product_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO shop_product_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+}
+
+
+def ensure_sqlite_search_index(using="default", **kwargs):
+    """
+    post_migrate receiver: re-creates the FTS5 triggers a table rebuild
+    dropped, then rebuilds the index (rows written meanwhile are missing
+    from it). Returns the names of the re-created triggers.
+    """
+    db = connections[using]
+    if db.vendor != "sqlite":
+        return []
+
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name IN "
+            "('shop_product', 'shop_product_fts')"
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+        if "shop_product_fts" not in existing:
+            # Migrated back to before 0004
+            return []
+
+        missing = sorted(set(SQLITE_TRIGGERS) - existing)
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                "INSERT INTO shop_product_fts(shop_product_fts) VALUES ('rebuild')"
+            )
+    return missing
+
+
+def _terms(query):
+    return WORD_RE.findall(query.lower())
+
+
+def _boolean_query(terms):
+    """
+    The BOOLEAN MODE query for terms, without the words InnoDB doesn't
+    index ("" if nothing is left).
+    """
+    return " ".join(
+        f"+{term}*"
+        for term in terms
+        if len(term) >= INNODB_FT_MIN_TOKEN_SIZE and term not in INNODB_FT_STOPWORDS
+    )
+
+
+def _mysql_search(products, query, terms):
+    boolean_query = _boolean_query(terms)
+    if not boolean_query:
+        return icontains_search(products, query)
+
+    match = RawSQL(
+        "MATCH (shop_product.name, shop_product.description) "
+        "AGAINST (%s IN BOOLEAN MODE)",
+        [boolean_query],
+    )
+    return products.annotate(search_rank=match).filter(
+        search_rank__gt=0
+    ).order_by("-search_rank", "-id")
+
+
+def _sqlite_search(products, terms):
+    fts_query = " ".join(f'"{term}"*' for term in terms)
+    # Join the FTS5 table directly so matching and ranking are one pass;
+    # bm25() is lower for better matches.
+    return products.extra(
+        tables=["shop_product_fts"],
+        where=[
+            "shop_product_fts.rowid = shop_product.id",
+            "shop_product_fts MATCH %s",
+        ],
+        params=[fts_query],
+        select={"search_rank": "bm25(shop_product_fts)"},
+        order_by=["search_rank", "-id"],
+    )
+
+
+def icontains_search(products, query):
+    """
+    The original unranked scan; kept as fallback and benchmark baseline.
+    """
+    return products.filter(
+        Q(name__icontains=query) |
+        Q(description__icontains=query)
+    )
+
+
+def search_products(products, query):
+    """
+    Filters a Product queryset by query, best matches first.
+    """
+    terms = _terms(query)
+    if not terms:
+        return products.none()
+
+    if connection.vendor == "mysql":
+        return _mysql_search(products, query, terms)
+
+    if connection.vendor == "sqlite":
+        return _sqlite_search(products, terms)
+
+    return icontains_search(products, query)
@@ -1,3 +1,65 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Product, ProductCategory
+from .search import _boolean_query, ensure_sqlite_search_index, search_products
+
+
+class ProductSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ProductCategory.objects.create(name="Beds")
+        cls.bed = Product.objects.create(
+            category=category, name="The dog bed", price=Decimal("5.00"),
+            description="Washable cover",
+        )
+        cls.tree = Product.objects.create(
+            category=category, name="Cat tree", price=Decimal("5.00"),
+            description="Sisal posts",
+        )
+
+    def search(self, query):
+        return list(search_products(Product.objects.all(), query))
+
+    def test_search_on_the_migrated_database(self):
+        self.assertEqual(self.search("dog"), [self.bed])
+        self.assertEqual(self.search("wash cov"), [self.bed])
+        self.assertEqual(self.search("sisal"), [self.tree])
+        self.assertEqual(self.search("zebra"), [])
+
+        Product.objects.filter(id=self.tree.id).update(name="Dog tree")
+        self.assertEqual(set(self.search("dog")), {self.bed, self.tree})
+
+    def test_lost_sqlite_triggers_are_restored_after_migrate(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite FTS5 only")
+
+        # What a table rebuild by a later migration does
+        with connection.cursor() as cursor:
+            for name in ("shop_product_fts_ai", "shop_product_fts_ad", "shop_product_fts_au"):
+                cursor.execute(f"DROP TRIGGER {name}")
+            cursor.execute("DELETE FROM shop_product_fts")
+        self.assertEqual(self.search("dog"), [])
+
+        self.assertEqual(
+            ensure_sqlite_search_index(using=connection.alias),
+            ["shop_product_fts_ad", "shop_product_fts_ai", "shop_product_fts_au"],
+        )
+        self.assertEqual(self.search("dog"), [self.bed])
+        self.assertEqual(ensure_sqlite_search_index(using=connection.alias), [])
+
+    def test_mysql_query_skips_words_innodb_does_not_index(self):
+        self.assertEqual(_boolean_query(["a", "dog", "bed"]), "+dog* +bed*")
+        self.assertEqual(_boolean_query(["the", "ox"]), "")
+
+    def test_search_of_only_unindexed_words_falls_back_to_icontains(self):
+        with mock.patch("shop.search.connection") as patched:
+            patched.vendor = "mysql"
+            self.assertIn("MATCH", str(search_products(Product.objects.all(), "the dog").query))
+            found = search_products(Product.objects.all(), "the")
+
+        self.assertNotIn("MATCH", str(found.query))
+        self.assertEqual(list(found), [self.bed])
@@ -1,14 +1,16 @@
 from django.shortcuts import render
 from .models import Product, ProductCategory
 
-from django.db.models import Q
 from django.shortcuts import render
 from .models import Product, ProductCategory
-import razorpay
+from .search import search_products
+from core.page_cache import cache_public_page
+from core.conditional import conditional_on
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 
 
+@cache_public_page("products")
 def product_list(request):
     categories = ProductCategory.objects.filter(is_active=True)
 
@@ -21,12 +23,9 @@ def product_list(request):
         category__is_active=True
     )
 
-    # Search filter
+    # Search filter (ranked full-text, best matches first)
     if search_query:
-        products = products.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        products = search_products(products, search_query)
 
     # Category filter
     if category_id:
@@ -47,6 +46,16 @@ from django.shortcuts import render, get_object_or_404
 from .models import Product
 
 
+def _product_updated_at(pk):
+    return Product.objects.filter(
+        pk=pk,
+        is_active=True,
+        category__is_active=True
+    ).values_list("updated_at", flat=True).first()
+
+
+@cache_public_page("product:{pk}", "categories")
+@conditional_on(_product_updated_at)
 def product_detail(request, pk):
     """
     Product detail page.
@@ -204,7 +213,7 @@ def checkout(request):
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from .models import Order, Payment
-import razorpay
+from core.gateway import GatewayUnavailable, get_gateway
 from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
@@ -220,21 +229,17 @@ def payment_page(request, order_id):
         status='pending'
     )
 
-    # Razorpay client
-    client = razorpay.Client(
-        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-    )
-
-    # Create Razorpay order (amount in paise)
-    razorpay_order = client.order.create({
-        "amount": int(order.total_amount * 100),  # ₹ → paise
-        "currency": "INR",
-        "payment_capture": 1
-    })
+    # Create Razorpay order (amount in paise) on the pooled client
+    try:
+        razorpay_order_id = get_gateway().create_order(
+            int(order.total_amount * 100)  # ₹ → paise
+        )
+    except GatewayUnavailable:
+        return render(request, "core/payment_unavailable.html", status=503)
 
     context = {
         "order": order,
-        "razorpay_order_id": razorpay_order["id"],
+        "razorpay_order_id": razorpay_order_id,
         "razorpay_key": settings.RAZORPAY_KEY_ID,
         "amount": order.total_amount,
         "currency": "INR",